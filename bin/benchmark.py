@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the rebasing hot paths.
+
+Run from the project root, e.g. `uv run bin/benchmark.py codegen`.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import timeit
+
+import httpx
+
+from basebender.api import main as api
+from basebender.api.routing import get_router
+from basebender.api.settings import rebase_timeout, slice_budget
+from basebender.api.wire import (
+    FRAMES_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    decode_frames,
+    encode_frames,
+    msgpack_available,
+    pack_msgpack,
+    unpack_msgpack,
+)
+from basebender.rebaser.cancellation import CancellationToken
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.models import DigitSet
+
+PRINTABLE = "".join(chr(code) for code in range(33, 127))
+CODEGEN_PAIRS = [
+    ("0123456789", "01"),
+    ("0123456789", "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    (PRINTABLE, "0123456789"),
+    ("🕐🕑🕒🕓🕔🕕🕖", PRINTABLE),
+]
+
+
+def _best_time(function, number, repeat):
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def benchmark_codegen(lengths, repeat):
+    """Compares `DigitSetRebaser.rebase` with the compiled function of the same pair."""
+    print(f"{'pair':>12} {'length':>8} {'generic':>12} {'compiled':>12} {'speedup':>8}")
+    rng = random.Random(0)
+    for in_digits, out_digits in CODEGEN_PAIRS:
+        rebaser = DigitSetRebaser(
+            out_digit_set=DigitSet(name="Out", digits=out_digits, source="benchmark"),
+            in_digit_set=DigitSet(name="In", digits=in_digits, source="benchmark"),
+        )
+        compiled = rebaser.compile().function
+        for length in lengths:
+            text = "".join(rng.choice(in_digits) for _ in range(length))
+            assert compiled(text) == rebaser.rebase(text)
+            number = max(1, 20000 // length)
+            generic_time = _best_time(lambda: rebaser.rebase(text), number, repeat)
+            compiled_time = _best_time(lambda: compiled(text), number, repeat)
+            pair = f"{len(in_digits)}->{len(out_digits)}"
+            print(
+                f"{pair:>12} {length:>8} {generic_time * 1e6:>10.1f}us "
+                f"{compiled_time * 1e6:>10.1f}us {generic_time / compiled_time:>7.2f}x"
+            )
+
+
+API_PAYLOADS = {
+    "ids": {
+        "input_text": "101101",
+        "source_digit_set_id": "package:Binary",
+        "target_digit_set_id": "package:Decimal",
+    },
+    "digits": {
+        "input_text": "ff00ff",
+        "source_digit_set": "0123456789abcdef",
+        "target_digit_set": "01",
+    },
+}
+
+
+@api.APP.post("/benchmark/rebase", response_model=api.RebaseResponse, include_in_schema=False)
+async def _validated_rebase(request: api.RebaseRequest) -> api.RebaseResponse:
+    """
+    `/rebase` as it was before its fast path: every input is planned and routed,
+    and the result goes through `RebaseResponse`.
+    """
+    # pylint: disable=protected-access
+    source, source_name = api._resolve_digit_set(
+        request.source_digit_set, request.source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target, target_name = api._resolve_digit_set(
+        request.target_digit_set, request.target_digit_set_id, "Target", "Echo Input"
+    )
+    rebaser = api._get_rebaser(target, source)
+    input_text = request.input_text or ""
+    api._check_output_budget(rebaser, input_text)
+    rebased_text = await get_router().rebase(
+        rebaser, input_text, CancellationToken(rebase_timeout()), slice_budget=slice_budget()
+    )
+    return api.RebaseResponse(
+        rebased_text=rebased_text,
+        source_digit_set_used=source_name,
+        target_digit_set_used=target_name,
+        error=None,
+    )
+
+
+async def _requests_per_second(client, path, payload, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+    return count / (time.perf_counter() - start)
+
+
+async def _benchmark_api(count, repeat):
+    transport = httpx.ASGITransport(app=api.APP)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        print(f"{'payload':>8} {'validated':>12} {'fast path':>12} {'speedup':>8}")
+        for name, payload in API_PAYLOADS.items():
+            fast = await client.post("/rebase", json=payload)
+            validated = await client.post("/benchmark/rebase", json=payload)
+            assert fast.json() == validated.json()
+            validated_rate = fast_rate = 0.0
+            for _ in range(repeat):
+                # Interleaved, so both variants see the same machine state.
+                validated_rate = max(
+                    validated_rate,
+                    await _requests_per_second(client, "/benchmark/rebase", payload, count),
+                )
+                fast_rate = max(
+                    fast_rate, await _requests_per_second(client, "/rebase", payload, count)
+                )
+            print(
+                f"{name:>8} {validated_rate:>8.0f} r/s {fast_rate:>8.0f} r/s "
+                f"{fast_rate / validated_rate:>7.2f}x"
+            )
+
+
+def benchmark_api(count, repeat):
+    """
+    Compares the requests/sec of `/rebase` with its previous implementation
+    (see `_validated_rebase`), through a local ASGI client.
+
+    The variant is mounted outside the admission-controlled paths, so the
+    comparison slightly favours it.
+    """
+    asyncio.run(_benchmark_api(count, repeat))
+
+
+CJK_DIGITS = "".join(chr(code) for code in range(0x4E00, 0x4E00 + 1024))
+WIRE_PAYLOADS = {
+    "emoji->cjk": {
+        "input_text": "🕐🕑🕒🕓🕔🕕🕖🕗🕘🕙🕚🕛" * 4,
+        "source_digit_set_id": "package:Clock Emojis",
+        "target_digit_set": CJK_DIGITS,
+    },
+    "cjk->emoji": {
+        "input_text": CJK_DIGITS[1:40],
+        "source_digit_set": CJK_DIGITS,
+        "target_digit_set_id": "package:Clock Emojis",
+    },
+}
+WIRE_BATCH_ITEMS = 200
+
+
+def _wire_bodies(payload):
+    """Returns the `/rebase` and `/rebase/batch` request of `payload` in every format."""
+    digit_sets = [payload.get(name) for name in api.BATCH_DIGIT_SET_FIELDS]
+    batch = {**payload, "inputs": [payload["input_text"]] * WIRE_BATCH_ITEMS}
+    del batch["input_text"]
+    bodies = {
+        "json": (
+            "application/json",
+            json.dumps(payload).encode(),
+            json.dumps(batch).encode(),
+            json.loads,
+        ),
+        "frames": (
+            FRAMES_MEDIA_TYPE,
+            encode_frames([payload.get(name) for name in api.REBASE_REQUEST_FIELDS]),
+            encode_frames(digit_sets + batch["inputs"]),
+            decode_frames,
+        ),
+    }
+    if msgpack_available():
+        bodies["msgpack"] = (
+            MSGPACK_MEDIA_TYPE,
+            pack_msgpack(payload),
+            pack_msgpack(batch),
+            unpack_msgpack,
+        )
+    return bodies
+
+
+async def _cpu_per_request(client, request, decode, count):
+    path, body, headers = request
+    start = time.process_time()
+    for _ in range(count):
+        response = await client.post(path, content=body, headers=headers)
+        response.raise_for_status()
+        decode(response.content)
+    return (time.process_time() - start) / count
+
+
+async def _benchmark_wire(count, repeat):
+    transport = httpx.ASGITransport(app=api.APP)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        print(
+            f"{'payload':>11} {'endpoint':>9} {'format':>8} {'request':>10} {'response':>10} "
+            f"{'cpu/request':>12}"
+        )
+        for name, payload in WIRE_PAYLOADS.items():
+            for format_name, (media_type, single, batch, decode) in _wire_bodies(payload).items():
+                for path, body, requests in (
+                    ("/rebase", single, count),
+                    ("/rebase/batch", batch, max(1, count // 20)),
+                ):
+                    headers = {"Content-Type": media_type, "Accept": media_type}
+                    response = await client.post(path, content=body, headers=headers)
+                    response.raise_for_status()
+                    request = (path, body, headers)
+                    cpu = min(
+                        [
+                            await _cpu_per_request(client, request, decode, requests)
+                            for _ in range(repeat)
+                        ]
+                    )
+                    endpoint = path.removeprefix("/rebase") or "single"
+                    print(
+                        f"{name:>11} {endpoint.lstrip('/'):>9} {format_name:>8} "
+                        f"{len(body):>8} B {len(response.content):>8} B {cpu * 1e6:>10.0f}us"
+                    )
+
+
+def benchmark_wire(count, repeat):
+    """
+    Compares bytes on the wire and CPU time per request (client and server,
+    through a local ASGI client) of the JSON and binary formats of `/rebase`
+    and `/rebase/batch`.
+    """
+    asyncio.run(_benchmark_wire(count, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("mode", choices=["codegen", "api", "wire"], help="The benchmark to run.")
+    parser.add_argument(
+        "--lengths",
+        type=int,
+        nargs="+",
+        default=[8, 64, 1024, 16384],
+        help="Input lengths in digits.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement.")
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Requests per measurement (api and wire modes)."
+    )
+    args = parser.parse_args()
+
+    if args.mode == "codegen":
+        benchmark_codegen(args.lengths, args.repeat)
+    elif args.mode == "api":
+        benchmark_api(args.requests, args.repeat)
+    elif args.mode == "wire":
+        benchmark_wire(args.requests, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
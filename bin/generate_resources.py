@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-This script generates Python resource files from Qt .qrc files using pyside6-rcc.
+This script generates Python resource files from Qt .qrc files using pyside6-rcc,
+and the compiled snapshot of the package digit sets.
 """
 
 import os
@@ -8,6 +9,22 @@ import subprocess
 import sys
 
 
+def generate_catalog_snapshot():
+    """Writes the package digit-set snapshot read instead of the TOML file."""
+    # pylint: disable-next=import-outside-toplevel
+    from basebender.rebaser.catalog_cache import PACKAGE_SNAPSHOT_PATH, write_package_snapshot
+
+    # pylint: disable-next=import-outside-toplevel
+    from basebender.rebaser.config_loader import (
+        _get_config_paths,
+        load_digit_sets_from_toml,
+    )
+
+    package_path = _get_config_paths()[0]
+    write_package_snapshot(package_path, load_digit_sets_from_toml(package_path, "package"))
+    print(f"Successfully generated {PACKAGE_SNAPSHOT_PATH}")
+
+
 def main():
     qrc_file = "src/basebender/rebaser/resources/app_resources.qrc"
     output_dir = "src/basebender/rebaser/generated"
@@ -51,6 +68,11 @@ def main():
         print(f"An unexpected error occurred: {general_error}", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        generate_catalog_snapshot()
+    except (ImportError, OSError) as snapshot_error:
+        print(f"Skipping the digit-set snapshot: {snapshot_error}", file=sys.stdout)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,196 @@
+"""
+This module implements admission control for the conversion endpoints.
+
+`AdmissionMiddleware` is a pure ASGI middleware that rejects requests before
+their body is handled: requests beyond the concurrency limit get a fast 429
+with a `Retry-After` header, and bodies larger than the input limit get a
+413, whether the size is announced by `Content-Length` or only noticed while
+the body is streamed. WebSocket sessions beyond the session limit are closed
+with code 1013 (try again later) before they are accepted.
+"""
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Self
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from basebender.api.metrics import record_error
+from basebender.api.settings import env_int
+
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_MAX_INPUT_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_RAW_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_OUTPUT_CHARS = 16 * 1024 * 1024
+DEFAULT_RETRY_AFTER = 1
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    """
+    Limits enforced by `AdmissionMiddleware`; 0 disables a limit.
+
+    Attributes:
+        max_concurrency: The number of requests handled at the same time.
+        max_sessions: The number of WebSocket sessions open at the same time;
+                      they are long-lived, so they are not counted as requests.
+        max_input_bytes: The largest accepted request body in bytes.
+        max_raw_bytes: The largest `/rebase/raw` body in bytes that is spooled
+                       to count its digits; enforced by the handler, as
+                       bodies converted while they arrive are not limited.
+        retry_after: The `Retry-After` value of 429 responses in seconds.
+    """
+
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_sessions: int = DEFAULT_MAX_SESSIONS
+    max_input_bytes: int = DEFAULT_MAX_INPUT_BYTES
+    max_raw_bytes: int = DEFAULT_MAX_RAW_BYTES
+    retry_after: int = DEFAULT_RETRY_AFTER
+
+    @classmethod
+    def from_environment(cls) -> Self:
+        """
+        Reads the limits from `BASEBENDER_MAX_CONCURRENCY`,
+        `BASEBENDER_MAX_SESSIONS`, `BASEBENDER_MAX_INPUT_BYTES`,
+        `BASEBENDER_MAX_RAW_BYTES` and `BASEBENDER_RETRY_AFTER`.
+        """
+        return cls(
+            max_concurrency=env_int("BASEBENDER_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY),
+            max_sessions=env_int("BASEBENDER_MAX_SESSIONS", DEFAULT_MAX_SESSIONS),
+            max_input_bytes=env_int("BASEBENDER_MAX_INPUT_BYTES", DEFAULT_MAX_INPUT_BYTES),
+            max_raw_bytes=env_int("BASEBENDER_MAX_RAW_BYTES", DEFAULT_MAX_RAW_BYTES),
+            retry_after=env_int("BASEBENDER_RETRY_AFTER", DEFAULT_RETRY_AFTER),
+        )
+
+
+def max_output_chars() -> int:
+    """
+    The largest estimated output length a single conversion may produce.
+
+    Configured through `BASEBENDER_MAX_OUTPUT_CHARS`; `0` disables the limit.
+    """
+    return env_int("BASEBENDER_MAX_OUTPUT_CHARS", DEFAULT_MAX_OUTPUT_CHARS)
+
+
+def _input_too_large_detail(limit: int) -> dict[str, str]:
+    return {
+        "message": "Input Too Large",
+        "detail": f"The request body exceeds the limit of {limit} bytes.",
+    }
+
+
+class AdmissionMiddleware:
+    """
+    Limits concurrency and request body size for selected paths.
+
+    Only HTTP requests whose path is in `paths` and WebSocket sessions whose
+    path is in `session_paths` are limited; everything else (documentation,
+    digit-set listings) passes through untouched. The bodies of
+    `streaming_paths` may be arbitrarily long; their handlers limit the
+    length of single lines instead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        config: AdmissionConfig | None = None,
+        paths: Iterable[str] = ("/rebase", "/rebase/batch", "/rebase/stream", "/rebase/raw"),
+        streaming_paths: Iterable[str] = ("/rebase/stream", "/rebase/raw"),
+        session_paths: Iterable[str] = ("/rebase/live",),
+    ) -> None:
+        self.app = app
+        self.config = config or AdmissionConfig.from_environment()
+        self.paths = frozenset(paths)
+        self.streaming_paths = frozenset(streaming_paths)
+        self.session_paths = frozenset(session_paths)
+        self.in_flight = 0
+        self.sessions = 0
+
+    async def _reject(
+        self,
+        scope: Scope,
+        send: Send,
+        status_code: int,
+        detail: dict[str, str],
+        headers: dict[str, str],
+    ) -> None:
+        record_error(scope, detail["message"])
+        body = json.dumps({"detail": detail}).encode()
+        raw_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *((name.encode(), value.encode()) for name, value in headers.items()),
+        ]
+        await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _declared_length(self, scope: Scope) -> int | None:
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    def _limited_receive(self, receive: Receive) -> Receive:
+        limit = self.config.max_input_bytes
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=_input_too_large_detail(limit))
+            return message
+
+        return limited_receive
+
+    async def _admit_session(self, scope: Scope, receive: Receive, send: Send) -> None:
+        max_sessions = self.config.max_sessions
+        if max_sessions and self.sessions >= max_sessions:
+            await receive()  # websocket.connect
+            await send({"type": "websocket.close", "code": 1013, "reason": "Too many sessions."})
+            return
+        self.sessions += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.sessions -= 1
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "websocket" and scope["path"] in self.session_paths:
+            await self._admit_session(scope, receive, send)
+            return
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        config = self.config
+        if config.max_input_bytes and scope["path"] not in self.streaming_paths:
+            declared_length = self._declared_length(scope)
+            if declared_length is not None and declared_length > config.max_input_bytes:
+                await self._reject(
+                    scope, send, 413, _input_too_large_detail(config.max_input_bytes), {}
+                )
+                return
+            receive = self._limited_receive(receive)
+
+        if config.max_concurrency and self.in_flight >= config.max_concurrency:
+            detail = {
+                "message": "Too Many Requests",
+                "detail": f"The server is handling {self.in_flight} conversions; retry later.",
+            }
+            await self._reject(scope, send, 429, detail, {"retry-after": str(config.retry_after)})
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -0,0 +1,242 @@
+"""
+This module deduplicates identical conversions that run at the same time.
+
+Requests are keyed by a hash of their normalized form (the input text and the
+deduplicated digits and block layout of both digit sets; display names are
+ignored). While a conversion is in flight, identical requests await its
+result instead of starting their own (single flight). Finished results can be
+kept for a short TTL in a cache bounded by a memory budget.
+"""
+
+import asyncio
+import functools
+import hashlib
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Self
+
+from basebender.api.settings import env_float, env_int
+from basebender.rebaser.cancellation import CancellationToken
+from basebender.rebaser.models import DigitSet
+
+DEFAULT_RESULT_CACHE_TTL = 10.0
+DEFAULT_RESULT_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def request_key(
+    input_text: str, in_digit_set: DigitSet | None, out_digit_set: DigitSet | None
+) -> str:
+    """
+    Returns the coalescing key of a conversion.
+
+    Args:
+        input_text: The text to be rebased.
+        in_digit_set: The source digit set, or `None` if it is derived from the input.
+        out_digit_set: The target digit set, or `None` for echo mode.
+
+    Returns:
+        The hex SHA-256 digest of the normalized request.
+
+    Examples:
+        >>> binary = DigitSet(name="Binary", digits="01", source="test")
+        >>> renamed = DigitSet(name="Bits", digits="011", source="other")
+        >>> request_key("101", binary, None) == request_key("101", renamed, None)
+        True
+    """
+    digit_sets = tuple(
+        None
+        if digit_set is None
+        else (DigitSet.deduplicate_digits(digit_set.digits), digit_set.block)
+        for digit_set in (in_digit_set, out_digit_set)
+    )
+    hasher = hashlib.sha256(repr((digit_sets, len(input_text))).encode("utf-8"))
+    hasher.update(input_text.encode("utf-8", "surrogatepass"))
+    return hasher.hexdigest()
+
+
+@dataclass(frozen=True)
+class CoalescingConfig:
+    """
+    Settings of a `ResultCoalescer`.
+
+    Attributes:
+        cache_ttl: How long finished results are kept, in seconds; 0 disables
+                   the result cache (in-flight deduplication still applies).
+        cache_bytes: The memory budget of the result cache.
+    """
+
+    cache_ttl: float = DEFAULT_RESULT_CACHE_TTL
+    cache_bytes: int = DEFAULT_RESULT_CACHE_BYTES
+
+    @classmethod
+    def from_environment(cls) -> Self:
+        """
+        Reads the configuration from `BASEBENDER_RESULT_CACHE_TTL` and
+        `BASEBENDER_RESULT_CACHE_BYTES`.
+        """
+        return cls(
+            cache_ttl=env_float("BASEBENDER_RESULT_CACHE_TTL", DEFAULT_RESULT_CACHE_TTL),
+            cache_bytes=env_int("BASEBENDER_RESULT_CACHE_BYTES", DEFAULT_RESULT_CACHE_BYTES),
+        )
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """
+    A snapshot of the counters of a `ResultCoalescer`.
+
+    Attributes:
+        in_flight: Conversions currently running.
+        coalesced: Requests that joined a conversion already in flight.
+        cache_hits: Requests answered from the result cache.
+        cache_misses: Requests not found in the result cache.
+        cache_entries: Results currently cached.
+        cache_bytes: The estimated memory used by cached results.
+        cache_evictions: Results dropped to stay within the memory budget.
+    """
+
+    in_flight: int
+    coalesced: int
+    cache_hits: int
+    cache_misses: int
+    cache_entries: int
+    cache_bytes: int
+    cache_evictions: int
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[str]
+    token: CancellationToken
+    waiters: int = 0
+
+
+class ResultCoalescer:
+    """
+    Runs each distinct conversion once, however many identical requests wait for it.
+
+    A conversion runs in its own task with its own `CancellationToken`, so one
+    waiting client disconnecting does not fail the others; it is cancelled
+    only when every waiting client has gone. Failed or cancelled conversions
+    are not cached.
+    """
+
+    def __init__(self, config: CoalescingConfig | None = None) -> None:
+        self._config = config or CoalescingConfig()
+        self._flights: dict[str, _Flight] = {}
+        self._cache: OrderedDict[str, tuple[str, float, int]] = OrderedDict()
+        self._cache_bytes = 0
+        self._coalesced = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def config(self) -> CoalescingConfig:
+        """The settings of this coalescer."""
+        return self._config
+
+    def _cached(self, key: str) -> str | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._cache.move_to_end(key)
+        return entry[0]
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._cache_bytes -= size
+
+    def _store(self, key: str, result: str) -> None:
+        size = sys.getsizeof(result) + sys.getsizeof(key)
+        if not self._config.cache_ttl or size > self._config.cache_bytes:
+            return
+        if key in self._cache:
+            self._drop(key)
+        self._cache[key] = (result, time.monotonic() + self._config.cache_ttl, size)
+        self._cache_bytes += size
+        while self._cache_bytes > self._config.cache_bytes:
+            self._drop(next(iter(self._cache)))
+            self._evictions += 1
+
+    def _finish(self, key: str, flight: _Flight, task: asyncio.Future[str]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    async def run(
+        self,
+        key: str,
+        compute: Callable[[CancellationToken], Awaitable[str]],
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Returns the result of the conversion `key`, computing it at most once
+        at a time.
+
+        Args:
+            key: The key of the conversion (see `request_key`).
+            compute: Performs the conversion, honouring the given token.
+            timeout: The time limit of a new conversion, in seconds.
+
+        Returns:
+            The result of the conversion.
+
+        Raises:
+            Exception: Whatever `compute` raised, for every waiting request.
+        """
+        if self._config.cache_ttl:
+            cached = self._cached(key)
+            if cached is not None:
+                self._hits += 1
+                return cached
+            self._misses += 1
+
+        flight = self._flights.get(key)
+        if flight is None:
+            token = CancellationToken(timeout)
+            flight = _Flight(asyncio.ensure_future(compute(token)), token)
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._finish, key, flight))
+        else:
+            self._coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.token.cancel("Every client waiting for the result has gone.")
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def stats(self) -> CoalescingStats:
+        """Returns a snapshot of the counters."""
+        return CoalescingStats(
+            in_flight=len(self._flights),
+            coalesced=self._coalesced,
+            cache_hits=self._hits,
+            cache_misses=self._misses,
+            cache_entries=len(self._cache),
+            cache_bytes=self._cache_bytes,
+            cache_evictions=self._evictions,
+        )
+
+    def clear(self) -> None:
+        """Drops every cached result."""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+
+@functools.cache
+def get_coalescer() -> ResultCoalescer:
+    """Returns the API's coalescer, configured from the environment."""
+    return ResultCoalescer(CoalescingConfig.from_environment())
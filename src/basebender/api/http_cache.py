@@ -0,0 +1,105 @@
+"""
+This module provides HTTP caching helpers for read-mostly endpoints.
+
+Responses are serialized once into a `CachedBody` with a strong ETag and
+served as raw bytes; clients that send a matching `If-None-Match` header get
+a bodyless 304 response.
+"""
+
+import hashlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Self
+
+from fastapi import Response
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """
+    A serialized response body and its strong ETag.
+
+    Attributes:
+        body: The serialized body.
+        etag: The quoted strong ETag of the body.
+        media_type: The media type of the body.
+    """
+
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+
+    @classmethod
+    def from_body(cls, body: bytes, media_type: str = "application/json") -> Self:
+        """Creates a `CachedBody`, deriving the ETag from a hash of the body."""
+        return cls(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"', media_type)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks an `If-None-Match` header against an ETag (weak comparison, as
+    RFC 9110 requires for `If-None-Match`).
+
+    Examples:
+        >>> etag_matches('W/"abc", "def"', '"abc"')
+        True
+        >>> etag_matches('"abc"', '"def"')
+        False
+        >>> etag_matches("*", '"abc"')
+        True
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def cached_response(cached: CachedBody, if_none_match: str | None, cache_control: str) -> Response:
+    """
+    Serves a `CachedBody`, or a 304 response if the client's copy is current.
+
+    Args:
+        cached: The body to serve.
+        if_none_match: The request's `If-None-Match` header, if any.
+        cache_control: The `Cache-Control` header value.
+
+    Returns:
+        A 200 response with the body, or an empty 304 response.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type=cached.media_type, headers=headers)
+
+
+class SerializedCache[T]:
+    """
+    Holds the serialized form of one source object.
+
+    The body is rebuilt only when `get` is called with a different object
+    (by identity), e.g., after the digit-set catalog has been reloaded.
+    """
+
+    def __init__(self, serialize: Callable[[T], bytes]) -> None:
+        self._serialize = serialize
+        self._lock = threading.Lock()
+        self._entry: tuple[T, CachedBody] | None = None
+
+    def get(self, source: T) -> CachedBody:
+        """
+        Returns the cached body of `source`, serializing it if it changed.
+
+        Args:
+            source: The object to serialize.
+
+        Returns:
+            The `CachedBody` of `source`.
+        """
+        entry = self._entry
+        if entry is not None and entry[0] is source:
+            return entry[1]
+        with self._lock:
+            if self._entry is None or self._entry[0] is not source:
+                self._entry = (source, CachedBody.from_body(self._serialize(source)))
+            return self._entry[1]
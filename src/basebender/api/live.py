@@ -0,0 +1,289 @@
+"""
+This module implements the session protocol of the `/rebase/live` WebSocket.
+
+A `LiveSession` keeps one client's input in a `LiveRebase`
+(`basebender.rebaser.live`), applies the client's edits and sends the result
+of the latest input. Edits that arrive during a conversion are queued and
+applied together afterwards; results that are already outdated are not sent.
+
+The digit sets of a "configure" message are resolved, and the output budget
+checked, by the functions the API passes in, so this module does not depend
+on the application.
+"""
+
+import asyncio
+from collections.abc import Callable
+from typing import Any, Literal
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, Field, ValidationError
+
+from basebender.api.admission import AdmissionConfig
+from basebender.api.settings import rebase_timeout, slice_budget
+from basebender.rebaser.cancellation import CancellationToken, RebaseTimeoutError
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.live import LiveRebase
+
+# Messages a session queues during a conversion; a client that sends more is
+# closed with code 1008 (policy violation).
+MAX_LIVE_PENDING_MESSAGES = 256
+
+
+class LiveSessionMessage(BaseModel):
+    """
+    Pydantic model for a message of a client in a `/rebase/live` session.
+
+    Attributes:
+        type: "configure" selects the digit sets (like `RebaseRequest`);
+            "append" adds `text` to the input; "delete" removes the last
+            `count` characters; "replace" replaces the input from position
+            `start` to its end with `text`.
+        seq: An optional client sequence number, echoed in the results and
+            errors caused by this message.
+        text: The text to append or insert.
+        count: The number of characters to delete.
+        start: The position where a replacement starts.
+        source_digit_set: As in `RebaseRequest`, for "configure".
+        source_digit_set_id: As in `RebaseRequest`, for "configure".
+        target_digit_set: As in `RebaseRequest`, for "configure".
+        target_digit_set_id: As in `RebaseRequest`, for "configure".
+    """
+
+    type: Literal["configure", "append", "delete", "replace"]
+    seq: int | None = None
+    text: str = ""
+    count: int = Field(default=0, ge=0)
+    start: int = Field(default=0, ge=0)
+    source_digit_set: str | None = None
+    source_digit_set_id: str | None = None
+    target_digit_set: str | None = None
+    target_digit_set_id: str | None = None
+
+
+# Builds the `LiveRebase` of a "configure" message and returns it with the
+# names of its source and target digit sets; raises `HTTPException` for
+# unknown digit set IDs and `ValueError` for invalid digit sets.
+type Configure = Callable[[LiveSessionMessage], tuple[LiveRebase, str, str]]
+
+# Raises `HTTPException` if the estimated output of an input is too large.
+type CheckOutput = Callable[[DigitSetRebaser, str], None]
+
+# A queued error: the `seq` it refers to, its message and its detail.
+type QueuedError = tuple[int | None, str, str | None]
+
+
+def _utf8_length(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _http_error(exc: HTTPException) -> tuple[str, str | None]:
+    """Returns the message and detail of an `ErrorResponse` raised as `HTTPException`."""
+    detail: Any = exc.detail
+    if isinstance(detail, dict):
+        return str(detail.get("message", "Error")), detail.get("detail")
+    return "Error", str(detail)
+
+
+class LiveSession:
+    """The state of one `/rebase/live` connection."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        live: LiveRebase,
+        configure: Configure,
+        check_output: CheckOutput,
+    ) -> None:
+        """
+        Args:
+            websocket: The connection.
+            live: The initial conversion, before any "configure" message.
+            configure: Builds the conversion of a "configure" message.
+            check_output: Checks the output budget before every conversion.
+        """
+        self.websocket = websocket
+        self.live = live
+        self.pending: list[LiveSessionMessage | QueuedError] = []
+        self.changed = asyncio.Event()
+        self.max_input_bytes = AdmissionConfig.from_environment().max_input_bytes
+        # The UTF-8 length of the input, kept up to date by `apply`.
+        self.input_bytes = 0
+        self.source_name = "Dynamically Derived"
+        self.target_name = "Echo Input"
+        self._configure = configure
+        self._check_output = check_output
+
+    def receive(self, raw: str | None) -> bool:
+        """
+        Queues a client message (or the error it causes) for `run`.
+
+        Args:
+            raw: The text of the message, or `None` for a binary frame.
+
+        Returns:
+            `False` if `MAX_LIVE_PENDING_MESSAGES` messages are already
+            queued; the message is dropped.
+        """
+        if len(self.pending) >= MAX_LIVE_PENDING_MESSAGES:
+            return False
+        if raw is None:
+            self.pending.append(
+                (None, "Invalid Message", "Messages must be sent as JSON text frames.")
+            )
+        else:
+            try:
+                self.pending.append(LiveSessionMessage.model_validate_json(raw))
+            except ValidationError as exc:
+                self.pending.append((None, "Invalid Message", str(exc)))
+        self.changed.set()
+        return True
+
+    async def send_error(self, seq: int | None, message: str, detail: str | None) -> None:
+        await self.websocket.send_json(
+            {"type": "error", "seq": seq, "message": message, "detail": detail}
+        )
+
+    def configure(self, message: LiveSessionMessage) -> None:
+        """
+        Switches to the digit sets of `message`, keeping the input.
+
+        Raises:
+            HTTPException: If a digit set ID is unknown.
+            ValueError: If a digit set is invalid.
+        """
+        live, source_name, target_name = self._configure(message)
+        live.append(self.live.text)
+        self.live, self.source_name, self.target_name = live, source_name, target_name
+
+    def apply(self, message: LiveSessionMessage) -> None:
+        """
+        Applies an edit or configuration message.
+
+        Raises:
+            HTTPException: If a digit set ID is unknown.
+            ValueError: If the message is invalid or the input would exceed
+                        `BASEBENDER_MAX_INPUT_BYTES` bytes as UTF-8.
+        """
+        live = self.live
+        if message.type == "configure":
+            self.configure(message)
+            return
+        if message.type == "delete":
+            removed = live.text[len(live.text) - min(message.count, len(live.text)) :]
+            live.delete(message.count)
+            self.input_bytes -= _utf8_length(removed)
+            return
+        if message.type == "append":
+            input_bytes = self.input_bytes + _utf8_length(message.text)
+        else:
+            replaced = live.text[message.start :]
+            input_bytes = self.input_bytes - _utf8_length(replaced) + _utf8_length(message.text)
+        if self.max_input_bytes and input_bytes > self.max_input_bytes:
+            raise ValueError(f"The input would exceed the limit of {self.max_input_bytes} bytes.")
+        if message.type == "append":
+            live.append(message.text)
+        else:
+            live.replace(message.text, message.start)
+        self.input_bytes = input_bytes
+
+    async def rebase(self) -> str:
+        """
+        Rebases the current input within the output budget and time limit.
+
+        Raises:
+            HTTPException: If the estimated output exceeds the budget.
+            RebaseTimeoutError: If the conversion exceeds the time limit.
+            ValueError: If the conversion fails.
+        """
+        live = self.live
+        self._check_output(live.rebaser, live.text)
+        token = CancellationToken(rebase_timeout())
+        return await live.arebase(slice_budget=slice_budget(), token=token)
+
+    async def run(self) -> None:
+        """
+        Applies queued messages and sends the result of the latest input.
+
+        Messages that arrive during a conversion are queued; when it finishes,
+        its result is dropped if they changed the input, and the next
+        conversion covers all of them at once.
+        """
+        seq: int | None = None
+        while True:
+            await self.changed.wait()
+            self.changed.clear()
+            messages, self.pending = self.pending, []
+            applied = False
+            for message in messages:
+                if isinstance(message, tuple):
+                    await self.send_error(*message)
+                    continue
+                try:
+                    self.apply(message)
+                except HTTPException as exc:
+                    await self.send_error(message.seq, *_http_error(exc))
+                    continue
+                except ValueError as exc:
+                    await self.send_error(message.seq, "Invalid Edit", str(exc))
+                    continue
+                applied = True
+                if message.seq is not None:
+                    seq = message.seq
+            if not applied:
+                continue
+            try:
+                rebased_text = await self.rebase()
+            except HTTPException as exc:
+                await self.send_error(seq, *_http_error(exc))
+                continue
+            except RebaseTimeoutError as exc:
+                await self.send_error(seq, "Rebase Timeout", str(exc))
+                continue
+            except (ValueError, IndexError) as exc:
+                await self.send_error(seq, "Rebase Error", str(exc))
+                continue
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                # Catching broad exception so one failed conversion does not end the session.
+                await self.send_error(seq, "Internal Server Error", str(exc))
+                continue
+            if self.pending:
+                # Stale: newer edits arrived during the conversion.
+                continue
+            await self.websocket.send_json(
+                {
+                    "type": "result",
+                    "seq": seq,
+                    "rebased_text": rebased_text,
+                    "input_length": len(self.live.text),
+                    "source_digit_set_used": self.source_name,
+                    "target_digit_set_used": self.target_name,
+                }
+            )
+
+    async def serve(self) -> None:
+        """
+        Accepts the connection and runs the session until the client
+        disconnects.
+
+        Binary frames are answered with an "Invalid Message" error; a client
+        that has more than `MAX_LIVE_PENDING_MESSAGES` messages queued is
+        closed with code 1008.
+        """
+        websocket = self.websocket
+        await websocket.accept()
+        worker = asyncio.create_task(self.run())
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if not self.receive(message.get("text")):
+                    await websocket.close(code=1008, reason="Too many pending messages.")
+                    break
+                if worker.done():
+                    worker.result()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
@@ -5,35 +5,161 @@ It provides endpoints for listing available digit sets and rebaseing text
 between different digit sets.
 """
 
+import asyncio
+import codecs
+import dataclasses
 import functools
+import json
+import tempfile
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Annotated, Any
 
-import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import RedirectResponse
-from pydantic import BaseModel
+from fastapi import (
+    Depends,
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+)
+from fastapi.exception_handlers import (
+    http_exception_handler,
+    request_validation_exception_handler,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Route
 
+from basebender.api.admission import AdmissionConfig, AdmissionMiddleware, max_output_chars
+from basebender.api.coalescing import get_coalescer, request_key
+from basebender.api.http_cache import CachedBody, SerializedCache, cached_response
+from basebender.api.live import LiveSession, LiveSessionMessage
+from basebender.api.metrics import (
+    CONTENT_TYPE,
+    CONVERSION_SECONDS,
+    INPUT_CHARS_STATE,
+    REGISTRY,
+    CounterFunction,
+    GaugeFunction,
+    MetricsMiddleware,
+    record_error,
+)
+from basebender.api.registry import get_registry
+from basebender.api.routing import get_router
+from basebender.api.settings import (
+    batch_inline_chars,
+    catalog_poll_interval,
+    digit_sets_max_age,
+    rebase_timeout,
+    slice_budget,
+    warmup_pairs,
+)
+from basebender.api.streaming import LineSplitter, PumpedStreamingResponse, RequestBodyPump
+from basebender.api.warmup import WarmupState, sample_input, warm_up
+from basebender.api.wire import (
+    FRAMES,
+    FRAMES_MEDIA_TYPE,
+    JSON,
+    JSON_MEDIA_TYPE,
+    MSGPACK,
+    MSGPACK_MEDIA_TYPE,
+    FramesWriter,
+    decode_frames,
+    encode_frames,
+    fields_to_dict,
+    pack_msgpack,
+    request_format,
+    response_format,
+    unpack_msgpack,
+)
+from basebender.rebaser.cancellation import CancellationToken, RebaseTimeoutError
+from basebender.rebaser.catalog import CatalogDerived, CatalogSnapshot, get_catalog
+from basebender.rebaser.codegen import CompiledCache, CompiledRebaser, compiled_cache_stats
 from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
-from basebender.rebaser.digit_sets import get_predefined_digit_sets
+from basebender.rebaser.digit_sets import SuggestIndex, get_suggest_index
+from basebender.rebaser.live import LiveRebase
 from basebender.rebaser.models import DigitSet
 
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Warms the API up in the background (see `/ready`), watches the digit-set
+    configuration files and shuts down the conversion pools when the server
+    stops.
+    """
+    catalog = get_catalog()
+    catalog.poll_interval = catalog_poll_interval()
+    if catalog.poll_interval:
+        catalog.watch()
+    warmup = asyncio.ensure_future(asyncio.to_thread(_warm_up))
+    yield
+    warmup.cancel()
+    catalog.stop_watching()
+    get_router().shutdown()
+
+
 APP = FastAPI(
     title="BaseBender API",
     description=(
         "API for rebaseing text between different digit sets and listing available digit sets."
     ),
     version="1.0.0",
+    lifespan=_lifespan,
 )
+APP.add_middleware(AdmissionMiddleware)
+APP.add_middleware(
+    MetricsMiddleware,
+    paths=lambda: [route.path for route in APP.routes if isinstance(route, Route)],
+)
+
+
+@APP.exception_handler(HTTPException)
+async def _count_http_error(request: Request, exc: HTTPException) -> Response:
+    """Counts error responses by their message (see `/metrics`)."""
+    detail = exc.detail
+    error_type = detail.get("message") if isinstance(detail, dict) else None
+    record_error(request.scope, str(error_type or exc.status_code))
+    return await http_exception_handler(request, exc)
+
+
+@APP.exception_handler(RequestValidationError)
+async def _count_validation_error(request: Request, exc: RequestValidationError) -> Response:
+    """Counts invalid requests (see `/metrics`)."""
+    record_error(request.scope, "Validation Error")
+    return await request_validation_exception_handler(request, exc)
+
 
+def _reset_catalog_caches(snapshot: CatalogSnapshot) -> Mapping[str, DigitSet]:
+    """Drops the values cached for an older catalog and returns the digit sets of `snapshot`."""
+    _get_rebaser.cache_clear()
+    _COMPILED.clear()
+    _suggest_body.cache_clear()
+    return snapshot.digit_sets
 
-@functools.cache
-def _load_digit_set_data() -> dict[str, DigitSet]:
+
+_CATALOG = CatalogDerived(_reset_catalog_caches)
+
+
+def _load_digit_set_data() -> Mapping[str, DigitSet]:
     """
-    Loads and caches predefined digit set data.
+    Returns the predefined digit sets of the current catalog.
+
+    After the catalog has been reloaded, the rebasers, compiled functions and
+    `/suggest` bodies cached for the previous one are dropped on first use.
 
     Returns:
-        A dictionary mapping digit set IDs to DigitSet objects.
+        A read-only mapping of digit set IDs to DigitSet objects.
     """
-    return get_predefined_digit_sets()
+    return _CATALOG.get()
 
 
 @APP.get("/", include_in_schema=False)
@@ -56,36 +182,279 @@ class DigitSetInfo(BaseModel):
         name: A human-readable name for the digit set (e.g., "Binary", "Decimal").
         digits: The string containing all unique digits of the set in order.
         source: The origin of the digit set (e.g., "predefined", "cli_input", "api_input").
+        mode: The conversion mode of the digit set ("positional" or "block").
     """
 
     id: str
     name: str
     digits: str
     source: str
+    mode: str = "positional"
+
+
+# The largest page of `/digitsets`. Larger catalogs are not serialized as a
+# whole during the warmup; their full list is built on first request.
+MAX_DIGIT_SET_PAGE = 1000
+
+
+def _serialize_digit_set_page(digit_sets: Mapping[str, DigitSet], ids: Iterable[str]) -> bytes:
+    """Serializes the digit sets of `ids` in the shape of `list[DigitSetInfo]`."""
+    digit_set_list = []
+    for digit_set_id in ids:
+        digit_set_info = digit_sets[digit_set_id]
+        digit_set_list.append(
+            DigitSetInfo(
+                id=digit_set_id,
+                name=digit_set_info.name,
+                digits=digit_set_info.digits,
+                source=digit_set_info.source,
+                mode=digit_set_info.mode,
+            )
+        )
+    return _DIGIT_SET_LIST_ADAPTER.dump_json(digit_set_list)
+
+
+def _serialize_digit_sets(digit_sets: Mapping[str, DigitSet]) -> bytes:
+    """Serializes the digit-set catalog in the shape of `list[DigitSetInfo]`."""
+    return _serialize_digit_set_page(digit_sets, digit_sets)
+
+
+_DIGIT_SET_LIST_ADAPTER = TypeAdapter(list[DigitSetInfo])
+_DIGIT_SET_LIST_CACHE = SerializedCache(_serialize_digit_sets)
 
 
 @APP.get(
     "/digitsets",
     response_model=list[DigitSetInfo],
     summary="List all available digit sets",
+    responses={304: {"description": "The client's cached copy (by `ETag`) is current."}},
 )
-async def list_digit_sets() -> list[DigitSetInfo]:
+async def list_digit_sets(
+    prefix: str | None = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_DIGIT_SET_PAGE)] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
     """
     Retrieves a list of all available digit sets, including their unique IDs,
     names, digits, and source.
+
+    - `prefix` keeps the digit sets whose ID starts with it (e.g., `user:`).
+    - `offset` and `limit` select a page of the (filtered) list in catalog
+      order; the `X-Total-Count` header gives the length of the whole list.
+      Only the digits of the page are read from the catalog.
+
+    Responses carry a strong `ETag` and `Cache-Control`
+    (`BASEBENDER_DIGITSETS_MAX_AGE` seconds); a request whose `If-None-Match`
+    matches gets an empty 304 response. The unfiltered list is serialized
+    once per catalog.
     """
     digit_sets = _load_digit_set_data()
-    digit_set_list: list[DigitSetInfo] = []
-    for digit_set_id, digit_set_info in digit_sets.items():
-        digit_set_list.append(
-            DigitSetInfo(
-                id=digit_set_id,
-                name=digit_set_info.name,
-                digits=digit_set_info.digits,
-                source=digit_set_info.source,
+    cache_control = f"public, max-age={digit_sets_max_age()}"
+    if prefix is None and offset == 0 and limit is None:
+        return cached_response(_DIGIT_SET_LIST_CACHE.get(digit_sets), if_none_match, cache_control)
+    ids = [digit_set_id for digit_set_id in digit_sets if digit_set_id.startswith(prefix or "")]
+    page = ids[offset : None if limit is None else offset + limit]
+    cached = CachedBody.from_body(_serialize_digit_set_page(digit_sets, page))
+    response = cached_response(cached, if_none_match, cache_control)
+    response.headers["X-Total-Count"] = str(len(ids))
+    return response
+
+
+class RegisterDigitSetRequest(BaseModel):
+    """
+    Pydantic model for registering a custom digit set.
+
+    Attributes:
+        digits: The digits of the digit set; duplicates are removed.
+        name: An optional human-readable name.
+    """
+
+    digits: str
+    name: str | None = None
+
+
+class RegisteredDigitSetInfo(DigitSetInfo):
+    """
+    Pydantic model for a registered digit set.
+
+    Attributes:
+        expires_in: The seconds until the registration expires unless it is
+            registered again.
+    """
+
+    expires_in: float
+
+
+@APP.post(
+    "/digitsets",
+    response_model=RegisteredDigitSetInfo,
+    status_code=201,
+    summary="Register a custom digit set",
+)
+async def register_digit_set(
+    request: RegisterDigitSetRequest, response: Response
+) -> RegisteredDigitSetInfo:
+    """
+    Registers a custom digit set and returns its ID, which can be used as
+    `source_digit_set_id` or `target_digit_set_id` instead of sending the
+    digits with every request.
+
+    - The ID is derived from the digits, so registering the same digits again
+      returns the same ID (with status 200) and extends its expiry.
+    - Registrations expire after `BASEBENDER_REGISTRY_TTL` seconds; at most
+      `BASEBENDER_REGISTRY_SIZE` are kept, dropping the least recently used.
+    """
+    try:
+        registration = get_registry().register(request.digits, request.name)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(message="Invalid Digit Set", detail=str(exc)).model_dump(),
+        ) from exc
+    if not registration.created:
+        response.status_code = 200
+    digit_set = registration.digit_set
+    return RegisteredDigitSetInfo(
+        id=registration.digit_set_id,
+        name=digit_set.name,
+        digits=digit_set.digits,
+        source=digit_set.source,
+        mode=digit_set.mode,
+        expires_in=max(0.0, registration.expires_at - time.monotonic()),
+    )
+
+
+# The default and maximum number of suggestions per input.
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 100
+
+# The number of serialized `/suggest` responses kept for repeated queries.
+SUGGEST_CACHE_SIZE = 1024
+
+
+class SuggestionInfo(BaseModel):
+    """
+    Pydantic model for a suggested digit set.
+
+    Attributes:
+        id: The unique identifier of the digit set.
+        name: The human-readable name of the digit set.
+        mode: The conversion mode of the digit set ("positional" or "block").
+        coverage: The fraction of the digit set's digits that occur in the
+            input; suggestions are ranked by it, closest fit first.
+    """
+
+    id: str
+    name: str
+    mode: str
+    coverage: float
+
+
+class SuggestResponse(BaseModel):
+    """
+    Pydantic model for the suggestions of one input.
+
+    Attributes:
+        suggestions: The digit sets containing every character of the input,
+            closest fit first.
+    """
+
+    suggestions: list[SuggestionInfo]
+
+
+class SuggestBatchRequest(BaseModel):
+    """
+    Pydantic model for suggesting digit sets for several inputs.
+
+    Attributes:
+        texts: The inputs.
+        limit: The maximum number of suggestions per input.
+    """
+
+    texts: list[str]
+    limit: int = Field(default=DEFAULT_SUGGESTIONS, ge=1, le=MAX_SUGGESTIONS)
+
+
+class SuggestBatchResponse(BaseModel):
+    """
+    Pydantic model for the suggestions of several inputs.
+
+    Attributes:
+        results: The suggestions of every input, in order.
+    """
+
+    results: list[SuggestResponse]
+
+
+def _suggest_response(index: SuggestIndex, text: str, limit: int) -> SuggestResponse:
+    return SuggestResponse(
+        suggestions=[
+            SuggestionInfo(
+                id=suggestion.digit_set_id,
+                name=suggestion.digit_set.name,
+                mode=suggestion.digit_set.mode,
+                coverage=suggestion.coverage,
             )
-        )
-    return digit_set_list
+            for suggestion in index.suggest(text, limit)
+        ]
+    )
+
+
+@functools.lru_cache(maxsize=SUGGEST_CACHE_SIZE)
+def _suggest_body(index: SuggestIndex, text: str, limit: int) -> CachedBody:
+    """Serializes the suggestions of `text`; keyed by index so a new catalog misses."""
+    return CachedBody.from_body(_suggest_response(index, text, limit).model_dump_json().encode())
+
+
+@APP.get(
+    "/suggest",
+    response_model=SuggestResponse,
+    summary="Suggest digit sets for an input",
+    responses={304: {"description": "The client's cached copy (by `ETag`) is current."}},
+)
+async def suggest(
+    http_request: Request,
+    text: str,
+    limit: Annotated[int, Query(ge=1, le=MAX_SUGGESTIONS)] = DEFAULT_SUGGESTIONS,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Suggests the predefined digit sets that contain every character of
+    `text`, closest fit (smallest digit set) first, at most `limit`.
+
+    Suggestions are looked up in a character index built once per catalog.
+    They only change with the catalog, so responses carry a strong `ETag` and
+    the `Cache-Control` of `/digitsets`; a request whose `If-None-Match`
+    matches gets an empty 304 response.
+    """
+    http_request.state.input_chars = len(text)
+    cached = _suggest_body(get_suggest_index(), text, limit)
+    return cached_response(cached, if_none_match, f"public, max-age={digit_sets_max_age()}")
+
+
+@APP.post(
+    "/suggest/batch",
+    response_model=SuggestBatchResponse,
+    summary="Suggest digit sets for many inputs",
+)
+async def suggest_batch(
+    http_request: Request, request: SuggestBatchRequest
+) -> SuggestBatchResponse:
+    """
+    Suggests digit sets for every input of `texts`, as `/suggest` does for
+    one, answering repeated inputs once.
+    """
+    http_request.state.input_chars = sum(len(text) for text in request.texts)
+    index = get_suggest_index()
+    responses: dict[str, SuggestResponse] = {}
+    results = []
+    for text in request.texts:
+        response = responses.get(text)
+        if response is None:
+            response = responses[text] = _suggest_response(index, text, request.limit)
+        results.append(response)
+    return SuggestBatchResponse(results=results)
 
 
 class RebaseRequest(BaseModel):
@@ -141,79 +510,232 @@ class RebaseResponse(BaseModel):
     error: ErrorResponse | None = None
 
 
-@APP.post(
-    "/rebase",
-    response_model=RebaseResponse,
-    summary="Rebase text between digit sets",
-)
-async def rebase_text(request: RebaseRequest) -> RebaseResponse:
+# The number of rebasers kept for reuse across requests.
+REBASER_CACHE_SIZE = 256
+
+# Inputs up to this length (single values and batch items) use the compiled
+# rebaser of the pair.
+COMPILED_ITEM_CHARS = 4096
+
+
+@functools.lru_cache(maxsize=REBASER_CACHE_SIZE)
+def _get_rebaser(out_digit_set: DigitSet | None, in_digit_set: DigitSet | None) -> DigitSetRebaser:
     """
-    Rebasees input text from a source digit set to a target digit set.
+    Returns a (cached) rebaser for a pair of digit sets.
 
-    - If `input_text` is not provided, an empty string is used.
-    - If `source_digit_set_id` is not provided, the source digit set is
-      dynamically derived from `input_text`.
-    - If `target_digit_set_id` is not provided, the input string is returned
-      with digits not in the derived/provided source digit set removed. If the
-      target digit set has a length of 1, an empty string will be returned.
+    Rebasers are reused across requests, so the digit maps of a pair are only
+    built once.
+
+    Raises:
+        ValueError: If a digit set is invalid (e.g., a block layout).
     """
-    digit_sets_data = _load_digit_set_data()
+    return DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=in_digit_set)
 
-    input_text: str = request.input_text if request.input_text is not None else ""
-    source_digit_set_obj: DigitSet | None = None
-    target_digit_set_obj: DigitSet | None = None
-    source_digit_set_name: str = "Dynamically Derived"
-    target_digit_set_name: str = "Echo Input"
-
-    # Determine source digit set
-    if request.source_digit_set:  # Direct digit set string takes precedence
-        source_digit_set_obj = DigitSet(
-            name="Provided", digits=request.source_digit_set, source="api_input"
-        )
-        source_digit_set_name = f"Provided: '{request.source_digit_set}'"
-    elif request.source_digit_set_id:
-        source_digit_set_obj = digit_sets_data.get(request.source_digit_set_id)
-        if source_digit_set_obj is None:
-            raise HTTPException(
-                status_code=400,
-                detail=ErrorResponse(
-                    message="Invalid Source Digit Set ID",
-                    detail=(
-                        f"Source digit set with ID '{request.source_digit_set_id}' not found."
-                    ),
-                ).model_dump(),
-            ) from None
-        source_digit_set_name = source_digit_set_obj.name
 
-    # Determine target digit set
-    if request.target_digit_set:  # Direct digit set string takes precedence
-        target_digit_set_obj = DigitSet(
-            name="Provided", digits=request.target_digit_set, source="api_input"
+# At most this many pairs wait for compilation; the pairs of further
+# requests are compiled when one of their later requests finds room.
+MAX_PENDING_COMPILES = 64
+
+_COMPILED = CompiledCache[DigitSetRebaser]()
+_COMPILING: set[DigitSetRebaser] = set()
+_COMPILING_LOCK = threading.Lock()
+# One thread, so compiling never competes with conversions for more than a core.
+_COMPILE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="basebender-compile")
+
+
+def _compile_now(rebaser: DigitSetRebaser) -> CompiledRebaser | None:
+    """Compiles a rebaser into `_COMPILED`; returns `None` if it cannot be compiled."""
+    try:
+        compiled = rebaser.compile()
+    except ValueError:
+        compiled = None
+    _COMPILED.put(rebaser, compiled)
+    return compiled
+
+
+def _compile_in_background(rebaser: DigitSetRebaser) -> None:
+    try:
+        _compile_now(rebaser)
+    finally:
+        with _COMPILING_LOCK:
+            _COMPILING.discard(rebaser)
+
+
+def _get_compiled(rebaser: DigitSetRebaser) -> CompiledRebaser | None:
+    """
+    Returns the compiled rebaser of a (cached) rebaser once it is compiled.
+
+    Compiling builds lookup tables, so it never runs on the event loop: the
+    first request of a pair schedules it on a background thread and gets
+    `None`, like requests whose pair cannot be compiled, and converts with
+    the step engines. Compiled rebasers are kept within the memory budget
+    of `CompiledCache`.
+    """
+    found, compiled = _COMPILED.lookup(rebaser)
+    if found:
+        return compiled
+    with _COMPILING_LOCK:
+        if rebaser in _COMPILING or len(_COMPILING) >= MAX_PENDING_COMPILES:
+            return None
+        _COMPILING.add(rebaser)
+    _COMPILE_POOL.submit(_compile_in_background, rebaser)
+    return None
+
+
+def _resolve_digit_set(
+    digits: str | None, digit_set_id: str | None, role: str, default_name: str
+) -> tuple[DigitSet | None, str]:
+    """
+    Resolves the source or target digit set of a request.
+
+    A direct digit set string takes precedence over a digit set ID, which is
+    looked up among the predefined and then the registered digit sets.
+
+    Args:
+        digits: The digit set string given in the request, if any.
+        digit_set_id: The predefined digit set ID given in the request, if any.
+        role: "Source" or "Target", used in names and error messages.
+        default_name: The name reported if neither is given.
+
+    Returns:
+        A tuple of the digit set (or `None`) and the name reported to the client.
+
+    Raises:
+        HTTPException: With status 400 if the ID is unknown.
+    """
+    if digits:
+        return DigitSet(name="Provided", digits=digits, source="api_input"), (
+            f"Provided: '{digits}'"
         )
-        target_digit_set_name = f"Provided: '{request.target_digit_set}'"
-    elif request.target_digit_set_id:
-        target_digit_set_obj = digit_sets_data.get(request.target_digit_set_id)
-        if target_digit_set_obj is None:
+    if digit_set_id:
+        digit_set = _load_digit_set_data().get(digit_set_id) or get_registry().get(digit_set_id)
+        if digit_set is None:
             raise HTTPException(
                 status_code=400,
                 detail=ErrorResponse(
-                    message="Invalid Target Digit Set ID",
-                    detail=(
-                        f"Target digit set with ID '{request.target_digit_set_id}' not found."
-                    ),
+                    message=f"Invalid {role} Digit Set ID",
+                    detail=f"{role} digit set with ID '{digit_set_id}' not found.",
                 ).model_dump(),
             ) from None
-        target_digit_set_name = target_digit_set_obj.name
+        return digit_set, digit_set.name
+    return None, default_name
+
+
+def _check_output_budget(rebaser: DigitSetRebaser, input_text: str) -> None:
+    """
+    Rejects conversions whose estimated output exceeds `BASEBENDER_MAX_OUTPUT_CHARS`.
+
+    Raises:
+        HTTPException: With status 413 if the estimate exceeds the budget.
+    """
+    limit = max_output_chars()
+    plan = rebaser.plan(input_text) if limit else None
+    if plan is not None and plan.estimated_output_length > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=ErrorResponse(
+                message="Output Too Large",
+                detail=(
+                    f"The estimated output of {plan.estimated_output_length} characters "
+                    f"exceeds the limit of {limit}."
+                ),
+            ).model_dump(),
+        )
+
+
+def _check_output_length(output_length: int) -> None:
+    """
+    Rejects an output longer than `BASEBENDER_MAX_OUTPUT_CHARS`.
+
+    Raises:
+        HTTPException: With status 413 if the output exceeds the budget.
+    """
+    limit = max_output_chars()
+    if limit and output_length > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=ErrorResponse(
+                message="Output Too Large",
+                detail=f"The output of {output_length} characters exceeds the limit of {limit}.",
+            ).model_dump(),
+        )
+
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    """
+    Returns once the client disconnects.
+
+    The request body has already been read, so the next ASGI message is the
+    disconnect.
+    """
+    while True:
+        message = await http_request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _coalesced_rebase(
+    rebaser: DigitSetRebaser, key: str, input_text: str, http_request: Request
+) -> str:
+    """
+    Rebases `input_text` on its route, sharing the conversion with identical
+    concurrent requests (see `ResultCoalescer`).
+
+    Raises:
+        RebaseTimeoutError: If the conversion times out, or the client disconnects.
+    """
+
+    async def compute(token: CancellationToken) -> str:
+        return await get_router().rebase(rebaser, input_text, token, slice_budget=slice_budget())
 
-    rebased_text: str = ""
-    error_response: ErrorResponse | None = None
+    result = asyncio.ensure_future(get_coalescer().run(key, compute, rebase_timeout()))
+    watcher = asyncio.create_task(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait((result, watcher), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        result.cancel()
+    if result.cancelled():
+        raise RebaseTimeoutError("The client disconnected.")
+    return result.result()
+
+
+async def _rebase_with_limits(
+    out_digit_set: DigitSet | None,
+    in_digit_set: DigitSet | None,
+    input_text: str,
+    http_request: Request,
+) -> str:
+    """
+    Rebases a single value with the output budget, time limit, routing and
+    coalescing of `/rebase`.
 
+    Raises:
+        HTTPException: With status 413 (output budget), 503 (time limit),
+                       400 (invalid input) or 500 (unexpected error).
+    """
     try:
-        rebaser = DigitSetRebaser(
-            out_digit_set=target_digit_set_obj,
-            in_digit_set=source_digit_set_obj,
+        rebaser = _get_rebaser(out_digit_set, in_digit_set)
+        compiled = _get_compiled(rebaser) if len(input_text) <= COMPILED_ITEM_CHARS else None
+        if compiled is not None:
+            # Short inputs finish in microseconds: skip planning, routing and
+            # the disconnect watcher, and check the actual output length.
+            started = time.perf_counter()
+            rebased_text = compiled.function(input_text)
+            CONVERSION_SECONDS.observe(time.perf_counter() - started, "compiled", "convert")
+            _check_output_length(len(rebased_text))
+            return rebased_text
+        _check_output_budget(rebaser, input_text)
+        key = request_key(input_text, in_digit_set, out_digit_set)
+        return await _coalesced_rebase(rebaser, key, input_text, http_request)
+    except HTTPException:
+        raise
+    except RebaseTimeoutError as exc:
+        error_response = ErrorResponse(
+            message="Rebase Timeout",
+            detail=str(exc),
         )
-        rebased_text = rebaser.rebase(input_text)
+        raise HTTPException(status_code=503, detail=error_response.model_dump()) from exc
     except ValueError as exc:
         error_response = ErrorResponse(
             message="Rebase Error",
@@ -234,16 +756,1045 @@ async def rebase_text(request: RebaseRequest) -> RebaseResponse:
         )
         raise HTTPException(status_code=500, detail=error_response.model_dump()) from exc
 
-    return RebaseResponse(
-        rebased_text=rebased_text,
-        source_digit_set_used=source_digit_set_name,
-        target_digit_set_used=target_digit_set_name,
-        error=error_response,
+
+# Field order of `RebaseRequest` and `RebaseResponse` in length-prefixed frames.
+REBASE_REQUEST_FIELDS = (
+    "input_text",
+    "source_digit_set",
+    "source_digit_set_id",
+    "target_digit_set",
+    "target_digit_set_id",
+)
+REBASE_RESPONSE_FIELDS = ("rebased_text", "source_digit_set_used", "target_digit_set_used")
+
+_BINARY_CONTENT = {
+    media_type: {"schema": {"type": "string", "format": "binary"}}
+    for media_type in (FRAMES_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+}
+
+
+def _binary_body_openapi(model: type[BaseModel]) -> dict[str, Any]:
+    """Documents a request body that may be JSON or a binary wire format."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {JSON_MEDIA_TYPE: {"schema": model.model_json_schema()}, **_BINARY_CONTENT},
+        }
+    }
+
+
+async def _read_request_body[M: BaseModel](
+    http_request: Request,
+    model: type[M],
+    from_frames: Callable[[list[str | None]], dict[str, Any]],
+) -> M:
+    """
+    Reads and validates a request body in the format of its `Content-Type`.
+
+    Raises:
+        HTTPException: With status 415 for MessagePack without `msgpack`, or
+                       400 for malformed frames or MessagePack data.
+        RequestValidationError: If the body does not match `model` (422).
+    """
+    try:
+        wire_format = request_format(http_request.headers.get("content-type"))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=415,
+            detail=ErrorResponse(message="Unsupported Media Type", detail=str(exc)).model_dump(),
+        ) from exc
+    body = await http_request.body()
+    try:
+        if wire_format == JSON:
+            return model.model_validate_json(body)
+        data = from_frames(decode_frames(body)) if wire_format == FRAMES else unpack_msgpack(body)
+        return model.model_validate(data)
+    except ValidationError as exc:
+        errors = [
+            {**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)
+        ]
+        raise RequestValidationError(errors) from exc
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=ErrorResponse(message="Invalid Request Body", detail=str(exc)).model_dump(),
+        ) from exc
+
+
+async def _rebase_request(http_request: Request) -> RebaseRequest:
+    """Reads the `RebaseRequest` of `/rebase` in JSON, frames or MessagePack."""
+    return await _read_request_body(
+        http_request,
+        RebaseRequest,
+        lambda fields: fields_to_dict(REBASE_REQUEST_FIELDS, fields),
     )
 
 
-def start_api() -> None:
+def _encoded_response(
+    wire_format: str, body: dict[str, Any], fields: Iterable[str | None]
+) -> Response:
+    """Returns `body` as JSON or MessagePack, or `fields` as frames."""
+    if wire_format == FRAMES:
+        return Response(encode_frames(fields), media_type=FRAMES_MEDIA_TYPE)
+    if wire_format == MSGPACK:
+        return Response(pack_msgpack(body), media_type=MSGPACK_MEDIA_TYPE)
+    return JSONResponse(body)
+
+
+@APP.post(
+    "/rebase",
+    response_model=RebaseResponse,
+    summary="Rebase text between digit sets",
+    openapi_extra=_binary_body_openapi(RebaseRequest),
+    responses={
+        200: {"content": _BINARY_CONTENT},
+        415: {"model": ErrorResponse, "description": "MessagePack is not available."},
+    },
+)
+async def rebase_text(
+    request: Annotated[RebaseRequest, Depends(_rebase_request)], http_request: Request
+) -> Response:
+    """
+    Rebasees input text from a source digit set to a target digit set.
+
+    - If `input_text` is not provided, an empty string is used.
+    - If `source_digit_set_id` is not provided, the source digit set is
+      dynamically derived from `input_text`.
+    - If `target_digit_set_id` is not provided, the input string is returned
+      with digits not in the derived/provided source digit set removed. If the
+      target digit set has a length of 1, an empty string will be returned.
+    - Inputs of up to 4096 characters between explicit positional digit sets
+      are converted directly by the compiled rebaser of the pair. Other cheap
+      conversions run on the event loop in slices; more expensive ones run in
+      a thread pool or a process pool (see `/stats/routing`), so they do not
+      stall other requests.
+    - Identical concurrent requests share one conversion, and results are
+      cached for `BASEBENDER_RESULT_CACHE_TTL` seconds (see `/stats/coalescing`).
+    - Conversions that exceed `BASEBENDER_REBASE_TIMEOUT` seconds are stopped
+      with a 503 response; they are also stopped when every client waiting
+      for them has disconnected.
+    - Requests are rejected with 429 (too many concurrent conversions) or 413
+      (input body or estimated output too large) before any conversion runs.
+    - Besides JSON, the request and response may use length-prefixed UTF-8
+      frames (`application/x-basebender-frames`) or MessagePack
+      (`application/msgpack`, if installed), chosen by `Content-Type` and
+      `Accept`. Frames carry the fields in the order of `RebaseRequest` and
+      `RebaseResponse` (without `error`). Errors are always JSON.
+    """
+    input_text: str = request.input_text if request.input_text is not None else ""
+    setattr(http_request.state, INPUT_CHARS_STATE, len(input_text))
+    source_digit_set_obj, source_digit_set_name = _resolve_digit_set(
+        request.source_digit_set, request.source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target_digit_set_obj, target_digit_set_name = _resolve_digit_set(
+        request.target_digit_set, request.target_digit_set_id, "Target", "Echo Input"
+    )
+
+    rebased_text = await _rebase_with_limits(
+        target_digit_set_obj, source_digit_set_obj, input_text, http_request
+    )
+
+    # The body is shaped here rather than through `RebaseResponse`, so it is not
+    # validated and re-encoded on every request; `response_model` still
+    # documents it.
+    return _encoded_response(
+        response_format(http_request.headers.get("accept")),
+        {
+            "rebased_text": rebased_text,
+            "source_digit_set_used": source_digit_set_name,
+            "target_digit_set_used": target_digit_set_name,
+            "error": None,
+        },
+        (rebased_text, source_digit_set_name, target_digit_set_name),
+    )
+
+
+class BatchRebaseRequest(BaseModel):
+    """
+    Pydantic model for a batch rebase request.
+
+    Attributes:
+        inputs: The strings to be rebased, all with the same digit sets.
+        source_digit_set: As in `RebaseRequest`.
+        source_digit_set_id: As in `RebaseRequest`.
+        target_digit_set: As in `RebaseRequest`.
+        target_digit_set_id: As in `RebaseRequest`.
+    """
+
+    inputs: list[str]
+    source_digit_set: str | None = None
+    source_digit_set_id: str | None = None
+    target_digit_set: str | None = None
+    target_digit_set_id: str | None = None
+
+
+class BatchRebaseItem(BaseModel):
     """
-    Starts the FastAPI server using uvicorn.
+    Pydantic model for the result of one input of a batch.
+
+    Attributes:
+        rebased_text: The rebased string, or `None` if the conversion failed.
+        error: The error of this input, if any.
     """
-    uvicorn.run("basebender.api.main:APP", host="0.0.0.0", port=8000, reload=True)
+
+    rebased_text: str | None = None
+    error: ErrorResponse | None = None
+
+
+class BatchRebaseResponse(BaseModel):
+    """
+    Pydantic model for the response of a batch rebase request.
+
+    Attributes:
+        results: One result per input, in the order of the inputs.
+        source_digit_set_used: As in `RebaseResponse`.
+        target_digit_set_used: As in `RebaseResponse`.
+    """
+
+    results: list[BatchRebaseItem]
+    source_digit_set_used: str
+    target_digit_set_used: str
+
+
+def _iter_batch_results(
+    rebaser: DigitSetRebaser, inputs: list[str], token: CancellationToken
+) -> Iterator[tuple[str | None, str | None]]:
+    """
+    Converts every input of a batch with one rebaser.
+
+    Short inputs use the compiled rebaser of the pair when it can be compiled.
+    Errors of single inputs are reported per item; an expired token stops the
+    whole batch.
+
+    Yields:
+        `(rebased_text, None)` per converted input, or `(None, error detail)`.
+
+    Raises:
+        RebaseTimeoutError: If the token expires or is cancelled.
+    """
+    compiled = _get_compiled(rebaser)
+    for input_text in inputs:
+        token.check()
+        try:
+            if compiled is not None and len(input_text) <= COMPILED_ITEM_CHARS:
+                started = time.perf_counter()
+                rebased_text = compiled.function(input_text)
+                CONVERSION_SECONDS.observe(time.perf_counter() - started, "compiled", "convert")
+            else:
+                rebased_text = rebaser.rebase(input_text, token=token)
+        except (ValueError, IndexError) as exc:
+            yield None, str(exc)
+        else:
+            yield rebased_text, None
+
+
+def _batch_item(rebased_text: str | None, error: str | None) -> BatchRebaseItem:
+    """Wraps a result of `_iter_batch_results` into a `BatchRebaseItem`."""
+    if error is None:
+        return BatchRebaseItem(rebased_text=rebased_text)
+    return BatchRebaseItem(error=ErrorResponse(message="Rebase Error", detail=error))
+
+
+def _rebase_batch_items(
+    rebaser: DigitSetRebaser, inputs: list[str], token: CancellationToken
+) -> list[BatchRebaseItem]:
+    """Converts every input of a batch into a `BatchRebaseItem` (see `_iter_batch_results`)."""
+    return [
+        _batch_item(rebased_text, error)
+        for rebased_text, error in _iter_batch_results(rebaser, inputs, token)
+    ]
+
+
+def _append_batch_items(
+    rebaser: DigitSetRebaser,
+    inputs: list[str],
+    token: CancellationToken,
+    converted: list[BatchRebaseItem],
+) -> None:
+    """
+    Appends a `BatchRebaseItem` to `converted` as every input is converted, so
+    the finished items are kept when the token expires.
+
+    Raises:
+        RebaseTimeoutError: If the token expires or is cancelled.
+    """
+    for rebased_text, error in _iter_batch_results(rebaser, inputs, token):
+        converted.append(_batch_item(rebased_text, error))
+
+
+def _write_batch_frames(
+    rebaser: DigitSetRebaser, inputs: list[str], token: CancellationToken, writer: FramesWriter
+) -> None:
+    """
+    Converts every input of a batch straight into the response buffer, as
+    three frames per input: the rebased text, the error message and the
+    error detail (null where they do not apply).
+    """
+    for rebased_text, error in _iter_batch_results(rebaser, inputs, token):
+        writer.write(rebased_text)
+        writer.write(None if error is None else "Rebase Error")
+        writer.write(error)
+
+
+def _batch_result_dicts(
+    rebaser: DigitSetRebaser, inputs: list[str], token: CancellationToken
+) -> list[dict[str, Any]]:
+    """Converts every input of a batch into a plain `BatchRebaseItem` dictionary."""
+    return [
+        {
+            "rebased_text": rebased_text,
+            "error": None if error is None else {"message": "Rebase Error", "detail": error},
+        }
+        for rebased_text, error in _iter_batch_results(rebaser, inputs, token)
+    ]
+
+
+# The frames of a batch request: the digit sets (null if not given), then the inputs.
+BATCH_DIGIT_SET_FIELDS = REBASE_REQUEST_FIELDS[1:]
+
+
+def _batch_request_from_frames(fields: list[str | None]) -> dict[str, Any]:
+    if len(fields) < len(BATCH_DIGIT_SET_FIELDS) or None in fields[len(BATCH_DIGIT_SET_FIELDS) :]:
+        raise ValueError("Expected four digit set fields followed by non-null inputs.")
+    digit_sets = fields_to_dict(BATCH_DIGIT_SET_FIELDS, fields[: len(BATCH_DIGIT_SET_FIELDS)])
+    return {**digit_sets, "inputs": fields[len(BATCH_DIGIT_SET_FIELDS) :]}
+
+
+async def _batch_request(http_request: Request) -> BatchRebaseRequest:
+    """Reads the `BatchRebaseRequest` of `/rebase/batch` in JSON, frames or MessagePack."""
+    return await _read_request_body(http_request, BatchRebaseRequest, _batch_request_from_frames)
+
+
+async def _run_batch[T](convert: Callable[[], T], total_chars: int) -> T:
+    """Runs a batch conversion inline, or in the thread pool if it is long."""
+    if total_chars <= batch_inline_chars():
+        return convert()
+    return await get_router().run_in_thread(convert)
+
+
+@APP.post(
+    "/rebase/batch",
+    response_model=BatchRebaseResponse,
+    summary="Rebase many texts between the same digit sets",
+    openapi_extra=_binary_body_openapi(BatchRebaseRequest),
+    responses={
+        200: {"content": _BINARY_CONTENT},
+        415: {"model": ErrorResponse, "description": "MessagePack is not available."},
+    },
+)
+async def rebase_batch(
+    request: Annotated[BatchRebaseRequest, Depends(_batch_request)], http_request: Request
+) -> BatchRebaseResponse | Response:
+    """
+    Rebases every string of `inputs` from one source digit set to one target
+    digit set, with the same digit set rules as `/rebase`.
+
+    - The digit sets are resolved and the rebaser is built once per batch.
+    - Errors of single inputs are returned in their `error` field; the other
+      inputs are still converted.
+    - Batches longer than `BASEBENDER_BATCH_INLINE_CHARS` characters in total
+      are converted in the thread pool.
+    - The output budget applies to the longest input; the time limit applies
+      to the whole batch.
+    - The binary formats are negotiated as for `/rebase`. Request frames are
+      the four digit set fields of `BatchRebaseRequest` (null if not given)
+      followed by one frame per input; response frames are the two
+      `*_used` fields followed by three frames per input: the rebased text,
+      the error message and the error detail (null where they do not apply).
+    """
+    total_chars = sum(map(len, request.inputs))
+    setattr(http_request.state, INPUT_CHARS_STATE, total_chars)
+    source_digit_set_obj, source_digit_set_name = _resolve_digit_set(
+        request.source_digit_set, request.source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target_digit_set_obj, target_digit_set_name = _resolve_digit_set(
+        request.target_digit_set, request.target_digit_set_id, "Target", "Echo Input"
+    )
+
+    try:
+        rebaser = _get_rebaser(target_digit_set_obj, source_digit_set_obj)
+    except ValueError as exc:
+        error_response = ErrorResponse(
+            message="Rebase Error",
+            detail=f"A value error occurred during rebase: {exc}",
+        )
+        raise HTTPException(status_code=400, detail=error_response.model_dump()) from exc
+
+    if request.inputs:
+        _check_output_budget(rebaser, max(request.inputs, key=len))
+
+    token = CancellationToken(rebase_timeout())
+    wire_format = response_format(http_request.headers.get("accept"))
+    try:
+        if wire_format == FRAMES:
+            writer = FramesWriter()
+            writer.write_all((source_digit_set_name, target_digit_set_name))
+            await _run_batch(
+                functools.partial(_write_batch_frames, rebaser, request.inputs, token, writer),
+                total_chars,
+            )
+            return Response(bytes(writer.buffer), media_type=FRAMES_MEDIA_TYPE)
+        if wire_format == MSGPACK:
+            result_dicts = await _run_batch(
+                functools.partial(_batch_result_dicts, rebaser, request.inputs, token),
+                total_chars,
+            )
+            body = {
+                "results": result_dicts,
+                "source_digit_set_used": source_digit_set_name,
+                "target_digit_set_used": target_digit_set_name,
+            }
+            return Response(pack_msgpack(body), media_type=MSGPACK_MEDIA_TYPE)
+        results = await _run_batch(
+            functools.partial(_rebase_batch_items, rebaser, request.inputs, token), total_chars
+        )
+    except RebaseTimeoutError as exc:
+        error_response = ErrorResponse(message="Rebase Timeout", detail=str(exc))
+        raise HTTPException(status_code=503, detail=error_response.model_dump()) from exc
+
+    return BatchRebaseResponse(
+        results=results,
+        source_digit_set_used=source_digit_set_name,
+        target_digit_set_used=target_digit_set_name,
+    )
+
+
+# The number of lines of a stream converted together.
+STREAM_CHUNK_ITEMS = 256
+
+_NDJSON_MEDIA_TYPES = frozenset(
+    {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json"}
+)
+
+
+def _parse_stream_line(line: bytes | None, ndjson: bool) -> str | BatchRebaseItem | None:
+    """
+    Parses one line of a `/rebase/stream` body.
+
+    Returns:
+        The input string, a `BatchRebaseItem` with the error of an invalid
+        line, or `None` for a blank NDJSON line (which is skipped).
+    """
+    if line is None:
+        return BatchRebaseItem(
+            error=ErrorResponse(
+                message="Input Too Large", detail="The line exceeds the input size limit."
+            )
+        )
+    try:
+        text = line.decode("utf-8")
+        if not ndjson:
+            return text
+        if not text.strip():
+            return None
+        value = json.loads(text)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        return BatchRebaseItem(error=ErrorResponse(message="Invalid Line", detail=str(exc)))
+    if isinstance(value, dict):
+        value = value.get("input_text")
+    if not isinstance(value, str):
+        return BatchRebaseItem(
+            error=ErrorResponse(
+                message="Invalid Line",
+                detail="Expected a JSON string or an object with an 'input_text' string.",
+            )
+        )
+    return value
+
+
+async def _read_stream_entries(
+    pump: RequestBodyPump,
+    ndjson: bool,
+    queue: asyncio.Queue[list[str | BatchRebaseItem] | None],
+) -> None:
+    """Parses the body into chunks of entries as it arrives and queues them."""
+    splitter = LineSplitter(AdmissionConfig.from_environment().max_input_bytes)
+    entries: list[str | BatchRebaseItem] = []
+
+    async def add_lines(lines: list[bytes | None]) -> None:
+        nonlocal entries
+        for line in lines:
+            entry = _parse_stream_line(line, ndjson)
+            if entry is not None:
+                entries.append(entry)
+            if len(entries) >= STREAM_CHUNK_ITEMS:
+                await queue.put(entries)
+                entries = []
+
+    try:
+        async for chunk in pump.chunks():
+            await add_lines(splitter.feed(chunk))
+            if entries:
+                await queue.put(entries)
+                entries = []
+        await add_lines(splitter.close())
+        if entries:
+            await queue.put(entries)
+    finally:
+        await queue.put(None)
+
+
+async def _convert_stream_entries(
+    rebaser: DigitSetRebaser, entries: list[str | BatchRebaseItem]
+) -> str:
+    """
+    Converts a chunk of entries and returns their NDJSON result lines.
+
+    If the time limit expires, the inputs converted so far keep their results
+    and only the remaining ones are reported as timed out.
+    """
+    inputs = [entry for entry in entries if isinstance(entry, str)]
+    token = CancellationToken(rebase_timeout())
+    converted: list[BatchRebaseItem] = []
+    try:
+        if sum(map(len, inputs)) <= batch_inline_chars():
+            _append_batch_items(rebaser, inputs, token, converted)
+        else:
+            await get_router().run_in_thread(
+                functools.partial(_append_batch_items, rebaser, inputs, token, converted)
+            )
+    except RebaseTimeoutError as exc:
+        timeout_item = BatchRebaseItem(
+            error=ErrorResponse(message="Rebase Timeout", detail=str(exc))
+        )
+        converted.extend([timeout_item] * (len(inputs) - len(converted)))
+
+    results = iter(converted)
+    return "".join(
+        (next(results) if isinstance(entry, str) else entry).model_dump_json() + "\n"
+        for entry in entries
+    )
+
+
+@APP.post(
+    "/rebase/stream",
+    summary="Rebase a stream of lines between the same digit sets",
+    response_class=StreamingResponse,
+)
+async def rebase_stream(
+    http_request: Request,
+    source_digit_set: str | None = None,
+    source_digit_set_id: str | None = None,
+    target_digit_set: str | None = None,
+    target_digit_set_id: str | None = None,
+) -> StreamingResponse:
+    """
+    Rebases every line of the request body and streams the results back as
+    NDJSON, one `{"rebased_text": ..., "error": ...}` object per input line.
+
+    - The digit sets are given as query parameters, as in `/rebase`.
+    - With an NDJSON `Content-Type` (e.g., `application/x-ndjson`), every
+      non-blank line is a JSON string or an object with `input_text`;
+      otherwise every line is an input as-is.
+    - The body is parsed and converted in chunks while it is still being
+      received, so memory stays bounded however many lines are sent. Lines
+      longer than `BASEBENDER_MAX_INPUT_BYTES` are reported as errors.
+    - The time limit applies to every chunk of lines; the conversion stops
+      when the client disconnects.
+    """
+    source_digit_set_obj, _ = _resolve_digit_set(
+        source_digit_set, source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target_digit_set_obj, _ = _resolve_digit_set(
+        target_digit_set, target_digit_set_id, "Target", "Echo Input"
+    )
+    try:
+        rebaser = _get_rebaser(target_digit_set_obj, source_digit_set_obj)
+    except ValueError as exc:
+        error_response = ErrorResponse(
+            message="Rebase Error",
+            detail=f"A value error occurred during rebase: {exc}",
+        )
+        raise HTTPException(status_code=400, detail=error_response.model_dump()) from exc
+
+    media_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    ndjson = media_type in _NDJSON_MEDIA_TYPES
+    pump = RequestBodyPump(http_request.receive)
+
+    async def results() -> AsyncIterator[str]:
+        queue: asyncio.Queue[list[str | BatchRebaseItem] | None] = asyncio.Queue(maxsize=2)
+        reader = asyncio.create_task(_read_stream_entries(pump, ndjson, queue))
+        try:
+            while (entries := await queue.get()) is not None and not pump.disconnected:
+                yield await _convert_stream_entries(rebaser, entries)
+        finally:
+            reader.cancel()
+
+    return PumpedStreamingResponse(results(), pump, media_type="application/x-ndjson")
+
+
+# Characters converted per response chunk of `/rebase/raw`.
+RAW_CHUNK_CHARS = 64 * 1024
+
+# Spooled `/rebase/raw` bodies are kept in memory up to this size.
+RAW_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+
+_RAW_MEDIA_TYPES = frozenset({"", "text/plain", "application/octet-stream"})
+
+
+def _raw_body_too_large(limit: int, pairs: str) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=ErrorResponse(
+            message="Input Too Large",
+            detail=f"The request body exceeds the limit of {limit} bytes for {pairs}.",
+        ).model_dump(),
+    )
+
+
+async def _read_limited_body(http_request: Request) -> bytes:
+    """
+    Reads the whole request body, enforcing `BASEBENDER_MAX_INPUT_BYTES`.
+
+    Raises:
+        HTTPException: With status 413 if the body is too large.
+    """
+    limit = AdmissionConfig.from_environment().max_input_bytes
+    body = bytearray()
+    async for chunk in http_request.stream():
+        body += chunk
+        if limit and len(body) > limit:
+            raise _raw_body_too_large(limit, "digit-set pairs that cannot be streamed")
+    return bytes(body)
+
+
+async def _spool_body(
+    http_request: Request, rebaser: DigitSetRebaser, spool: tempfile.SpooledTemporaryFile[str]
+) -> int:
+    """
+    Decodes the request body into `spool`, enforcing `BASEBENDER_MAX_RAW_BYTES`.
+
+    The spool is written in the thread pool, as it rolls over to a file on
+    disk once it outgrows `RAW_SPOOL_MEMORY_BYTES`.
+
+    Returns:
+        The number of input digits, for `DigitSetRebaser.incremental_rebase`.
+
+    Raises:
+        HTTPException: With status 413 if the body is too large.
+    """
+    limit = AdmissionConfig.from_environment().max_raw_bytes
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    received = 0
+    digit_count = 0
+    async for chunk in http_request.stream():
+        received += len(chunk)
+        if limit and received > limit:
+            raise _raw_body_too_large(limit, "digit-set pairs that are spooled")
+        text = decoder.decode(chunk)
+        digit_count += rebaser.count_input_digits(text)
+        await run_in_threadpool(spool.write, text)
+    tail = decoder.decode(b"", final=True)
+    await run_in_threadpool(spool.write, tail)
+    await run_in_threadpool(spool.seek, 0)
+    return digit_count + rebaser.count_input_digits(tail)
+
+
+@APP.post(
+    "/rebase/raw",
+    summary="Rebase one large raw value between digit sets",
+    response_class=StreamingResponse,
+)
+async def rebase_raw(
+    http_request: Request,
+    source_digit_set: str | None = None,
+    source_digit_set_id: str | None = None,
+    target_digit_set: str | None = None,
+    target_digit_set_id: str | None = None,
+) -> StreamingResponse:
+    """
+    Rebases the raw request body (`text/plain` or `application/octet-stream`,
+    UTF-8) as one value and returns the result as a chunked `text/plain`
+    response. The digit sets are given as query parameters, as in `/rebase`.
+
+    - Streamable pairs (two block-mode digit sets, or positional bases that
+      are powers of a common root, such as hexadecimal and Base64) are
+      converted while the body arrives, whatever its size. Pairs that group
+      several input digits are spooled first to count the digits.
+      Spooled bodies are limited to `BASEBENDER_MAX_RAW_BYTES`.
+    - Other pairs are read completely (up to `BASEBENDER_MAX_INPUT_BYTES`)
+      and converted with the limits of `/rebase`.
+    """
+    media_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in _RAW_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=ErrorResponse(
+                message="Unsupported Media Type",
+                detail="Send the value as text/plain or application/octet-stream.",
+            ).model_dump(),
+        )
+    source_digit_set_obj, _ = _resolve_digit_set(
+        source_digit_set, source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target_digit_set_obj, _ = _resolve_digit_set(
+        target_digit_set, target_digit_set_id, "Target", "Echo Input"
+    )
+    try:
+        rebaser = _get_rebaser(target_digit_set_obj, source_digit_set_obj)
+    except ValueError as exc:
+        error_response = ErrorResponse(
+            message="Rebase Error",
+            detail=f"A value error occurred during rebase: {exc}",
+        )
+        raise HTTPException(status_code=400, detail=error_response.model_dump()) from exc
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    text_media_type = "text/plain; charset=utf-8"
+
+    if not rebaser.is_streamable():
+        input_text = decoder.decode(await _read_limited_body(http_request), final=True)
+        rebased_text = await _rebase_with_limits(
+            target_digit_set_obj, source_digit_set_obj, input_text, http_request
+        )
+        pieces = (
+            rebased_text[offset : offset + RAW_CHUNK_CHARS]
+            for offset in range(0, len(rebased_text), RAW_CHUNK_CHARS)
+        )
+        return StreamingResponse(pieces, media_type=text_media_type)
+
+    if rebaser.streaming_needs_digit_count():
+        # pylint: disable-next=consider-using-with
+        spool = tempfile.SpooledTemporaryFile(
+            max_size=RAW_SPOOL_MEMORY_BYTES, mode="w+", encoding="utf-8"
+        )
+        try:
+            digit_count = await _spool_body(http_request, rebaser, spool)
+        except BaseException:
+            spool.close()
+            raise
+
+        async def spooled_output() -> AsyncIterator[str]:
+            try:
+                incremental = rebaser.incremental_rebase(digit_count)
+                while text := await run_in_threadpool(spool.read, RAW_CHUNK_CHARS):
+                    yield incremental.feed(text)
+                yield incremental.finish()
+            finally:
+                spool.close()
+
+        return StreamingResponse(spooled_output(), media_type=text_media_type)
+
+    pump = RequestBodyPump(http_request.receive)
+
+    async def streamed_output() -> AsyncIterator[str]:
+        incremental = rebaser.incremental_rebase()
+        async for chunk in pump.chunks():
+            if pump.disconnected:
+                return
+            yield incremental.feed(decoder.decode(chunk))
+        yield incremental.feed(decoder.decode(b"", final=True)) + incremental.finish()
+
+    return PumpedStreamingResponse(streamed_output(), pump, media_type=text_media_type)
+
+
+def _configure_live(message: LiveSessionMessage) -> tuple[LiveRebase, str, str]:
+    """Builds the conversion of a `/rebase/live` "configure" message (see `LiveSession`)."""
+    source, source_name = _resolve_digit_set(
+        message.source_digit_set, message.source_digit_set_id, "Source", "Dynamically Derived"
+    )
+    target, target_name = _resolve_digit_set(
+        message.target_digit_set, message.target_digit_set_id, "Target", "Echo Input"
+    )
+    rebaser = _get_rebaser(target, source)
+    return (
+        LiveRebase(rebaser, _get_compiled(rebaser), COMPILED_ITEM_CHARS),
+        source_name,
+        target_name,
+    )
+
+
+def _live_session(websocket: WebSocket) -> LiveSession:
+    return LiveSession(
+        websocket, LiveRebase(_get_rebaser(None, None)), _configure_live, _check_output_budget
+    )
+
+
+@APP.websocket("/rebase/live")
+async def rebase_live(websocket: WebSocket) -> None:
+    """
+    Rebases an input that the client edits over time, e.g., while typing.
+
+    The client sends JSON messages (see `basebender.api.live`): a "configure"
+    message selects the digit sets, and "append", "delete" and "replace"
+    messages edit the input. After the edits, the server sends
+    `{"type": "result", "seq": ..., "rebased_text": ..., "input_length": ...,
+    "source_digit_set_used": ..., "target_digit_set_used": ...}` with the `seq`
+    of the latest edit it covers, or `{"type": "error", "seq": ..., "message":
+    ..., "detail": ...}`.
+
+    The session keeps the rebaser, the compiled function and the parsed value
+    of the input, so appending or deleting trailing characters only parses
+    the change. Edits that arrive during a conversion are applied together
+    afterwards; results that are already outdated are not sent. A client
+    that has more than `MAX_LIVE_PENDING_MESSAGES` messages queued is closed
+    with code 1008, and the number of open sessions is limited by
+    `BASEBENDER_MAX_SESSIONS` (see `AdmissionMiddleware`).
+    """
+    await _live_session(websocket).serve()
+
+
+class RouteStats(BaseModel):
+    """
+    Pydantic model for the counters of one conversion route.
+
+    Attributes:
+        queued: Conversions waiting for a worker.
+        running: Conversions in progress.
+        completed: Conversions finished (successfully or not).
+    """
+
+    queued: int
+    running: int
+    completed: int
+
+
+class RoutingStats(BaseModel):
+    """
+    Pydantic model for the state of the request router.
+
+    Attributes:
+        routes: The counters of the `inline`, `thread` and `process` routes.
+        thread_cost: The estimated cost from which conversions leave the event loop.
+        process_cost: The estimated cost from which conversions use the process pool.
+        thread_workers: The size of the thread pool.
+        process_workers: The size of the process pool.
+    """
+
+    routes: dict[str, RouteStats]
+    thread_cost: float
+    process_cost: float
+    thread_workers: int
+    process_workers: int
+
+
+@APP.get("/stats/routing", response_model=RoutingStats, summary="Show conversion queue depths")
+async def routing_stats() -> RoutingStats:
+    """
+    Returns the queue depth and counters of every conversion route together
+    with the routing thresholds.
+    """
+    router = get_router()
+    config = router.config
+    return RoutingStats(
+        routes={route: RouteStats(**counters) for route, counters in router.stats().items()},
+        thread_cost=config.thread_cost,
+        process_cost=config.process_cost,
+        thread_workers=config.thread_workers,
+        process_workers=config.process_workers,
+    )
+
+
+class CoalescingStatsResponse(BaseModel):
+    """
+    Pydantic model for the counters of request coalescing and the result cache.
+
+    Attributes:
+        in_flight: Conversions currently running.
+        coalesced: Requests that joined a conversion already in flight.
+        cache_hits: Requests answered from the result cache.
+        cache_misses: Requests not found in the result cache.
+        cache_entries: Results currently cached.
+        cache_bytes: The estimated memory used by cached results.
+        cache_evictions: Results dropped to stay within the memory budget.
+        cache_ttl: How long results are cached, in seconds (0 if disabled).
+        cache_budget: The memory budget of the result cache, in bytes.
+    """
+
+    in_flight: int
+    coalesced: int
+    cache_hits: int
+    cache_misses: int
+    cache_entries: int
+    cache_bytes: int
+    cache_evictions: int
+    cache_ttl: float
+    cache_budget: int
+
+
+@APP.get(
+    "/stats/coalescing",
+    response_model=CoalescingStatsResponse,
+    summary="Show request coalescing and result cache counters",
+)
+async def coalescing_stats() -> CoalescingStatsResponse:
+    """
+    Returns how many requests shared a conversion or were answered from the
+    result cache, and the size of the cache.
+    """
+    coalescer = get_coalescer()
+    return CoalescingStatsResponse(
+        **dataclasses.asdict(coalescer.stats()),
+        cache_ttl=coalescer.config.cache_ttl,
+        cache_budget=coalescer.config.cache_bytes,
+    )
+
+
+def _cache_counts() -> dict[str, tuple[int, int]]:
+    """Returns the hit and miss counts of the rebaser, compiled function and result caches."""
+    rebasers = _get_rebaser.cache_info()
+    results = get_coalescer().stats()
+    return {
+        "rebaser": (rebasers.hits, rebasers.misses),
+        "compiled": compiled_cache_stats(),
+        "result": (results.cache_hits, results.cache_misses),
+    }
+
+
+def _cache_ratios() -> list[tuple[tuple[str], float]]:
+    ratios = []
+    for cache, (hits, misses) in _cache_counts().items():
+        if hits + misses:
+            ratios.append(((cache,), hits / (hits + misses)))
+    return ratios
+
+
+def _conversions_in_progress() -> list[tuple[tuple[str, str], float]]:
+    samples: list[tuple[tuple[str, str], float]] = []
+    for route, counters in get_router().stats().items():
+        samples.append(((route, "queued"), counters["queued"]))
+        samples.append(((route, "running"), counters["running"]))
+    samples.append((("coalesced", "running"), get_coalescer().stats().in_flight))
+    return samples
+
+
+REGISTRY.register(
+    CounterFunction(
+        "basebender_cache_hits",
+        "Cache hits by cache.",
+        ("cache",),
+        lambda: [((cache,), hits) for cache, (hits, _) in _cache_counts().items()],
+    )
+)
+REGISTRY.register(
+    CounterFunction(
+        "basebender_cache_misses",
+        "Cache misses by cache.",
+        ("cache",),
+        lambda: [((cache,), misses) for cache, (_, misses) in _cache_counts().items()],
+    )
+)
+REGISTRY.register(
+    GaugeFunction(
+        "basebender_cache_hit_ratio",
+        "The share of cache lookups that were hits, by cache.",
+        ("cache",),
+        _cache_ratios,
+    )
+)
+REGISTRY.register(
+    GaugeFunction(
+        "basebender_conversions",
+        "Conversions queued or running, by route.",
+        ("route", "state"),
+        _conversions_in_progress,
+    )
+)
+
+
+@APP.get(
+    "/metrics",
+    summary="Export metrics in the Prometheus text format",
+    response_class=Response,
+    responses={200: {"content": {CONTENT_TYPE: {}}}},
+)
+async def metrics() -> Response:
+    """
+    Returns request counts, latency histograms by endpoint and input length,
+    conversion time split into parse and render, cache hit ratios, in-flight
+    counts and error counts by type, in the Prometheus text exposition format.
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+WARMUP = WarmupState()
+
+
+def _warm_pair(source: DigitSet, target: DigitSet) -> None:
+    """Builds the rebaser and compiled function of a pair and runs a sample conversion."""
+    rebaser = _get_rebaser(target, source)
+    compiled = _compile_now(rebaser)
+    sample = sample_input(source)
+    rebaser.rebase(sample)
+    if compiled is not None:
+        compiled.function(sample)
+
+
+def _load_and_serialize_catalog() -> Mapping[str, DigitSet]:
+    catalog = _load_digit_set_data()
+    if len(catalog) <= MAX_DIGIT_SET_PAGE:
+        _DIGIT_SET_LIST_CACHE.get(catalog)
+    return catalog
+
+
+def _warm_up() -> None:
+    """
+    Loads the catalog and its `/digitsets` body (up to `MAX_DIGIT_SET_PAGE`
+    digit sets), warms up the pairs of `BASEBENDER_WARMUP_PAIRS` and starts
+    the conversion pools.
+
+    The suggest index, which decodes every digit set, is built by the first
+    `/suggest` request instead.
+    """
+    warm_up(
+        WARMUP, _load_and_serialize_catalog, _warm_pair, warmup_pairs(), finish=get_router().start
+    )
+
+
+def preload_api() -> None:
+    """
+    Loads the catalog and warms up the digit-set pairs without starting any
+    thread or pool, so forked server workers inherit them (see
+    `basebender.api.server`).
+    """
+    warm_up(WarmupState(), _load_and_serialize_catalog, _warm_pair, warmup_pairs())
+
+
+class ReadinessResponse(BaseModel):
+    """
+    Pydantic model for the readiness of the API.
+
+    Attributes:
+        ready: Whether the startup warmup has finished.
+        warmed_pairs: The number of digit-set pairs warmed up so far.
+        warmup_seconds: How long the warmup took, once finished.
+        error: The error that stopped the warmup, if any.
+    """
+
+    ready: bool
+    warmed_pairs: int
+    warmup_seconds: float | None = None
+    error: str | None = None
+
+
+@APP.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    summary="Report whether the API has warmed up",
+    responses={503: {"model": ReadinessResponse, "description": "The warmup is not done."}},
+)
+async def ready() -> JSONResponse:
+    """
+    Returns 200 once the startup warmup has loaded the digit-set catalog,
+    built the rebasers of the configured digit-set pairs and started the
+    conversion pools, and 503 until then (or if the warmup failed), so load
+    balancers only route traffic to warm instances.
+    """
+    readiness = ReadinessResponse(
+        ready=WARMUP.ready,
+        warmed_pairs=WARMUP.warmed_pairs,
+        warmup_seconds=WARMUP.duration,
+        error=WARMUP.error,
+    )
+    return JSONResponse(readiness.model_dump(), status_code=200 if WARMUP.ready else 503)
+
+
+def start_api() -> None:
+    """
+    Starts the FastAPI server (the `basebender-api` command); see
+    `basebender.api.server` for its options.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from basebender.api.server import main
+
+    main()
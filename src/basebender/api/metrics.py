@@ -0,0 +1,361 @@
+"""
+This module collects the API's metrics and renders them in the Prometheus
+text exposition format, without third-party dependencies.
+
+Counters and histograms are sharded per thread: every thread updates its own
+plain dictionaries without taking a lock, and shards are only merged when
+`/metrics` is scraped. This keeps recording cheap enough to leave on in
+production. Values that already live elsewhere (cache statistics, in-flight
+counts) are read by gauge callbacks at scrape time.
+"""
+
+import bisect
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from basebender.rebaser.engines import add_phase_observer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+type Labels = tuple[str, ...]
+
+# Request latency buckets, in seconds.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)  # fmt: skip
+
+# Conversion phase buckets, in seconds.
+PHASE_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0,
+)  # fmt: skip
+
+# Upper bounds of the input-length classes of request latencies, in characters.
+INPUT_SIZE_CLASSES = (64, 1024, 16384, 262144)
+
+
+def input_size_class(length: int | None) -> str:
+    """
+    Returns the input-length class label of a request.
+
+    Examples:
+        >>> input_size_class(10), input_size_class(5000), input_size_class(10**6)
+        ('<=64', '<=16384', '>262144')
+        >>> input_size_class(None)
+        'none'
+    """
+    if length is None:
+        return "none"
+    index = bisect.bisect_left(INPUT_SIZE_CLASSES, length)
+    if index == len(INPUT_SIZE_CLASSES):
+        return f">{INPUT_SIZE_CLASSES[-1]}"
+    return f"<={INPUT_SIZE_CLASSES[index]}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Shards[T]:
+    """Per-thread instances of a value, created on first use by each thread."""
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[T] = []
+
+    def local(self) -> T:
+        try:
+            return self._local.shard  # type: ignore[no-any-return]
+        except AttributeError:
+            shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def all(self) -> list[T]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Metric:
+    """Base class of the metrics of a `MetricsRegistry`."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        """Yields `(suffix, extra label names, label values, value)` samples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Renders the metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, extra_names, values, value in self.samples():
+            labels = _format_labels(self.label_names + extra_names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, label_names)
+        self._shards: _Shards[dict[Labels, float]] = _Shards(dict)
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Adds `amount` to the count of the given label values."""
+        shard = self._shards.local()
+        shard[label_values] = shard.get(label_values, 0.0) + amount
+
+    def values(self) -> dict[Labels, float]:
+        """Returns the merged counts by label values."""
+        merged: dict[Labels, float] = {}
+        for shard in self._shards.all():
+            for labels, value in list(shard.items()):
+                merged[labels] = merged.get(labels, 0.0) + value
+        return merged
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        for labels, value in sorted(self.values().items()):
+            yield "_total", (), labels, value
+
+
+class Histogram(Metric):
+    """Counts observations in fixed buckets per label combination."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: a count per bucket, one for +Inf, then the sum.
+        self._shards: _Shards[dict[Labels, list[float]]] = _Shards(dict)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Records one observation for the given label values."""
+        shard = self._shards.local()
+        counts = shard.get(label_values)
+        if counts is None:
+            counts = shard[label_values] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def values(self) -> dict[Labels, list[float]]:
+        """Returns the merged (non-cumulative) bucket counts and sums by label values."""
+        merged: dict[Labels, list[float]] = {}
+        for shard in self._shards.all():
+            for labels, counts in list(shard.items()):
+                total = merged.setdefault(labels, [0.0] * len(counts))
+                for index, count in enumerate(list(counts)):
+                    total[index] += count
+        return merged
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts in sorted(self.values().items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield "_bucket", ("le",), (*labels, bound), cumulative
+            yield "_sum", (), labels, counts[-1]
+            yield "_count", (), labels, cumulative
+
+
+class GaugeFunction(Metric):
+    """A gauge whose samples are read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        callback: Callable[[], Iterable[tuple[Labels, float]]],
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._callback = callback
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        for labels, value in self._callback():
+            yield "", (), labels, value
+
+
+class CounterFunction(GaugeFunction):
+    """A counter whose samples are read from a callback at scrape time."""
+
+    kind = "counter"
+
+    def samples(self) -> Iterable[tuple[str, Labels, Labels, float]]:
+        for _, extra_names, labels, value in super().samples():
+            yield "_total", extra_names, labels, value
+
+
+class MetricsRegistry:
+    """A collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        """
+        Adds a metric, replacing any metric with the same name.
+
+        Returns:
+            The metric.
+        """
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text format."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.register(
+    Counter("basebender_requests", "HTTP requests by endpoint and status.", ("endpoint", "status"))
+)
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "basebender_request_duration_seconds",
+        "HTTP request latency by endpoint and input length class (characters).",
+        ("endpoint", "input_chars"),
+    )
+)
+ERRORS = REGISTRY.register(
+    Counter(
+        "basebender_errors", "Error responses by endpoint and error type.", ("endpoint", "type")
+    )
+)
+CONVERSION_SECONDS = REGISTRY.register(
+    Histogram(
+        "basebender_conversion_phase_seconds",
+        "Time spent converting, by engine and phase (parse or render; "
+        "compiled conversions are a single 'convert' phase).",
+        ("engine", "phase"),
+        buckets=PHASE_BUCKETS,
+    )
+)
+
+
+# Requests in progress by endpoint; only updated on the event loop thread.
+_IN_FLIGHT: dict[str, int] = {}
+
+REGISTRY.register(
+    GaugeFunction(
+        "basebender_requests_in_flight",
+        "HTTP requests in progress by endpoint.",
+        ("endpoint",),
+        lambda: (((endpoint,), count) for endpoint, count in sorted(_IN_FLIGHT.items())),
+    )
+)
+
+
+def _observe_phase(engine_name: str, phase: str, seconds: float) -> None:
+    CONVERSION_SECONDS.observe(seconds, engine_name, phase)
+
+
+add_phase_observer(_observe_phase)
+
+# Set by endpoints on `request.state` to classify the request latency.
+INPUT_CHARS_STATE = "input_chars"
+
+# The scope key holding the endpoint label of a request.
+ENDPOINT_SCOPE_KEY = "basebender.endpoint"
+
+
+def record_error(scope: Scope, error_type: str) -> None:
+    """
+    Counts an error response of the request of `scope`.
+
+    Args:
+        scope: The ASGI scope of the request.
+        error_type: A short description of the error, e.g., "Rebase Timeout".
+    """
+    ERRORS.inc(scope.get(ENDPOINT_SCOPE_KEY, "other"), error_type)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latencies and in-flight counts.
+
+    Endpoints are labelled by path if it is one of `paths`, otherwise
+    "other", so unknown URLs cannot inflate the number of series. Endpoints
+    report their input length by setting `request.state.input_chars`.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Callable[[], Iterable[str]]) -> None:
+        self.app = app
+        self._paths = paths
+        self._known_paths: frozenset[str] | None = None
+
+    def _endpoint(self, path: str) -> str:
+        if self._known_paths is None:
+            self._known_paths = frozenset(self._paths())
+        return path if path in self._known_paths else "other"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope[ENDPOINT_SCOPE_KEY] = self._endpoint(scope["path"])
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        _IN_FLIGHT[endpoint] = _IN_FLIGHT.get(endpoint, 0) + 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            record_error(scope, "Unhandled Exception")
+            raise
+        finally:
+            _IN_FLIGHT[endpoint] -= 1
+            state: dict[str, Any] = scope.get("state") or {}
+            REQUESTS.inc(endpoint, str(status))
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                endpoint,
+                input_size_class(state.get(INPUT_CHARS_STATE)),
+            )
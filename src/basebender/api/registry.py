@@ -0,0 +1,245 @@
+"""
+This module keeps custom digit sets registered by API clients.
+
+A registered digit set is identified by a hash of its (deduplicated) digits,
+so registering the same alphabet again returns the same ID and refreshes its
+expiry instead of storing a copy. The registry is bounded: entries expire
+after a TTL and the least recently used entry is evicted when it is full.
+
+Registrations are also written to a directory shared by the server workers
+(`registered/` in the cache directory, see `catalog_cache.cache_dir`), one
+file per content hash whose modification time marks the last registration.
+A worker that does not know an ID looks it up there, so an ID registered
+with one worker can be used with any other. Without a cache directory the
+registry is kept per process.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from basebender.api.settings import env_float, env_int
+from basebender.rebaser.catalog_cache import cache_dir, write_atomic
+from basebender.rebaser.models import DigitSet
+
+logger = logging.getLogger(__name__)
+
+REGISTERED_SOURCE = "registered"
+DEFAULT_REGISTRY_SIZE = 1024
+DEFAULT_REGISTRY_TTL = 3600.0
+
+_HASH = re.compile(r"[0-9a-f]{32}")
+
+
+@dataclass(frozen=True)
+class Registration:
+    """
+    A registered digit set.
+
+    Attributes:
+        digit_set_id: The content-hash ID of the digit set.
+        digit_set: The digit set, with deduplicated digits.
+        expires_at: The `time.monotonic()` value after which it is dropped.
+        created: Whether this registration added a new entry.
+    """
+
+    digit_set_id: str
+    digit_set: DigitSet
+    expires_at: float
+    created: bool
+
+
+def registered_digit_set_id(digits: str) -> str:
+    """
+    Returns the ID under which an alphabet is registered.
+
+    Args:
+        digits: The deduplicated digits.
+
+    Returns:
+        `registered:` followed by 32 hex digits of the SHA-256 hash of the digits.
+    """
+    return f"{REGISTERED_SOURCE}:{hashlib.sha256(digits.encode('utf-8')).hexdigest()[:32]}"
+
+
+def shared_registry_dir() -> Path | None:
+    """Returns the directory shared by the workers, or `None` without a cache directory."""
+    directory = cache_dir()
+    return None if directory is None else directory / "registered"
+
+
+class DigitSetRegistry:
+    """
+    A bounded, expiring store of client-registered digit sets.
+
+    With a `directory`, registrations are shared with the other registries
+    (i.e., server workers) that use it; failures to read or write it are
+    logged and otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_REGISTRY_SIZE,
+        ttl: float = DEFAULT_REGISTRY_TTL,
+        directory: Path | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._directory = directory
+        self._entries: OrderedDict[str, tuple[DigitSet, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        self._purge_expired()
+        return len(self._entries)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _remember(self, digit_set_id: str, digit_set: DigitSet, expires_at: float) -> None:
+        self._entries[digit_set_id] = (digit_set, expires_at)
+        self._entries.move_to_end(digit_set_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, digit_set_id: str) -> Path | None:
+        source, _, digest = digit_set_id.partition(":")
+        if self._directory is None or source != REGISTERED_SOURCE or not _HASH.fullmatch(digest):
+            return None
+        return self._directory / f"{digest}.json"
+
+    def _load(self, digit_set_id: str) -> tuple[DigitSet, float] | None:
+        """Reads a registration of another worker, or returns `None`."""
+        path = self._path(digit_set_id)
+        if path is None:
+            return None
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age >= self._ttl:
+                return None
+            data = json.loads(path.read_bytes())
+            digits, name = data["digits"], data["name"]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            if not isinstance(exc, FileNotFoundError):
+                logger.debug("Could not read the registered digit set %s: %s", path, exc)
+            return None
+        if not isinstance(digits, str) or registered_digit_set_id(digits) != digit_set_id:
+            return None
+        digit_set = DigitSet(name=str(name), digits=digits, source=REGISTERED_SOURCE)
+        return digit_set, time.monotonic() + self._ttl - age
+
+    def _store(self, digit_set_id: str, digit_set: DigitSet, created: bool) -> None:
+        """Writes a new registration, or refreshes the expiry of a stored one."""
+        path = self._path(digit_set_id)
+        if path is None:
+            return
+        try:
+            if not created:
+                try:
+                    os.utime(path)
+                    return
+                except FileNotFoundError:
+                    pass
+            content = json.dumps({"name": digit_set.name, "digits": digit_set.digits})
+            write_atomic(path, content.encode("utf-8"))
+            if created:
+                self._prune_directory(path.parent)
+        except OSError as exc:
+            logger.debug("Could not store the registered digit set %s: %s", path, exc)
+
+    def _prune_directory(self, directory: Path) -> None:
+        """Removes expired files and the least recently registered ones beyond the limit."""
+        now = time.time()
+        files = []
+        for path in directory.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            files.append((mtime, path))
+        files.sort(reverse=True)
+        for index, (mtime, path) in enumerate(files):
+            if index >= self._max_entries or now - mtime >= self._ttl:
+                path.unlink(missing_ok=True)
+
+    def register(self, digits: str, name: str | None = None) -> Registration:
+        """
+        Registers an alphabet, or refreshes the expiry of an identical one.
+
+        Args:
+            digits: The digits; duplicates are removed.
+            name: An optional display name. The name of an existing
+                  registration is kept.
+
+        Returns:
+            The `Registration`.
+
+        Raises:
+            ValueError: If the alphabet has fewer than two distinct digits.
+        """
+        digits = DigitSet.deduplicate_digits(digits)
+        if len(digits) < 2:
+            raise ValueError("A digit set must contain at least two distinct digits.")
+        digit_set_id = registered_digit_set_id(digits)
+        expires_at = time.monotonic() + self._ttl
+
+        self._purge_expired()
+        existing = self._entries.get(digit_set_id) or self._load(digit_set_id)
+        created = existing is None
+        if existing is None:
+            digit_set = DigitSet(
+                name=name or "Registered", digits=digits, source=REGISTERED_SOURCE
+            )
+        else:
+            digit_set = existing[0]
+        self._remember(digit_set_id, digit_set, expires_at)
+        self._store(digit_set_id, digit_set, created)
+        return Registration(digit_set_id, digit_set, expires_at, created=created)
+
+    def get(self, digit_set_id: str) -> DigitSet | None:
+        """
+        Looks up a registered digit set and marks it as recently used.
+
+        IDs that are unknown here (or expired, as another worker may have
+        registered them again) are looked up in the shared directory.
+
+        Args:
+            digit_set_id: The ID returned by `register`.
+
+        Returns:
+            The digit set, or `None` if it is unknown or expired.
+        """
+        entry = self._entries.get(digit_set_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(digit_set_id)
+            return entry[0]
+        if entry is not None:
+            del self._entries[digit_set_id]
+        entry = self._load(digit_set_id)
+        if entry is None:
+            return None
+        self._remember(digit_set_id, *entry)
+        return entry[0]
+
+
+@functools.cache
+def get_registry() -> DigitSetRegistry:
+    """
+    Returns the API's registry, sized by `BASEBENDER_REGISTRY_SIZE` entries,
+    expiring after `BASEBENDER_REGISTRY_TTL` seconds and shared with the
+    other workers through `shared_registry_dir()`.
+    """
+    return DigitSetRegistry(
+        max_entries=max(1, env_int("BASEBENDER_REGISTRY_SIZE", DEFAULT_REGISTRY_SIZE)),
+        ttl=env_float("BASEBENDER_REGISTRY_TTL", DEFAULT_REGISTRY_TTL),
+        directory=shared_registry_dir(),
+    )
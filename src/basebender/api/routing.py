@@ -0,0 +1,388 @@
+"""
+This module routes conversions to where they hurt the event loop least.
+
+The cost of every request is estimated by the engines' cost model (from the
+input length and the base pair). Cheap requests run inline on the event
+loop, medium ones in a bounded thread pool and expensive ones in a warm
+process pool whose workers have the digit-set catalog preloaded, so large
+conversions cannot starve the latency of small ones.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Self
+
+from basebender.api.settings import env_float, env_int
+from basebender.rebaser.cancellation import CancellationToken
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.digit_sets import get_predefined_digit_sets
+from basebender.rebaser.engines import DEFAULT_SLICE_BUDGET
+from basebender.rebaser.models import DigitSet
+
+ROUTE_INLINE = "inline"
+ROUTE_THREAD = "thread"
+ROUTE_PROCESS = "process"
+ROUTES = (ROUTE_INLINE, ROUTE_THREAD, ROUTE_PROCESS)
+
+# Estimated engine cost units; roughly 10,000 units take a millisecond.
+DEFAULT_THREAD_COST = 20_000.0
+DEFAULT_PROCESS_COST = 2_000_000.0
+DEFAULT_THREAD_WORKERS = 4
+DEFAULT_PROCESS_WORKERS = 2
+
+# How often process pool workers check that their server process is alive, in seconds.
+PARENT_POLL_INTERVAL = 1.0
+
+# Process pool conversions that can be cancelled at the same time; further
+# conversions run in the thread pool, where the token reaches them directly.
+PROCESS_CANCEL_SLOTS = 256
+
+# How often the server checks the token of a process pool conversion, in seconds.
+CANCEL_POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class RoutingConfig:
+    """
+    Thresholds and pool sizes of a `RequestRouter`.
+
+    Attributes:
+        thread_cost: Requests with at least this estimated cost leave the event loop.
+        process_cost: Requests with at least this estimated cost go to the process pool.
+        thread_workers: The size of the thread pool.
+        process_workers: The size of the process pool; 0 sends expensive
+                         requests to the thread pool instead.
+    """
+
+    thread_cost: float = DEFAULT_THREAD_COST
+    process_cost: float = DEFAULT_PROCESS_COST
+    thread_workers: int = DEFAULT_THREAD_WORKERS
+    process_workers: int = DEFAULT_PROCESS_WORKERS
+
+    @classmethod
+    def from_environment(cls) -> Self:
+        """
+        Reads the configuration from `BASEBENDER_THREAD_COST`,
+        `BASEBENDER_PROCESS_COST`, `BASEBENDER_THREAD_WORKERS` and
+        `BASEBENDER_PROCESS_WORKERS`.
+        """
+        return cls(
+            thread_cost=env_float("BASEBENDER_THREAD_COST", DEFAULT_THREAD_COST),
+            process_cost=env_float("BASEBENDER_PROCESS_COST", DEFAULT_PROCESS_COST),
+            thread_workers=max(1, env_int("BASEBENDER_THREAD_WORKERS", DEFAULT_THREAD_WORKERS)),
+            process_workers=env_int("BASEBENDER_PROCESS_WORKERS", DEFAULT_PROCESS_WORKERS),
+        )
+
+
+def _preload_catalog(cancel_flags: Sequence[int]) -> None:
+    """
+    Process pool initializer: loads the digit-set catalog once per worker
+    and keeps the shared cancellation flags (see `_CancelFlags`).
+
+    Workers forked from a server process inherit its signal handlers, which
+    would only ask that server to stop; they are reset so SIGTERM ends the
+    worker and SIGINT (Ctrl+C) is left to the server. Workers also exit when
+    the server process dies.
+    """
+    _FlaggedToken.flags = cancel_flags
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    threading.Thread(
+        target=_exit_with_parent, args=(os.getppid(),), name="basebender-parent-watch", daemon=True
+    ).start()
+    get_predefined_digit_sets()
+
+
+def _started() -> None:
+    """Does nothing; submitted to spawn pool workers, which run `_preload_catalog` first."""
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    """Ends a pool worker whose server process has died without stopping it."""
+    while os.getppid() == parent_pid:
+        time.sleep(PARENT_POLL_INTERVAL)
+    os._exit(1)
+
+
+class _FlaggedToken(CancellationToken):
+    """The token of a process pool conversion, also cancelled by its shared flag."""
+
+    # The cancellation flags of the worker, set by `_preload_catalog`.
+    flags: Sequence[int] = ()
+
+    def __init__(self, timeout: float | None, slot: int) -> None:
+        super().__init__(timeout)
+        self._slot = slot
+
+    def check(self) -> None:
+        if self.flags[self._slot]:
+            self.cancel()
+        super().check()
+
+
+class _CancelFlags:
+    """
+    Cancellation flags in shared memory, one per process pool conversion.
+
+    A slot is taken for every submitted conversion and given back once the
+    worker is done with it, so a flag never reaches a later conversion.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.flags = multiprocessing.RawArray("b", size)
+        self._lock = threading.Lock()
+        self._free = list(range(size))
+
+    def acquire(self) -> int | None:
+        """Takes a free slot, or returns `None` if all are in use."""
+        with self._lock:
+            return self._free.pop() if self._free else None
+
+    def release(self, slot: int, _future: object = None) -> None:
+        """Clears the flag of a slot and gives it back."""
+        self.flags[slot] = 0
+        with self._lock:
+            self._free.append(slot)
+
+
+def _rebase_in_process(
+    out_digit_set: DigitSet | None,
+    in_digit_set: DigitSet | None,
+    input_text: str,
+    timeout: float | None,
+    slot: int,
+) -> str:
+    """Runs a conversion in a process pool worker; see `_FlaggedToken`."""
+    rebaser = DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=in_digit_set)
+    return rebaser.rebase(input_text, token=_FlaggedToken(timeout, slot))
+
+
+class RequestRouter:
+    """
+    Runs conversions inline, in a thread pool or in a process pool by cost.
+
+    The pools are created on first use and counters of queued, running and
+    completed conversions are kept per route (see `stats`).
+    """
+
+    def __init__(self, config: RoutingConfig) -> None:
+        self._config = config
+        self._lock = threading.Lock()
+        self._thread_pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._cancel_flags = _CancelFlags(0)
+        self._queued = dict.fromkeys(ROUTES, 0)
+        self._running = dict.fromkeys(ROUTES, 0)
+        self._completed = dict.fromkeys(ROUTES, 0)
+
+    @property
+    def config(self) -> RoutingConfig:
+        """The thresholds and pool sizes of this router."""
+        return self._config
+
+    def choose_route(self, rebaser: DigitSetRebaser, input_text: str) -> str:
+        """
+        Chooses where to run the conversion of `input_text`.
+
+        Args:
+            rebaser: The rebaser that will perform the conversion.
+            input_text: The text to be rebased.
+
+        Returns:
+            One of `ROUTE_INLINE`, `ROUTE_THREAD` or `ROUTE_PROCESS`.
+        """
+        plan = rebaser.plan(input_text)
+        cost = 0.0 if plan is None else plan.costs[plan.engine]
+        if cost < self._config.thread_cost:
+            return ROUTE_INLINE
+        if cost < self._config.process_cost or not self._config.process_workers:
+            return ROUTE_THREAD
+        return ROUTE_PROCESS
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self._config.thread_workers,
+                    thread_name_prefix="basebender-rebase",
+                )
+            return self._thread_pool
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # Created with the pool, i.e., in the server worker that uses it.
+                self._cancel_flags = _CancelFlags(PROCESS_CANCEL_SLOTS)
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self._config.process_workers,
+                    initializer=_preload_catalog,
+                    initargs=(self._cancel_flags.flags,),
+                )
+            return self._process_pool
+
+    def _update(self, counters: dict[str, int], route: str, delta: int) -> None:
+        with self._lock:
+            counters[route] += delta
+
+    def _run_counted[T](self, function: Callable[[], T]) -> T:
+        self._update(self._queued, ROUTE_THREAD, -1)
+        self._update(self._running, ROUTE_THREAD, 1)
+        try:
+            return function()
+        finally:
+            self._update(self._running, ROUTE_THREAD, -1)
+
+    async def run_in_thread[T](self, function: Callable[[], T]) -> T:
+        """
+        Runs a blocking function in the thread pool, counted as the thread route.
+
+        Args:
+            function: The function to call without arguments.
+
+        Returns:
+            The return value of `function`.
+        """
+        self._update(self._queued, ROUTE_THREAD, 1)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_thread_pool(), self._run_counted, function
+            )
+        finally:
+            self._update(self._completed, ROUTE_THREAD, 1)
+
+    async def rebase(
+        self,
+        rebaser: DigitSetRebaser,
+        input_text: str,
+        token: CancellationToken,
+        slice_budget: float = DEFAULT_SLICE_BUDGET,
+    ) -> str:
+        """
+        Rebases `input_text` on the route chosen by `choose_route`.
+
+        Inline conversions run cooperatively (see `DigitSetRebaser.arebase`).
+        Process pool workers receive the remaining time of `token` as their
+        own deadline and a shared flag that is set when the token is
+        cancelled or the call is cancelled, e.g., because the client
+        disconnected.
+
+        Args:
+            rebaser: The rebaser performing the conversion.
+            input_text: The text to be rebased.
+            token: The deadline and cancellation token of the request.
+            slice_budget: The slice budget of inline conversions.
+
+        Returns:
+            The rebased text.
+
+        Raises:
+            ValueError: If the conversion fails.
+            RebaseTimeoutError: If the token expires or is cancelled.
+        """
+        route = self.choose_route(rebaser, input_text)
+        if route == ROUTE_PROCESS:
+            process_pool = self._get_process_pool()
+            cancel_flags = self._cancel_flags
+            slot = cancel_flags.acquire()
+            if slot is None:
+                route = ROUTE_THREAD
+        if route == ROUTE_THREAD:
+            return await self.run_in_thread(
+                functools.partial(rebaser.rebase, input_text, token=token)
+            )
+        self._update(self._running, route, 1)
+        try:
+            if route == ROUTE_INLINE:
+                return await rebaser.arebase(input_text, slice_budget=slice_budget, token=token)
+            assert slot is not None
+            future = process_pool.submit(
+                _rebase_in_process,
+                rebaser.initial_output_digit_set,
+                rebaser.initial_input_digit_set,
+                input_text,
+                token.remaining(),
+                slot,
+            )
+            future.add_done_callback(functools.partial(cancel_flags.release, slot))
+            return await _await_cancellable(future, token, cancel_flags, slot)
+        finally:
+            self._update(self._running, route, -1)
+            self._update(self._completed, route, 1)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the queue depth, running and completed count of every route.
+
+        Process pool conversions count as running from submission until they
+        finish, since their queue is not visible to the parent process.
+        """
+        with self._lock:
+            return {
+                route: {
+                    "queued": self._queued[route],
+                    "running": self._running[route],
+                    "completed": self._completed[route],
+                }
+                for route in ROUTES
+            }
+
+    def start(self) -> None:
+        """
+        Starts the pools ahead of the first request that needs them.
+
+        Blocks until every process pool worker has started and loaded the
+        digit-set catalog.
+        """
+        self._get_thread_pool()
+        if self._config.process_workers:
+            process_pool = self._get_process_pool()
+            futures = [process_pool.submit(_started) for _ in range(self._config.process_workers)]
+            for future in futures:
+                future.result()
+
+    def shutdown(self) -> None:
+        """Shuts down the pools; they are recreated on the next use."""
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=False, cancel_futures=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _await_cancellable(
+    future: Future[str], token: CancellationToken, cancel_flags: _CancelFlags, slot: int
+) -> str:
+    """
+    Waits for a process pool conversion, setting its cancellation flag when
+    `token` expires or is cancelled, or the caller is cancelled.
+
+    Raises:
+        RebaseTimeoutError: If the token expires or is cancelled.
+    """
+    result = asyncio.wrap_future(future)
+    try:
+        while True:
+            done, _ = await asyncio.wait((result,), timeout=CANCEL_POLL_INTERVAL)
+            if done:
+                return result.result()
+            token.check()
+    finally:
+        if not future.done():
+            cancel_flags.flags[slot] = 1
+            result.cancel()
+
+
+@functools.cache
+def get_router() -> RequestRouter:
+    """Returns the API's request router, configured from the environment."""
+    return RequestRouter(RoutingConfig.from_environment())
@@ -0,0 +1,307 @@
+"""
+This module runs the API server.
+
+The production mode preloads the application, the digit-set catalog and the
+rebasers of the warmup pairs in a supervisor process, binds the listening
+socket once and forks the workers, so they share that memory copy-on-write
+and accept connections from the same socket. Crashed workers are restarted.
+Registered digit sets are shared by the workers through the cache directory
+(see `registry.shared_registry_dir`); the result cache and the metrics are
+kept per worker.
+uvloop and httptools are used when they are installed. The development mode
+runs a single auto-reloading worker.
+"""
+
+import argparse
+import importlib.util
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass, replace
+from typing import Self
+
+import uvicorn
+
+from basebender.api.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+APP_IMPORT_PATH = "basebender.api.main:APP"
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8000
+DEFAULT_BACKLOG = 2048
+DEFAULT_KEEP_ALIVE = 5
+
+# Workers that exit sooner than this after starting are restarted with a delay.
+MIN_WORKER_LIFETIME = 1.0
+
+
+def default_workers() -> int:
+    """Returns the default number of workers: one per usable CPU."""
+    return os.process_cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """
+    Settings of the API server.
+
+    Attributes:
+        host: The address to bind to.
+        port: The port to bind to.
+        workers: The number of worker processes.
+        backlog: The maximum number of pending connections.
+        keep_alive: Seconds an idle keep-alive connection is kept open.
+        reload: Whether to run a single worker that restarts on code changes
+                (development only).
+    """
+
+    host: str = DEFAULT_HOST
+    port: int = DEFAULT_PORT
+    workers: int = 1
+    backlog: int = DEFAULT_BACKLOG
+    keep_alive: int = DEFAULT_KEEP_ALIVE
+    reload: bool = False
+
+    @classmethod
+    def from_environment(cls) -> Self:
+        """
+        Reads the configuration from `BASEBENDER_HOST`, `BASEBENDER_PORT`,
+        `BASEBENDER_WORKERS` (default: the CPU count), `BASEBENDER_BACKLOG`,
+        `BASEBENDER_KEEP_ALIVE` and `BASEBENDER_RELOAD` ("1" enables it).
+        """
+        return cls(
+            host=os.environ.get("BASEBENDER_HOST", DEFAULT_HOST),
+            port=env_int("BASEBENDER_PORT", DEFAULT_PORT),
+            workers=max(1, env_int("BASEBENDER_WORKERS", default_workers())),
+            backlog=max(1, env_int("BASEBENDER_BACKLOG", DEFAULT_BACKLOG)),
+            keep_alive=env_int("BASEBENDER_KEEP_ALIVE", DEFAULT_KEEP_ALIVE),
+            reload=os.environ.get("BASEBENDER_RELOAD", "") == "1",
+        )
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the server options to an argument parser.
+
+    Options that are not given fall back to the environment (see
+    `ServerConfig.from_environment`).
+    """
+    group = parser.add_argument_group("API server options")
+    group.add_argument("--host", help=f"Address to bind to (default: {DEFAULT_HOST}).")
+    group.add_argument("--port", type=int, help=f"Port to bind to (default: {DEFAULT_PORT}).")
+    group.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: the CPU count)."
+    )
+    group.add_argument(
+        "--backlog",
+        type=int,
+        help=f"Maximum number of pending connections (default: {DEFAULT_BACKLOG}).",
+    )
+    group.add_argument(
+        "--keep-alive",
+        type=int,
+        help=f"Seconds to keep idle connections open (default: {DEFAULT_KEEP_ALIVE}).",
+    )
+    group.add_argument(
+        "--reload",
+        action="store_true",
+        default=None,
+        help="Development mode: a single worker that restarts when the code changes.",
+    )
+
+
+def config_from_args(args: argparse.Namespace) -> ServerConfig:
+    """
+    Builds the server configuration from parsed `add_server_arguments` options.
+
+    Args:
+        args: The parsed arguments.
+
+    Returns:
+        The environment configuration, overridden by the given options.
+
+    Raises:
+        ValueError: If the number of workers or the backlog is not positive.
+    """
+    overrides = {
+        field: getattr(args, field)
+        for field in ("host", "port", "workers", "backlog", "keep_alive", "reload")
+        if getattr(args, field, None) is not None
+    }
+    config = replace(ServerConfig.from_environment(), **overrides)
+    if config.workers < 1 or config.backlog < 1:
+        raise ValueError("The number of workers and the backlog must be positive.")
+    return config
+
+
+def event_loop_implementation() -> str:
+    """Returns "uvloop" if it is installed, otherwise "asyncio"."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def http_implementation() -> str:
+    """Returns "httptools" if it is installed, otherwise "h11"."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def serve(config: ServerConfig) -> None:
+    """
+    Runs the API server until it is stopped.
+
+    Args:
+        config: The server settings.
+    """
+    if config.reload:
+        uvicorn.run(
+            APP_IMPORT_PATH,
+            host=config.host,
+            port=config.port,
+            backlog=config.backlog,
+            timeout_keep_alive=config.keep_alive,
+            reload=True,
+        )
+        return
+
+    # pylint: disable-next=import-outside-toplevel
+    from basebender.api.main import APP, preload_api
+
+    preload_api()
+    uvicorn_config = uvicorn.Config(
+        APP,
+        host=config.host,
+        port=config.port,
+        backlog=config.backlog,
+        timeout_keep_alive=config.keep_alive,
+        loop=event_loop_implementation(),
+        http=http_implementation(),
+        workers=config.workers,
+    )
+    logger.info(
+        "Serving on %s:%d with %d worker(s) (%s, %s).",
+        config.host,
+        config.port,
+        config.workers,
+        uvicorn_config.loop,
+        uvicorn_config.http,
+    )
+    if config.workers == 1:
+        uvicorn.Server(uvicorn_config).run()
+    elif not hasattr(os, "fork"):
+        # Without fork, uvicorn spawns workers that each import the app.
+        uvicorn.run(
+            APP_IMPORT_PATH,
+            host=config.host,
+            port=config.port,
+            backlog=config.backlog,
+            timeout_keep_alive=config.keep_alive,
+            loop=uvicorn_config.loop,
+            http=uvicorn_config.http,
+            workers=config.workers,
+        )
+    else:
+        _serve_forked(uvicorn_config, config.workers)
+
+
+def _exit_worker(_signum: int, _frame: object) -> None:
+    raise SystemExit(0)
+
+
+def _run_worker(uvicorn_config: uvicorn.Config, sock: socket.socket) -> None:
+    """Runs one forked worker and exits the process when it stops."""
+    # uvicorn handles these signals while serving and raises them again once
+    # it has shut down; then they must end the worker through `finally`.
+    signal.signal(signal.SIGTERM, _exit_worker)
+    signal.signal(signal.SIGINT, _exit_worker)
+    exit_code = 0
+    try:
+        uvicorn.Server(uvicorn_config).run(sockets=[sock])
+    except SystemExit as exc:
+        exit_code = exc.code if isinstance(exc.code, int) else 0
+    except BaseException:  # pylint: disable=broad-exception-caught
+        # Catching everything so a forked worker never returns into the supervisor.
+        logger.exception("Worker %d failed.", os.getpid())
+        exit_code = 1
+    finally:
+        # `os._exit` skips the exit handlers that would stop the conversion
+        # process pool, so stop its workers here.
+        children = multiprocessing.active_children()
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.join(timeout=5)
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+def _serve_forked(uvicorn_config: uvicorn.Config, workers: int) -> None:
+    """
+    Binds the socket, forks `workers` workers that serve from it and restarts
+    crashed ones until SIGINT or SIGTERM.
+    """
+    sock = uvicorn_config.bind_socket()
+    started: dict[int, float] = {}
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(uvicorn_config, sock)
+        started[pid] = time.monotonic()
+
+    def stop(_signum: int, _frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in started:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+
+    try:
+        while started:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            lifetime = time.monotonic() - started.pop(pid, 0.0)
+            if stopping:
+                continue
+            logger.warning(
+                "Worker %d exited with status %d; restarting it.",
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            if lifetime < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)
+            spawn()
+    finally:
+        sock.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Entry point of `basebender-api`.
+
+    Args:
+        argv: The command-line arguments (default: `sys.argv[1:]`).
+    """
+    parser = argparse.ArgumentParser(description="Run the BaseBender API server.")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        config = config_from_args(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    logging.basicConfig(level=logging.INFO)
+    serve(config)
@@ -0,0 +1,129 @@
+"""
+This module reads the API's tuning settings from environment variables.
+
+Every setting has a default; invalid values are logged and the default is
+used instead, so a typo never prevents the server from starting.
+"""
+
+import logging
+import os
+
+from basebender.rebaser.catalog import DEFAULT_POLL_INTERVAL
+from basebender.rebaser.engines import DEFAULT_SLICE_BUDGET
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REBASE_TIMEOUT = 30.0
+DEFAULT_BATCH_INLINE_CHARS = 16384
+DEFAULT_DIGITSETS_MAX_AGE = 60
+DEFAULT_WARMUP_PAIRS = "sets"
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    Reads a non-negative float from the environment.
+
+    Args:
+        name: The name of the environment variable.
+        default: The value used if the variable is unset or invalid.
+
+    Returns:
+        The configured value, or `default`.
+    """
+    raw_value = os.environ.get(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        value = float(raw_value)
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not a number.", name, raw_value)
+        return default
+    if value < 0:
+        logger.warning("Ignoring %s=%r: must not be negative.", name, raw_value)
+        return default
+    return value
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Reads a non-negative integer from the environment.
+
+    Args:
+        name: The name of the environment variable.
+        default: The value used if the variable is unset or invalid.
+
+    Returns:
+        The configured value, or `default`.
+    """
+    raw_value = os.environ.get(name)
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("Ignoring %s=%r: not an integer.", name, raw_value)
+        return default
+    if value < 0:
+        logger.warning("Ignoring %s=%r: must not be negative.", name, raw_value)
+        return default
+    return value
+
+
+def slice_budget() -> float:
+    """
+    The time in seconds a conversion runs before yielding to the event loop.
+
+    Configured in milliseconds through `BASEBENDER_SLICE_BUDGET_MS`.
+    """
+    return env_float("BASEBENDER_SLICE_BUDGET_MS", DEFAULT_SLICE_BUDGET * 1000) / 1000
+
+
+def rebase_timeout() -> float | None:
+    """
+    The time limit in seconds for a single conversion, or `None` for no limit.
+
+    Configured through `BASEBENDER_REBASE_TIMEOUT`; `0` disables the limit.
+    """
+    return env_float("BASEBENDER_REBASE_TIMEOUT", DEFAULT_REBASE_TIMEOUT) or None
+
+
+def batch_inline_chars() -> int:
+    """
+    The total input length up to which a batch is converted on the event loop.
+
+    Larger batches run in the thread pool. Configured through
+    `BASEBENDER_BATCH_INLINE_CHARS`.
+    """
+    return env_int("BASEBENDER_BATCH_INLINE_CHARS", DEFAULT_BATCH_INLINE_CHARS)
+
+
+def digit_sets_max_age() -> int:
+    """
+    The `max-age` in seconds clients may cache `GET /digitsets` for.
+
+    Configured through `BASEBENDER_DIGITSETS_MAX_AGE`.
+    """
+    return env_int("BASEBENDER_DIGITSETS_MAX_AGE", DEFAULT_DIGITSETS_MAX_AGE)
+
+
+def catalog_poll_interval() -> float:
+    """
+    Seconds between checks of the digit-set configuration files for changes;
+    0 disables reloading the catalog.
+
+    Configured through `BASEBENDER_CATALOG_POLL_INTERVAL`.
+    """
+    return env_float("BASEBENDER_CATALOG_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)
+
+
+def warmup_pairs() -> str:
+    """
+    The digit-set pairs warmed up at startup.
+
+    Configured through `BASEBENDER_WARMUP_PAIRS`: "sets" (the default; every
+    predefined digit set to and from `package:Decimal`), "all" (the ordered
+    pairs of predefined digit sets), comma-separated `source>target` pairs of
+    digit set IDs, or "none". "sets" and "all" warm up at most
+    `warmup.MAX_WARMUP_PAIRS` pairs.
+    """
+    return os.environ.get("BASEBENDER_WARMUP_PAIRS", DEFAULT_WARMUP_PAIRS).strip()
@@ -0,0 +1,138 @@
+"""
+This module provides the plumbing for streaming request and response bodies.
+
+`RequestBodyPump` is the only reader of the ASGI `receive` channel of a
+streaming request: it hands body chunks to the handler through a bounded
+queue and reports the disconnect separately. `PumpedStreamingResponse` runs
+the pump next to a `StreamingResponse`, whose own disconnect listener would
+otherwise consume (and drop) request body messages. `LineSplitter` splits
+the body into lines incrementally with a bounded line length.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from starlette.types import Message, Receive, Scope, Send
+
+DEFAULT_QUEUE_CHUNKS = 8
+
+
+class LineSplitter:
+    """
+    Splits a stream of byte chunks into lines.
+
+    Lines are separated by `\\n`; a trailing `\\r` is removed. Lines longer
+    than `max_line_bytes` are reported as `None` and their bytes discarded,
+    so memory stays bounded whatever the input.
+    """
+
+    def __init__(self, max_line_bytes: int) -> None:
+        self._max_line_bytes = max_line_bytes
+        self._pending = bytearray()
+        self._overlong = False
+
+    def _finish_line(self, line: bytes) -> bytes | None:
+        if self._overlong or (self._max_line_bytes and len(line) > self._max_line_bytes):
+            self._overlong = False
+            return None
+        return line.removesuffix(b"\r")
+
+    def feed(self, chunk: bytes) -> list[bytes | None]:
+        """
+        Adds a chunk and returns the lines it completes.
+
+        Args:
+            chunk: The next bytes of the body.
+
+        Returns:
+            The completed lines, with `None` for every overlong line.
+        """
+        lines: list[bytes | None] = []
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            self._pending += chunk[start:end]
+            lines.append(self._finish_line(bytes(self._pending)))
+            self._pending.clear()
+            start = end + 1
+        self._pending += chunk[start:]
+        if self._max_line_bytes and len(self._pending) > self._max_line_bytes:
+            self._overlong = True
+            self._pending.clear()
+        return lines
+
+    def close(self) -> list[bytes | None]:
+        """Returns the final line if the body does not end with a newline."""
+        if not self._pending and not self._overlong:
+            return []
+        line = self._finish_line(bytes(self._pending))
+        self._pending.clear()
+        return [line]
+
+
+class RequestBodyPump:
+    """
+    Reads a request body into a bounded queue and watches for the disconnect.
+    """
+
+    def __init__(self, receive: Receive, max_chunks: int = DEFAULT_QUEUE_CHUNKS) -> None:
+        self._receive = receive
+        self._chunks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max_chunks)
+        self._disconnected = asyncio.Event()
+
+    @property
+    def disconnected(self) -> bool:
+        """Whether the client has disconnected."""
+        return self._disconnected.is_set()
+
+    async def run(self) -> None:
+        """Pumps ASGI messages until the client disconnects."""
+        body_complete = False
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                self._disconnected.set()
+                if not body_complete:
+                    # Unblock the handler; the body ends early.
+                    while self._chunks.full():
+                        self._chunks.get_nowait()
+                    self._chunks.put_nowait(None)
+                return
+            if message["type"] == "http.request" and not body_complete:
+                if body := message.get("body", b""):
+                    await self._chunks.put(body)
+                if not message.get("more_body", False):
+                    body_complete = True
+                    await self._chunks.put(None)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yields the body chunks as they arrive."""
+        while (chunk := await self._chunks.get()) is not None:
+            yield chunk
+
+    async def receive_disconnect(self) -> Message:
+        """An ASGI `receive` that only returns once the client has disconnected."""
+        await self._disconnected.wait()
+        return {"type": "http.disconnect"}
+
+
+class PumpedStreamingResponse(StreamingResponse):
+    """
+    A `StreamingResponse` that streams while the request body is still read.
+
+    The pump runs for the lifetime of the response and the response only
+    sees the disconnect from it.
+    """
+
+    def __init__(
+        self, content: AsyncIterator[str], pump: RequestBodyPump, media_type: str
+    ) -> None:
+        super().__init__(content, media_type=media_type)
+        self.pump = pump
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        pump_task = asyncio.create_task(self.pump.run())
+        try:
+            await super().__call__(scope, self.pump.receive_disconnect, send)
+        finally:
+            pump_task.cancel()
@@ -0,0 +1,197 @@
+"""
+This module warms the API up before it reports itself ready.
+
+Otherwise the digit-set catalog is parsed, the rebasers and compiled
+functions of each digit-set pair are built, the conversion engines are loaded
+and the worker pools are started by the first requests that need them, which
+makes the first requests after a deploy slow. `WarmupState` records whether
+that work has been done ahead of time, which `GET /ready` reports.
+"""
+
+import itertools
+import logging
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+
+from basebender.rebaser.models import DigitSet
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SETS = "sets"
+WARMUP_ALL = "all"
+WARMUP_NONE = "none"
+
+# "sets" pairs every digit set with this one (or with the first digit set if
+# the catalog has no such ID), in both directions.
+WARMUP_PARTNER_ID = "package:Decimal"
+
+# The most pairs "sets" and "all" warm up: the API keeps the rebasers of this
+# many pairs (`main.REBASER_CACHE_SIZE`), so warming more would only evict them.
+MAX_WARMUP_PAIRS = 256
+
+# "all" warms up nothing for catalogs of more digit sets than this, as only a
+# small share of their pairs would fit within `MAX_WARMUP_PAIRS`.
+MAX_WARMUP_ALL_DIGIT_SETS = 64
+
+
+@dataclass
+class WarmupState:
+    """
+    The progress of the startup warmup.
+
+    Attributes:
+        ready: Whether the warmup has finished.
+        warmed_pairs: The number of digit-set pairs warmed up.
+        duration: How long the warmup took, in seconds, once finished.
+        error: The error that stopped the warmup, if any.
+    """
+
+    ready: bool = False
+    warmed_pairs: int = 0
+    duration: float | None = None
+    error: str | None = None
+
+
+def _partner_pair_ids(catalog: Mapping[str, DigitSet]) -> Iterator[tuple[str, str]]:
+    """Yields the "sets" pairs: every digit set to and from the partner."""
+    partner_id = WARMUP_PARTNER_ID if WARMUP_PARTNER_ID in catalog else next(iter(catalog), None)
+    if partner_id is None:
+        return
+    for digit_set_id in catalog:
+        if digit_set_id != partner_id:
+            yield digit_set_id, partner_id
+            yield partner_id, digit_set_id
+
+
+def _all_pair_ids(catalog: Mapping[str, DigitSet]) -> Iterator[tuple[str, str]]:
+    """
+    Yields the ordered pairs of distinct digit sets, every digit set once as
+    source and once as target before any of them repeats, so a limited
+    prefix still covers all of them.
+    """
+    ids = list(catalog)
+    for offset in range(1, len(ids)):
+        for index, source_id in enumerate(ids):
+            yield source_id, ids[(index + offset) % len(ids)]
+
+
+def parse_warmup_pairs(
+    spec: str, catalog: Mapping[str, DigitSet], limit: int = MAX_WARMUP_PAIRS
+) -> list[tuple[DigitSet, DigitSet]]:
+    """
+    Resolves the `BASEBENDER_WARMUP_PAIRS` setting.
+
+    Unknown IDs and malformed entries are logged and skipped.
+
+    Args:
+        spec: "sets" (every digit set to and from `WARMUP_PARTNER_ID`),
+              "all" (the ordered pairs of distinct digit sets), "none", or
+              comma-separated `source>target` digit set IDs.
+        catalog: The predefined digit sets by ID.
+        limit: The most pairs "sets" and "all" select; explicit pairs are
+               not limited. "all" selects none for catalogs of more than
+               `MAX_WARMUP_ALL_DIGIT_SETS` digit sets.
+
+    Returns:
+        The `(source, target)` pairs to warm up.
+
+    Examples:
+        >>> catalog = {
+        ...     "a": DigitSet(name="A", digits="01", source="test"),
+        ...     "b": DigitSet(name="B", digits="012", source="test"),
+        ... }
+        >>> [(s.name, t.name) for s, t in parse_warmup_pairs("b>a, a>c", catalog)]
+        [('B', 'A')]
+        >>> len(parse_warmup_pairs("all", catalog))
+        2
+        >>> [(s.name, t.name) for s, t in parse_warmup_pairs("sets", catalog)]
+        [('B', 'A'), ('A', 'B')]
+    """
+    mode = spec.lower()
+    if mode == WARMUP_NONE:
+        return []
+    if mode in (WARMUP_SETS, WARMUP_ALL):
+        if mode == WARMUP_SETS:
+            ids, pair_count = _partner_pair_ids(catalog), 2 * max(0, len(catalog) - 1)
+        elif len(catalog) > MAX_WARMUP_ALL_DIGIT_SETS:
+            logger.warning(
+                "Not warming up 'all' pairs of %d digit sets (more than %d); "
+                "use 'sets' or list the pairs to warm up instead.",
+                len(catalog),
+                MAX_WARMUP_ALL_DIGIT_SETS,
+            )
+            return []
+        else:
+            ids, pair_count = _all_pair_ids(catalog), len(catalog) * (len(catalog) - 1)
+        if pair_count > limit:
+            logger.warning("Warming up only %d of %d digit-set pairs.", limit, pair_count)
+        return [
+            (catalog[source_id], catalog[target_id])
+            for source_id, target_id in itertools.islice(ids, limit)
+        ]
+    pairs = []
+    for entry in filter(None, (entry.strip() for entry in spec.split(","))):
+        source_id, separator, target_id = entry.partition(">")
+        source = catalog.get(source_id.strip())
+        target = catalog.get(target_id.strip())
+        if not separator or source is None or target is None:
+            logger.warning("Ignoring warmup pair %r: expected 'source_id>target_id'.", entry)
+            continue
+        pairs.append((source, target))
+    return pairs
+
+
+def sample_input(digit_set: DigitSet) -> str:
+    """
+    Returns a short valid input in `digit_set` that exercises a conversion.
+
+    Examples:
+        >>> sample_input(DigitSet(name="Decimal", digits="0123456789", source="test"))
+        '9999'
+    """
+    if digit_set.block is not None:
+        return digit_set.digits[0] * digit_set.block.block_chars
+    return digit_set.digits[-1] * 4
+
+
+def warm_up(
+    state: WarmupState,
+    load_catalog: Callable[[], Mapping[str, DigitSet]],
+    warm_pair: Callable[[DigitSet, DigitSet], None],
+    spec: str,
+    finish: Callable[[], None] | None = None,
+) -> None:
+    """
+    Runs the warmup and records its outcome in `state`.
+
+    Meant to run in a worker thread; a failing pair is logged and skipped,
+    while any other error leaves the state not ready with `error` set.
+
+    Args:
+        state: The state to update.
+        load_catalog: Loads the predefined digit sets by ID.
+        warm_pair: Builds and exercises the conversion of a `(source, target)` pair.
+        spec: The `BASEBENDER_WARMUP_PAIRS` setting.
+        finish: Called after the pairs, e.g., to start the worker pools.
+    """
+    started = time.monotonic()
+    try:
+        catalog = load_catalog()
+        for source, target in parse_warmup_pairs(spec, catalog):
+            try:
+                warm_pair(source, target)
+            except ValueError as exc:
+                logger.warning("Could not warm up %s -> %s: %s", source.name, target.name, exc)
+                continue
+            state.warmed_pairs += 1
+        if finish is not None:
+            finish()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # Catching broad exception so the failure is reported by /ready.
+        logger.exception("Warmup failed.")
+        state.error = str(exc)
+        return
+    state.duration = time.monotonic() - started
+    state.ready = True
+    logger.info("Warmed up %d digit-set pairs in %.2f s.", state.warmed_pairs, state.duration)
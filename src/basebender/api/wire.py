@@ -0,0 +1,224 @@
+"""
+This module implements the compact binary wire formats of the API.
+
+Besides JSON, `/rebase` and `/rebase/batch` accept and return:
+
+- Length-prefixed frames (`application/x-basebender-frames`): a sequence of
+  UTF-8 fields, each preceded by its byte length as a 4-byte big-endian
+  unsigned integer; the length `0xFFFFFFFF` marks a missing (null) field.
+  Text is sent as raw UTF-8, so alphabets such as emojis or CJK are not
+  escaped, and decoding needs no parser.
+- MessagePack (`application/msgpack`), with the same keys as the JSON
+  bodies, if the optional `msgpack` package is installed.
+
+The request format is chosen by `Content-Type` and the response format by
+`Accept`; JSON remains the default for both.
+"""
+
+import importlib
+import struct
+from collections.abc import Iterable, Sequence
+from functools import cache
+from types import ModuleType
+from typing import Any
+
+FRAMES_MEDIA_TYPE = "application/x-basebender-frames"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+JSON_MEDIA_TYPE = "application/json"
+
+# The wire formats.
+JSON = "json"
+FRAMES = "frames"
+MSGPACK = "msgpack"
+
+_MSGPACK_MEDIA_TYPES = frozenset(
+    {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+)
+
+_LENGTH = struct.Struct(">I")
+_NULL_LENGTH = 0xFFFFFFFF
+
+
+@cache
+def _msgpack() -> ModuleType | None:
+    try:
+        return importlib.import_module("msgpack")
+    except ImportError:
+        return None
+
+
+def msgpack_available() -> bool:
+    """Whether the optional `msgpack` package is installed."""
+    return _msgpack() is not None
+
+
+def _media_type(header: str) -> str:
+    return header.split(";", 1)[0].strip().lower()
+
+
+def request_format(content_type: str | None) -> str:
+    """
+    Returns the wire format of a request body.
+
+    Args:
+        content_type: The `Content-Type` header, if any.
+
+    Returns:
+        `FRAMES`, `MSGPACK`, or `JSON` for any other media type.
+
+    Raises:
+        ValueError: If the body is MessagePack but `msgpack` is not installed.
+
+    Examples:
+        >>> request_format("application/x-basebender-frames"), request_format(None)
+        ('frames', 'json')
+    """
+    media_type = _media_type(content_type or "")
+    if media_type == FRAMES_MEDIA_TYPE:
+        return FRAMES
+    if media_type in _MSGPACK_MEDIA_TYPES:
+        if not msgpack_available():
+            raise ValueError("MessagePack bodies require the 'msgpack' package on the server.")
+        return MSGPACK
+    return JSON
+
+
+def response_format(accept: str | None) -> str:
+    """
+    Returns the wire format for a response.
+
+    The first binary media type listed in `Accept` that the server supports
+    is used; quality values are not weighed. Otherwise the response is JSON.
+
+    Args:
+        accept: The `Accept` header, if any.
+
+    Examples:
+        >>> response_format("application/x-basebender-frames, application/json")
+        'frames'
+        >>> response_format("*/*")
+        'json'
+    """
+    for entry in (accept or "").split(","):
+        media_type = _media_type(entry)
+        if media_type == FRAMES_MEDIA_TYPE:
+            return FRAMES
+        if media_type in _MSGPACK_MEDIA_TYPES and msgpack_available():
+            return MSGPACK
+    return JSON
+
+
+class FramesWriter:
+    """
+    Writes length-prefixed fields into a growing buffer.
+
+    Examples:
+        >>> writer = FramesWriter()
+        >>> writer.write("ab")
+        >>> writer.write(None)
+        >>> bytes(writer.buffer)
+        b'\\x00\\x00\\x00\\x02ab\\xff\\xff\\xff\\xff'
+    """
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def write(self, field: str | None) -> None:
+        """Appends one field; `None` is written as a null field."""
+        if field is None:
+            self.buffer += _LENGTH.pack(_NULL_LENGTH)
+            return
+        data = field.encode("utf-8")
+        self.buffer += _LENGTH.pack(len(data))
+        self.buffer += data
+
+    def write_all(self, fields: Iterable[str | None]) -> None:
+        """Appends several fields."""
+        for field in fields:
+            self.write(field)
+
+
+def encode_frames(fields: Iterable[str | None]) -> bytes:
+    """
+    Encodes fields as length-prefixed frames.
+
+    Examples:
+        >>> decode_frames(encode_frames(["1", None, "🕐"]))
+        ['1', None, '🕐']
+    """
+    writer = FramesWriter()
+    writer.write_all(fields)
+    return bytes(writer.buffer)
+
+
+def decode_frames(data: bytes) -> list[str | None]:
+    """
+    Decodes length-prefixed frames.
+
+    Args:
+        data: The encoded fields.
+
+    Returns:
+        The fields, with `None` for null fields.
+
+    Raises:
+        ValueError: If the data is truncated or a field is not valid UTF-8.
+    """
+    fields: list[str | None] = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        if offset + _LENGTH.size > len(view):
+            raise ValueError("Truncated frame length.")
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if length == _NULL_LENGTH:
+            fields.append(None)
+            continue
+        if offset + length > len(view):
+            raise ValueError("Truncated frame.")
+        fields.append(str(view[offset : offset + length], "utf-8"))
+        offset += length
+    return fields
+
+
+def fields_to_dict(names: Sequence[str], fields: Sequence[str | None]) -> dict[str, str | None]:
+    """
+    Maps positional frame fields to names; missing trailing fields are omitted.
+
+    Raises:
+        ValueError: If there are more fields than names.
+    """
+    if len(fields) > len(names):
+        raise ValueError(f"Expected at most {len(names)} fields, got {len(fields)}.")
+    return {name: field for name, field in zip(names, fields) if field is not None}
+
+
+def pack_msgpack(value: Any) -> bytes:
+    """
+    Encodes a value as MessagePack.
+
+    Raises:
+        ValueError: If `msgpack` is not installed.
+    """
+    msgpack = _msgpack()
+    if msgpack is None:
+        raise ValueError("MessagePack requires the 'msgpack' package.")
+    return msgpack.packb(value)  # type: ignore[no-any-return]
+
+
+def unpack_msgpack(data: bytes) -> Any:
+    """
+    Decodes a MessagePack value.
+
+    Raises:
+        ValueError: If the data is invalid or `msgpack` is not installed.
+    """
+    msgpack = _msgpack()
+    if msgpack is None:
+        raise ValueError("MessagePack requires the 'msgpack' package.")
+    try:
+        return msgpack.unpackb(data)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        # msgpack raises several unrelated exception types for invalid data.
+        raise ValueError(f"Invalid MessagePack data: {exc}") from exc
@@ -10,8 +10,7 @@ import argparse
 import logging
 import sys
 
-import uvicorn
-
+from basebender.api.server import add_server_arguments, config_from_args, serve
 from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
 from basebender.rebaser.digit_sets import (
     get_predefined_digit_sets,
@@ -195,8 +194,12 @@ def main() -> None:
     parser.add_argument(
         "--api",
         action="store_true",
-        help=("Start the FastAPI server, providing a web API for rebase operations."),
+        help=(
+            "Start the FastAPI server, providing a web API for rebase operations "
+            "(see the API server options)."
+        ),
     )
+    add_server_arguments(parser)
 
     args = parser.parse_args()
     exit_code = 0
@@ -206,8 +209,12 @@ def main() -> None:
 
         run_gui()
     elif args.api:
-        # Ensure the API module is importable from the current directory
-        uvicorn.run("basebender.api.main:APP", host="0.0.0.0", port=8000, reload=True)
+        try:
+            server_config = config_from_args(args)
+        except ValueError as exc:
+            parser.error(str(exc))
+        logging.basicConfig(level=logging.INFO)
+        serve(server_config)
     elif args.list_digit_sets:
         exit_code = list_digit_sets_cli()
     elif args.suggest_digit_sets:
@@ -0,0 +1,634 @@
+"""
+This module provides Python clients for the BaseBender API.
+
+`BaseBenderClient` (blocking) and `AsyncBaseBenderClient` (asyncio) keep a
+pool of HTTP/1.1 keep-alive connections, so consecutive calls reuse open
+connections. With `batching`, `rebase` calls with the same digit sets
+that are made concurrently within that many seconds are gathered into one
+`/rebase/batch` request. Digit-set IDs are checked against a copy of
+`GET /digitsets` that is revalidated by ETag once its `max-age` has passed,
+so an unknown ID fails without a request.
+
+The clients require `httpx2` (or `httpx`). `for_app` connects a client to an
+ASGI application in the same process, without a network.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+try:
+    import httpx2 as httpx
+except ImportError:
+    try:
+        import httpx  # type: ignore[no-redef,unused-ignore]
+    except ImportError as exc:
+        raise ImportError(
+            "basebender.client requires the 'httpx2' package (e.g., `uv pip install httpx2`)."
+        ) from exc
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 10
+
+# The default auto-batching window in seconds, and the maximum number of
+# inputs gathered into one batch request.
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 256
+
+# The ID prefix of digit sets registered through `POST /digitsets`, which are
+# not listed by `GET /digitsets`.
+REGISTERED_ID_PREFIX = "registered:"
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class APIError(Exception):
+    """
+    An error reported by the API.
+
+    Attributes:
+        message: A concise summary of the error (e.g., "Rebase Error").
+        detail: A more detailed explanation, if any.
+        status_code: The HTTP status of the response, or `None` for the error
+                     of one input of a batch.
+    """
+
+    def __init__(self, message: str, detail: str | None = None, status_code: int | None = None):
+        super().__init__(f"{message}: {detail}" if detail else message)
+        self.message = message
+        self.detail = detail
+        self.status_code = status_code
+
+
+def _raise_for_error(response: httpx.Response) -> None:
+    """Raises the `APIError` of an error response."""
+    if response.status_code < 400:
+        return
+    try:
+        detail = response.json().get("detail")
+    except ValueError:
+        detail = response.text or None
+    if isinstance(detail, dict):
+        raise APIError(
+            str(detail.get("message", "API Error")), detail.get("detail"), response.status_code
+        )
+    raise APIError("API Error", None if detail is None else str(detail), response.status_code)
+
+
+@dataclass(frozen=True)
+class DigitSetInfo:
+    """
+    A digit set listed by `GET /digitsets`.
+
+    Attributes:
+        id: The unique identifier of the digit set (e.g., "package:Binary").
+        name: The human-readable name of the digit set.
+        digits: The digits of the set, in order.
+        source: The origin of the digit set (e.g., "package").
+        mode: The conversion mode ("positional" or "block").
+    """
+
+    id: str
+    name: str
+    digits: str
+    source: str
+    mode: str = "positional"
+
+
+@dataclass(frozen=True)
+class DigitSetPair:
+    """
+    The source and target digit sets of a request, as in the API's
+    `RebaseRequest`: direct digits take precedence over IDs.
+    """
+
+    source_digit_set: str | None = None
+    source_digit_set_id: str | None = None
+    target_digit_set: str | None = None
+    target_digit_set_id: str | None = None
+
+    def fields(self) -> dict[str, str]:
+        """Returns the given fields of the pair as request body fields."""
+        return {name: value for name, value in vars(self).items() if value is not None}
+
+    def catalog_ids(self) -> list[str]:
+        """
+        Returns the IDs the server will look up in its catalog: those without
+        direct digits, except registered IDs.
+        """
+        return [
+            digit_set_id
+            for digits, digit_set_id in (
+                (self.source_digit_set, self.source_digit_set_id),
+                (self.target_digit_set, self.target_digit_set_id),
+            )
+            if digit_set_id and not digits and not digit_set_id.startswith(REGISTERED_ID_PREFIX)
+        ]
+
+
+class _DigitSetCatalog:
+    """A copy of `GET /digitsets`, revalidated by ETag once it expires."""
+
+    def __init__(self) -> None:
+        self.digit_sets: dict[str, DigitSetInfo] = {}
+        self._etag: str | None = None
+        self._expires = 0.0
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self._expires
+
+    def request_headers(self) -> dict[str, str]:
+        return {"If-None-Match": self._etag} if self._etag else {}
+
+    def update(self, response: httpx.Response) -> dict[str, DigitSetInfo]:
+        if response.status_code != 304:
+            _raise_for_error(response)
+            self.digit_sets = {
+                item["id"]: DigitSetInfo(
+                    id=item["id"],
+                    name=item["name"],
+                    digits=item["digits"],
+                    source=item["source"],
+                    mode=item.get("mode", "positional"),
+                )
+                for item in response.json()
+            }
+            self._etag = response.headers.get("etag")
+        max_age = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        self._expires = time.monotonic() + (int(max_age.group(1)) if max_age else 0)
+        return self.digit_sets
+
+    def check(self, pair: DigitSetPair) -> None:
+        """
+        Raises:
+            ValueError: If the pair refers to an ID that is not in the catalog.
+        """
+        for digit_set_id in pair.catalog_ids():
+            if digit_set_id not in self.digit_sets:
+                raise ValueError(f"Unknown digit set ID '{digit_set_id}'.")
+
+
+def _rebase_body(input_text: str, pair: DigitSetPair) -> dict[str, str]:
+    return {"input_text": input_text, **pair.fields()}
+
+
+def _rebase_result(response: httpx.Response) -> str:
+    _raise_for_error(response)
+    return str(response.json()["rebased_text"])
+
+
+def _batch_body(inputs: Iterable[str], pair: DigitSetPair) -> dict[str, Any]:
+    return {"inputs": list(inputs), **pair.fields()}
+
+
+def _batch_results(response: httpx.Response, expected: int) -> list[str | APIError]:
+    """
+    Returns the result of every input of a batch response.
+
+    Raises:
+        APIError: If the request failed, or the response does not hold
+                  `expected` results.
+    """
+    _raise_for_error(response)
+    items = response.json()["results"]
+    if len(items) != expected:
+        raise APIError(
+            "Invalid Response",
+            f"Expected {expected} batch results, got {len(items)}.",
+            response.status_code,
+        )
+    results: list[str | APIError] = []
+    for item in items:
+        error = item.get("error")
+        if error:
+            results.append(APIError(error["message"], error.get("detail")))
+        else:
+            results.append(item["rebased_text"])
+    return results
+
+
+def _limits(max_connections: int) -> httpx.Limits:
+    return httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+
+
+@dataclass(frozen=True)
+class Batching:
+    """
+    Settings of the auto-batching of `rebase` calls.
+
+    Attributes:
+        window: Seconds to gather calls with the same digit sets, counted
+                from the first one.
+        max_size: The most calls sent in one batch; a full batch is sent at
+                  once.
+    """
+
+    window: float = DEFAULT_BATCH_WINDOW
+    max_size: int = DEFAULT_MAX_BATCH_SIZE
+
+
+@dataclass
+class _BatchGroup:
+    """The pending calls of one digit-set pair, sent by the first caller."""
+
+    items: list[tuple[str, Future[str]]] = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
+
+
+class BaseBenderClient:
+    """
+    A blocking client of the BaseBender API.
+
+    The client is thread-safe. With `batching`, concurrent `rebase` calls
+    from several threads with the same digit sets are sent as one batch
+    request: the first call of a pair waits up to `Batching.window` seconds
+    (or until `Batching.max_size` calls have gathered) and then sends the
+    calls gathered so far.
+
+    Examples:
+        >>> with BaseBenderClient("http://127.0.0.1:8000") as client:  # doctest: +SKIP
+        ...     client.rebase("255", source_digit_set_id="package:Decimal",
+        ...                   target_digit_set_id="package:Hexadecimal")
+        'FF'
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        batching: Batching | None = None,
+        http_client: httpx.Client | None = None,
+    ) -> None:
+        """
+        Args:
+            base_url: The URL of the API.
+            timeout: The timeout of every request, in seconds.
+            max_connections: The size of the keep-alive connection pool.
+            batching: How to gather concurrent `rebase` calls into batch
+                      requests, or `None` to send every call on its own.
+            http_client: The HTTP client to use instead of a new pooled one;
+                         it is not closed by `close`.
+        """
+        self._owns_http = http_client is None
+        self._http = http_client or httpx.Client(
+            base_url=base_url, timeout=timeout, limits=_limits(max_connections)
+        )
+        self._batching = batching
+        self._catalog = _DigitSetCatalog()
+        self._catalog_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending: dict[DigitSetPair, _BatchGroup] = {}
+
+    @classmethod
+    def for_app(cls, app: Any, **kwargs: Any) -> Self:
+        """
+        Creates a client that calls an ASGI application in this process.
+
+        Args:
+            app: The ASGI application, e.g., `basebender.api.main.APP`.
+            **kwargs: Further arguments of the client.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from starlette.testclient import TestClient
+
+        client = cls(http_client=TestClient(app), **kwargs)
+        client._owns_http = True
+        return client
+
+    def close(self) -> None:
+        """Closes the connection pool."""
+        if self._owns_http:
+            self._http.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def digit_sets(self) -> dict[str, DigitSetInfo]:
+        """
+        Returns the digit sets listed by `GET /digitsets` by ID.
+
+        The list is fetched on first use and revalidated once it is older
+        than its `max-age`.
+
+        Raises:
+            APIError: If the list cannot be fetched.
+        """
+        with self._catalog_lock:
+            if not self._catalog.is_fresh():
+                response = self._http.get("/digitsets", headers=self._catalog.request_headers())
+                self._catalog.update(response)
+            return self._catalog.digit_sets
+
+    def _check_pair(self, pair: DigitSetPair) -> None:
+        if pair.catalog_ids():
+            self.digit_sets()
+            self._catalog.check(pair)
+
+    def rebase(
+        self,
+        input_text: str,
+        *,
+        source_digit_set: str | None = None,
+        source_digit_set_id: str | None = None,
+        target_digit_set: str | None = None,
+        target_digit_set_id: str | None = None,
+    ) -> str:
+        """
+        Rebases `input_text`; the digit sets are given as for `POST /rebase`.
+
+        Returns:
+            The rebased text.
+
+        Raises:
+            ValueError: If a digit-set ID is not in `digit_sets()`.
+            APIError: If the API reports an error.
+        """
+        pair = DigitSetPair(
+            source_digit_set, source_digit_set_id, target_digit_set, target_digit_set_id
+        )
+        self._check_pair(pair)
+        if self._batching is None:
+            return _rebase_result(self._http.post("/rebase", json=_rebase_body(input_text, pair)))
+        return self._rebase_batched(self._batching, pair, input_text)
+
+    def rebase_batch(
+        self,
+        inputs: Iterable[str],
+        *,
+        source_digit_set: str | None = None,
+        source_digit_set_id: str | None = None,
+        target_digit_set: str | None = None,
+        target_digit_set_id: str | None = None,
+    ) -> list[str | APIError]:
+        """
+        Rebases several inputs with one `POST /rebase/batch` request.
+
+        Returns:
+            The rebased text or the `APIError` of every input, in order.
+
+        Raises:
+            ValueError: If a digit-set ID is not in `digit_sets()`.
+            APIError: If the whole request fails.
+        """
+        pair = DigitSetPair(
+            source_digit_set, source_digit_set_id, target_digit_set, target_digit_set_id
+        )
+        self._check_pair(pair)
+        return self._post_batch(pair, inputs)
+
+    def _post_batch(self, pair: DigitSetPair, inputs: Iterable[str]) -> list[str | APIError]:
+        inputs = list(inputs)
+        response = self._http.post("/rebase/batch", json=_batch_body(inputs, pair))
+        return _batch_results(response, len(inputs))
+
+    def _rebase_batched(self, batching: Batching, pair: DigitSetPair, input_text: str) -> str:
+        future: Future[str] = Future()
+        with self._lock:
+            group = self._pending.get(pair)
+            leader = group is None
+            if group is None:
+                group = self._pending[pair] = _BatchGroup()
+            group.items.append((input_text, future))
+            if len(group.items) >= batching.max_size:
+                del self._pending[pair]
+                group.full.set()
+        if leader:
+            group.full.wait(batching.window)
+            with self._lock:
+                if self._pending.get(pair) is group:
+                    del self._pending[pair]
+            self._send_group(pair, group)
+        return future.result()
+
+    def _send_group(self, pair: DigitSetPair, group: _BatchGroup) -> None:
+        try:
+            results = self._post_batch(pair, [input_text for input_text, _ in group.items])
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Every gathered call fails with the error of the request.
+            for _, future in group.items:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(group.items, results):
+            if isinstance(result, APIError):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class AsyncBaseBenderClient:
+    """
+    An asyncio client of the BaseBender API.
+
+    With `batching`, `rebase` calls with the same digit sets made within
+    `Batching.window` seconds of the first one (or until `Batching.max_size`
+    calls have gathered) are sent as one batch request.
+    Cancelling a call does not affect the others of its batch.
+
+    Examples:
+        >>> async def main():  # doctest: +SKIP
+        ...     async with AsyncBaseBenderClient(batching=Batching()) as client:
+        ...         return await asyncio.gather(*(
+        ...             client.rebase(str(n), source_digit_set="0123456789",
+        ...                           target_digit_set="01")
+        ...             for n in range(100)
+        ...         ))
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        batching: Batching | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """
+        Args:
+            base_url: The URL of the API.
+            timeout: The timeout of every request, in seconds.
+            max_connections: The size of the keep-alive connection pool.
+            batching: How to gather `rebase` calls into batch requests, or
+                      `None` to send every call on its own.
+            http_client: The HTTP client to use instead of a new pooled one;
+                         it is not closed by `aclose`.
+        """
+        self._owns_http = http_client is None
+        self._http = http_client or httpx.AsyncClient(
+            base_url=base_url, timeout=timeout, limits=_limits(max_connections)
+        )
+        self._batching = batching
+        self._catalog = _DigitSetCatalog()
+        self._catalog_lock = asyncio.Lock()
+        self._pending: dict[DigitSetPair, list[tuple[str, asyncio.Future[str]]]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    def for_app(cls, app: Any, **kwargs: Any) -> Self:
+        """
+        Creates a client that calls an ASGI application in this process.
+
+        The application's lifespan (startup warmup) is not run.
+
+        Args:
+            app: The ASGI application, e.g., `basebender.api.main.APP`.
+            **kwargs: Further arguments of the client.
+        """
+        http_client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+        )
+        client = cls(http_client=http_client, **kwargs)
+        client._owns_http = True
+        return client
+
+    async def aclose(self) -> None:
+        """Sends the pending batches, waits for them and closes the connection pool."""
+        for pair, items in list(self._pending.items()):
+            self._flush(pair, items)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def digit_sets(self) -> dict[str, DigitSetInfo]:
+        """
+        Returns the digit sets listed by `GET /digitsets` by ID.
+
+        The list is fetched on first use and revalidated once it is older
+        than its `max-age`.
+
+        Raises:
+            APIError: If the list cannot be fetched.
+        """
+        async with self._catalog_lock:
+            if not self._catalog.is_fresh():
+                response = await self._http.get(
+                    "/digitsets", headers=self._catalog.request_headers()
+                )
+                self._catalog.update(response)
+            return self._catalog.digit_sets
+
+    async def _check_pair(self, pair: DigitSetPair) -> None:
+        if pair.catalog_ids():
+            await self.digit_sets()
+            self._catalog.check(pair)
+
+    async def rebase(
+        self,
+        input_text: str,
+        *,
+        source_digit_set: str | None = None,
+        source_digit_set_id: str | None = None,
+        target_digit_set: str | None = None,
+        target_digit_set_id: str | None = None,
+    ) -> str:
+        """
+        Rebases `input_text`; the digit sets are given as for `POST /rebase`.
+
+        Returns:
+            The rebased text.
+
+        Raises:
+            ValueError: If a digit-set ID is not in `digit_sets()`.
+            APIError: If the API reports an error.
+        """
+        pair = DigitSetPair(
+            source_digit_set, source_digit_set_id, target_digit_set, target_digit_set_id
+        )
+        await self._check_pair(pair)
+        if self._batching is None:
+            response = await self._http.post("/rebase", json=_rebase_body(input_text, pair))
+            return _rebase_result(response)
+        return await self._enqueue(self._batching, pair, input_text)
+
+    async def rebase_batch(
+        self,
+        inputs: Iterable[str],
+        *,
+        source_digit_set: str | None = None,
+        source_digit_set_id: str | None = None,
+        target_digit_set: str | None = None,
+        target_digit_set_id: str | None = None,
+    ) -> list[str | APIError]:
+        """
+        Rebases several inputs with one `POST /rebase/batch` request.
+
+        Returns:
+            The rebased text or the `APIError` of every input, in order.
+
+        Raises:
+            ValueError: If a digit-set ID is not in `digit_sets()`.
+            APIError: If the whole request fails.
+        """
+        pair = DigitSetPair(
+            source_digit_set, source_digit_set_id, target_digit_set, target_digit_set_id
+        )
+        await self._check_pair(pair)
+        return await self._post_batch(pair, inputs)
+
+    async def _post_batch(self, pair: DigitSetPair, inputs: Iterable[str]) -> list[str | APIError]:
+        inputs = list(inputs)
+        response = await self._http.post("/rebase/batch", json=_batch_body(inputs, pair))
+        return _batch_results(response, len(inputs))
+
+    def _enqueue(
+        self, batching: Batching, pair: DigitSetPair, input_text: str
+    ) -> asyncio.Future[str]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        items = self._pending.get(pair)
+        if items is None:
+            items = self._pending[pair] = []
+            loop.call_later(batching.window, self._flush, pair, items)
+        items.append((input_text, future))
+        if len(items) >= batching.max_size:
+            self._flush(pair, items)
+        return future
+
+    def _flush(self, pair: DigitSetPair, items: list[tuple[str, asyncio.Future[str]]]) -> None:
+        """Sends the gathered calls of a pair unless they have been sent already."""
+        if self._pending.get(pair) is not items:
+            return
+        del self._pending[pair]
+        task = asyncio.get_running_loop().create_task(self._send(pair, items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(
+        self, pair: DigitSetPair, items: list[tuple[str, asyncio.Future[str]]]
+    ) -> None:
+        waiting = [(input_text, future) for input_text, future in items if not future.done()]
+        if not waiting:
+            return
+        try:
+            results = await self._post_batch(pair, [input_text for input_text, _ in waiting])
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Every gathered call fails with the error of the request.
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(waiting, results):
+            if future.done():
+                continue
+            if isinstance(result, APIError):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -9,6 +9,7 @@ manage digit set presets, and view rebase results.
 from __future__ import annotations
 
 import sys
+from collections.abc import Mapping
 from typing import Any
 
 from PySide6.QtCore import QEvent, QObject, QSize, Qt
@@ -30,6 +31,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from basebender.rebaser.cancellation import CancellationToken, RebaseTimeoutError
 from basebender.rebaser.config_loader import load_ui_state, save_ui_state
 from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
 from basebender.rebaser.digit_sets import get_predefined_digit_sets
@@ -44,6 +46,11 @@ ICON_TARGET_QRC_PATH = ":/app/icons/target.svg"
 
 TEXT_EDIT_FIXED_HEIGHT = 30
 
+# Seconds after which a real-time rebase (as you type) is cancelled, so the
+# window stays responsive. Rebases started with the Rebase button run to
+# completion unless `MainWindow` is given a `rebase_timeout`.
+REALTIME_REBASE_TIMEOUT = 2.0
+
 
 class MainWindow(QMainWindow):
     """
@@ -53,8 +60,15 @@ class MainWindow(QMainWindow):
     digit sets.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, rebase_timeout: float | None = None) -> None:
+        """
+        Args:
+            rebase_timeout: The time in seconds after which a rebase started
+                            with the Rebase button is cancelled. `None` means
+                            no limit.
+        """
         super().__init__()
+        self.rebase_timeout = rebase_timeout
         app_resources_rc.qInitResources()
         self.setWindowTitle("BaseBender")
         self.setGeometry(100, 100, 800, 600)
@@ -225,7 +239,7 @@ class MainWindow(QMainWindow):
         Args:
             combo_box: The QComboBox widget to populate.
         """
-        digit_sets: dict[str, DigitSet] = get_predefined_digit_sets()
+        digit_sets: Mapping[str, DigitSet] = get_predefined_digit_sets()
         for name in sorted(digit_sets.keys()):
             combo_box.addItem(name)
 
@@ -233,7 +247,7 @@ class MainWindow(QMainWindow):
         """
         Connects UI signals to their respective slots for interactive behavior.
         """
-        self.rebase_button.clicked.connect(self._perform_rebase)
+        self.rebase_button.clicked.connect(self._on_rebase_clicked)
         self.input_digit_set_preset_combo.currentIndexChanged.connect(
             self._update_input_ds_from_preset
         )
@@ -274,7 +288,7 @@ class MainWindow(QMainWindow):
                 self.input_digit_set_text_edit.setStyleSheet("")
 
             else:
-                digit_sets: dict[str, DigitSet] = get_predefined_digit_sets()
+                digit_sets: Mapping[str, DigitSet] = get_predefined_digit_sets()
                 digit_set_obj: DigitSet | None = digit_sets.get(selected_name)
 
                 if digit_set_obj:
@@ -298,7 +312,7 @@ class MainWindow(QMainWindow):
         if index > 0:
             selected_name: str = self.output_digit_set_preset_combo.currentText()
 
-            digit_sets: dict[str, DigitSet] = get_predefined_digit_sets()
+            digit_sets: Mapping[str, DigitSet] = get_predefined_digit_sets()
             digit_set_obj: DigitSet | None = digit_sets.get(selected_name)
             if digit_set_obj:
                 self.output_digit_set_text_edit.setText(digit_set_obj.digits)
@@ -315,17 +329,21 @@ class MainWindow(QMainWindow):
         """
         if state == Qt.Checked:
             self.rebase_button.setEnabled(False)
-            self._perform_rebase()  # Perform initial rebase
+            self._perform_rebase(REALTIME_REBASE_TIMEOUT)  # Perform initial rebase
         else:
             self.rebase_button.setEnabled(True)
 
+    def _on_rebase_clicked(self) -> None:
+        """Performs the rebase requested with the Rebase button."""
+        self._perform_rebase(self.rebase_timeout)
+
     def _on_input_changed(self) -> None:
         """
         Handles changes in the input string text edit.
         Triggers rebase if real-time rebase is enabled and updates dynamic state.
         """
         if self.realtime_checkbox.isChecked():
-            self._perform_rebase()
+            self._perform_rebase(REALTIME_REBASE_TIMEOUT)
         self._handle_input_ds_dynamic_state()
 
     def _on_digit_set_changed(self) -> None:
@@ -334,7 +352,7 @@ class MainWindow(QMainWindow):
         Triggers rebase if real-time rebase is enabled and updates dynamic state.
         """
         if self.realtime_checkbox.isChecked():
-            self._perform_rebase()
+            self._perform_rebase(REALTIME_REBASE_TIMEOUT)
         self._handle_input_ds_dynamic_state()
 
     def _handle_input_ds_dynamic_state(self) -> None:
@@ -400,11 +418,15 @@ class MainWindow(QMainWindow):
                     self.input_digit_set_preset_combo.setCurrentIndex(0)
         return super().eventFilter(obj, event)
 
-    def _perform_rebase(self) -> None:
+    def _perform_rebase(self, timeout: float | None) -> None:
         """
         Performs the rebase operation based on the current input string,
         source digit set, and target digit set from the UI.
         Displays the rebased string or an error message in the status bar.
+
+        Args:
+            timeout: The time in seconds after which the rebase is cancelled,
+                     or `None` for no limit.
         """
         input_string: str = self.input_text_edit.toPlainText()
         input_digit_set_str: str | None = self.input_digit_set_text_edit.toPlainText()
@@ -440,11 +462,15 @@ class MainWindow(QMainWindow):
                 out_digit_set=output_digit_set_obj,
                 in_digit_set=input_digit_set_obj,
             )
-            rebased_string: str = rebaser.rebase(input_string)
+            rebased_string: str = rebaser.rebase(input_string, token=CancellationToken(timeout))
             self.output_text_edit.setText(rebased_string)
             self.status_bar.clearMessage()
+        except RebaseTimeoutError as exc:
+            error_message: str = f"Rebase cancelled: {exc}"
+            self.status_bar.showMessage(error_message)
+            print(error_message, file=sys.stderr)
         except ValueError as exc:
-            error_message: str = f"Error: {exc}"
+            error_message = f"Error: {exc}"
             self.status_bar.showMessage(error_message)
             print(error_message, file=sys.stderr)
         except IndexError as exc:
@@ -0,0 +1,272 @@
+"""
+This module implements block encodings such as Base32, Base64 and Base85.
+
+A block-mode digit set does not treat its input as one large positional
+number. Instead, the bytes are split into fixed-size groups (e.g., 3 bytes
+for Base64) and every group is encoded independently into a fixed number of
+characters (e.g., 4 for Base64). This takes linear time, needs constant memory
+and allows streaming and parallel processing of arbitrarily large inputs.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+from .models import BlockLayout, DigitSet
+
+
+def minimal_block_chars(base: int, block_size: int) -> int:
+    """
+    Returns the smallest number of characters able to represent a block of bytes.
+
+    Args:
+        base: The number of digits in the digit set.
+        block_size: The number of bytes per block.
+
+    Returns:
+        The smallest `n` with `base ** n >= 256 ** block_size`.
+
+    Examples:
+        >>> minimal_block_chars(64, 3)
+        4
+        >>> minimal_block_chars(85, 4)
+        5
+    """
+    if base < 2:
+        raise ValueError("Block digit sets must contain at least two distinct digits.")
+    block_chars = 1
+    while base**block_chars < 256**block_size:
+        block_chars += 1
+    return block_chars
+
+
+class BlockCodec:
+    """
+    Encodes bytes to text (and back) in fixed-size blocks using a digit set.
+
+    Full blocks of `block_size` bytes are read as big-endian integers and
+    written with exactly `block_chars` digits. A partial final block of `r`
+    bytes is zero-extended, encoded, and truncated to the fewest characters
+    that still identify it unambiguously; the remainder is filled with the
+    padding character, if any. With the standard alphabets this matches
+    RFC 4648 Base32/Base64 and Ascii85 (without the "z" abbreviation).
+    """
+
+    def __init__(self, digits: str, layout: BlockLayout) -> None:
+        if DigitSet.deduplicate_digits(digits) != digits:
+            raise ValueError("Block digit sets must not contain duplicate digits.")
+        if layout.block_size < 1:
+            raise ValueError("Block size must be greater than 0.")
+        if len(layout.padding) > 1:
+            raise ValueError("Padding must be a single character.")
+        if layout.padding and layout.padding in digits:
+            raise ValueError(f"Padding character '{layout.padding}' is also a digit.")
+        if layout.block_chars < minimal_block_chars(len(digits), layout.block_size):
+            raise ValueError(
+                f"{layout.block_chars} characters cannot represent {layout.block_size} bytes "
+                f"in base {len(digits)}."
+            )
+
+        self._layout = layout
+        self._digit_list = list(digits)
+        self._digit_map = {char: i for i, char in enumerate(digits)}
+        self._base = len(digits)
+        self._block_limit = 256**layout.block_size
+        self._powers = [self._base**i for i in reversed(range(layout.block_chars))]
+
+        # A partial final block of `size` bytes keeps the fewest leading characters
+        # whose dropped low-order digits cannot reach into the significant bytes:
+        # the smallest `chars` with base ** (block_chars - chars) <= 256 ** (block_size - size).
+        self._partial_chars: dict[int, int] = {}
+        for size in range(1, layout.block_size):
+            chars = layout.block_chars
+            dropped_limit = 256 ** (layout.block_size - size)
+            while chars > 1 and self._base ** (layout.block_chars - chars + 1) <= dropped_limit:
+                chars -= 1
+            self._partial_chars[size] = chars
+        self._partial_sizes = {chars: size for size, chars in self._partial_chars.items()}
+
+    @classmethod
+    def from_digit_set(cls, digit_set: DigitSet) -> Self:
+        """
+        Creates a codec for a block-mode digit set.
+
+        Args:
+            digit_set: A digit set whose `block` layout is set.
+
+        Returns:
+            A `BlockCodec` for the digit set.
+
+        Raises:
+            ValueError: If the digit set is not in block mode or its layout is invalid.
+        """
+        if digit_set.block is None:
+            raise ValueError(f"Digit set '{digit_set.name}' is not a block digit set.")
+        return cls(digit_set.digits, digit_set.block)
+
+    @property
+    def layout(self) -> BlockLayout:
+        """The block layout used by this codec."""
+        return self._layout
+
+    def _encode_block(self, block: bytes) -> str:
+        value = int.from_bytes(block, "big")
+        base = self._base
+        digit_list = self._digit_list
+        return "".join([digit_list[value // power % base] for power in self._powers])
+
+    def _encode_partial_block(self, block: bytes) -> str:
+        layout = self._layout
+        chars = self._partial_chars[len(block)]
+        encoded = self._encode_block(block.ljust(layout.block_size, b"\0"))[:chars]
+        return encoded + layout.padding * (layout.block_chars - chars)
+
+    def _decode_block(self, positions: list[int], size: int) -> bytes:
+        value = 0
+        for position in positions:
+            value = value * self._base + position
+        if value >= self._block_limit:
+            raise ValueError("Encoded block is out of range for the block size.")
+        return value.to_bytes(self._layout.block_size, "big")[:size]
+
+    def iter_encode(self, chunks: Iterable[bytes]) -> Iterator[str]:
+        """
+        Encodes a stream of byte chunks, yielding text for every chunk.
+
+        Bytes that do not fill a whole block are carried over to the next
+        chunk, so chunks may have any size.
+
+        Args:
+            chunks: The byte chunks to encode.
+
+        Yields:
+            The encoded text, one string per input chunk plus the final block.
+        """
+        encoder = IncrementalBlockEncoder(self)
+        for chunk in chunks:
+            yield encoder.feed(chunk)
+        if final := encoder.finish():
+            yield final
+
+    def iter_decode(self, chunks: Iterable[str]) -> Iterator[bytes]:
+        """
+        Decodes a stream of text chunks, yielding bytes for every chunk.
+
+        Characters outside the digit set (including padding and whitespace)
+        are ignored, consistent with positional rebasing.
+
+        Args:
+            chunks: The text chunks to decode.
+
+        Yields:
+            The decoded bytes, one value per input chunk plus the final block.
+
+        Raises:
+            ValueError: If a block is out of range or the final block has an
+                        impossible length.
+        """
+        decoder = IncrementalBlockDecoder(self)
+        for chunk in chunks:
+            yield decoder.feed(chunk)
+        if final := decoder.finish():
+            yield final
+
+    def encode(self, data: bytes) -> str:
+        """
+        Encodes bytes to text.
+
+        Examples:
+            >>> codec = BlockCodec("0123456789ABCDEF", BlockLayout(1, 2))
+            >>> codec.encode(b"hi")
+            '6869'
+        """
+        return "".join(self.iter_encode((data,)))
+
+    def decode(self, text: str) -> bytes:
+        """
+        Decodes text to bytes.
+
+        Examples:
+            >>> codec = BlockCodec("0123456789ABCDEF", BlockLayout(1, 2))
+            >>> codec.decode("6869")
+            b'hi'
+        """
+        return b"".join(self.iter_decode((text,)))
+
+
+class IncrementalBlockEncoder:
+    """
+    Encodes bytes fed in chunks of any size, like `codecs.IncrementalEncoder`.
+    """
+
+    def __init__(self, codec: BlockCodec) -> None:
+        self._codec = codec
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> str:
+        """Encodes the whole blocks available after adding `chunk`."""
+        codec = self._codec
+        block_size = codec.layout.block_size
+        data = self._pending + chunk if self._pending else chunk
+        full_length = len(data) - len(data) % block_size
+        self._pending = data[full_length:]
+        return "".join(
+            [
+                codec._encode_block(data[offset : offset + block_size])
+                for offset in range(0, full_length, block_size)
+            ]
+        )
+
+    def finish(self) -> str:
+        """Encodes the final, possibly partial, block."""
+        pending, self._pending = self._pending, b""
+        return self._codec._encode_partial_block(pending) if pending else ""
+
+
+class IncrementalBlockDecoder:
+    """
+    Decodes text fed in chunks of any size, like `codecs.IncrementalDecoder`.
+    """
+
+    def __init__(self, codec: BlockCodec) -> None:
+        self._codec = codec
+        self._pending: list[int] = []
+
+    def feed(self, chunk: str) -> bytes:
+        """
+        Decodes the whole blocks available after adding `chunk`.
+
+        Raises:
+            ValueError: If a block is out of range.
+        """
+        codec = self._codec
+        block_chars = codec.layout.block_chars
+        block_size = codec.layout.block_size
+        digit_map = codec._digit_map
+        pending = self._pending
+        pending.extend([digit_map[char] for char in chunk if char in digit_map])
+        full_length = len(pending) - len(pending) % block_chars
+        decoded = b"".join(
+            [
+                codec._decode_block(pending[offset : offset + block_chars], block_size)
+                for offset in range(0, full_length, block_chars)
+            ]
+        )
+        del pending[:full_length]
+        return decoded
+
+    def finish(self) -> bytes:
+        """
+        Decodes the final, possibly partial, block.
+
+        Raises:
+            ValueError: If the final block has an impossible length or is out of range.
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return b""
+        codec = self._codec
+        size = codec._partial_sizes.get(len(pending))
+        if size is None:
+            raise ValueError(f"Invalid final block length of {len(pending)} characters.")
+        pending.extend([codec._base - 1] * (codec.layout.block_chars - len(pending)))
+        return codec._decode_block(pending, size)
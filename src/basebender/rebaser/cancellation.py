@@ -0,0 +1,76 @@
+"""
+This module provides deadlines and cancellation for long-running conversions.
+
+A `CancellationToken` is passed to `DigitSetRebaser.rebase` (or `arebase`)
+and checked at every chunk boundary of the conversion engines. Once its
+deadline has passed or it has been cancelled (possibly from another thread),
+the conversion stops with a `RebaseTimeoutError`.
+"""
+
+import time
+
+
+class RebaseTimeoutError(TimeoutError):
+    """Raised when a conversion passes its deadline or is cancelled."""
+
+
+class CancellationToken:
+    """
+    A deadline and cancellation flag checked while a conversion runs.
+
+    Examples:
+        >>> token = CancellationToken()
+        >>> token.cancel()
+        >>> token.check()
+        Traceback (most recent call last):
+        ...
+        basebender.rebaser.cancellation.RebaseTimeoutError: The rebase was cancelled.
+    """
+
+    def __init__(self, timeout: float | None = None) -> None:
+        """
+        Args:
+            timeout: The time in seconds, from now, after which the conversion
+                     is stopped. `None` means no deadline.
+        """
+        self._timeout = timeout
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._cancel_reason: str | None = None
+
+    @property
+    def deadline(self) -> float | None:
+        """The deadline as a `time.monotonic()` value, or `None`."""
+        return self._deadline
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether `cancel` has been called."""
+        return self._cancel_reason is not None
+
+    def remaining(self) -> float | None:
+        """Returns the seconds left until the deadline (at least 0), or `None`."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = "The rebase was cancelled.") -> None:
+        """
+        Cancels the conversion at its next chunk boundary.
+
+        Args:
+            reason: The message of the resulting `RebaseTimeoutError`.
+        """
+        if self._cancel_reason is None:
+            self._cancel_reason = reason
+
+    def check(self) -> None:
+        """
+        Raises if the conversion must stop.
+
+        Raises:
+            RebaseTimeoutError: If the token was cancelled or its deadline has passed.
+        """
+        if self._cancel_reason is not None:
+            raise RebaseTimeoutError(self._cancel_reason)
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise RebaseTimeoutError(f"The rebase exceeded its time limit of {self._timeout:g} s.")
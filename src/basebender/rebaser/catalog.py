@@ -0,0 +1,317 @@
+"""
+This module holds the digit-set catalog and reloads it when its configuration
+files change, so long-lived processes (API workers, the GUI) pick up edits
+without a restart.
+
+The catalog is an immutable `CatalogSnapshot` of the digit sets and a version
+number, replaced as a whole when the files change, so a reader always sees
+one consistent catalog. Changes to the package, system and user files are
+noticed by comparing their modification times and sizes: lazily when the
+catalog is read (at most every `poll_interval` seconds), or by a watcher
+thread that wakes on inotify events on Linux and polls elsewhere. Values
+derived from the catalog are rebuilt when its version changes; see
+`CatalogDerived`.
+"""
+
+import ctypes
+import ctypes.util
+import functools
+import itertools
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .catalog_cache import FileSignature, file_signature
+from .config_loader import _get_config_paths, get_all_digit_sets
+from .models import DigitSet
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the configuration files.
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify events of a watched directory that may change a configuration file.
+_IN_MODIFY = 0x2
+_IN_ATTRIB = 0x4
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_EVENTS = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+
+# Catalog versions are unique across catalogs, so a value derived from one
+# catalog is never taken for a value of another.
+_VERSIONS = itertools.count(1)
+
+
+def _config_file_paths() -> list[Path | None]:
+    """Returns the package, system and user digit-set files."""
+    package_path, system_path, user_path, _ = _get_config_paths()
+    return [package_path, system_path, user_path]
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    One version of the digit-set catalog.
+
+    Attributes:
+        version: A number that changes whenever the digit sets change.
+        digit_sets: The digit sets by ID (must not be modified).
+        signature: The `file_signature` of the files it was loaded from.
+    """
+
+    version: int
+    digit_sets: Mapping[str, DigitSet]
+    signature: FileSignature
+
+
+class DigitSetCatalog:
+    """
+    The digit sets of the configuration files, reloaded when they change.
+
+    Examples:
+        >>> catalog = DigitSetCatalog(lambda: {}, lambda: [], poll_interval=0)
+        >>> catalog.digit_sets(), catalog.reload()
+        ({}, False)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Mapping[str, DigitSet]] = get_all_digit_sets,
+        paths: Callable[[], Iterable[Path | None]] = _config_file_paths,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            loader: Loads the digit sets from the files.
+            paths: Returns the files the digit sets are loaded from.
+            poll_interval: Seconds between checks of the files when the
+                           catalog is read; 0 disables these checks.
+        """
+        self._loader = loader
+        self._paths = paths
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+        self._next_check = 0.0
+        self._watcher: threading.Thread | None = None
+        self._stop_watching = threading.Event()
+        self._wake_write = -1
+
+    @property
+    def poll_interval(self) -> float:
+        """Seconds between checks of the files; 0 disables the checks on reads."""
+        return self._poll_interval
+
+    @poll_interval.setter
+    def poll_interval(self, value: float) -> None:
+        self._poll_interval = value
+        self._next_check = 0.0
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        Returns the current catalog, loading it on first use.
+
+        Unless a watcher thread runs, the files are checked for changes if
+        the last check is more than `poll_interval` seconds ago.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self._load()
+        if (
+            self._watcher is None
+            and self._poll_interval > 0
+            and time.monotonic() >= self._next_check
+        ):
+            self.check()
+            return self._snapshot or snapshot
+        return snapshot
+
+    def digit_sets(self) -> Mapping[str, DigitSet]:
+        """Returns the digit sets of the current catalog by ID."""
+        return self.snapshot().digit_sets
+
+    @property
+    def version(self) -> int:
+        """The version of the current catalog."""
+        return self.snapshot().version
+
+    def check(self) -> bool:
+        """
+        Reloads the catalog if its files have changed since it was loaded.
+
+        Returns:
+            Whether the digit sets changed.
+        """
+        self._next_check = time.monotonic() + self._poll_interval
+        snapshot = self._snapshot
+        if snapshot is not None and file_signature(self._paths()) == snapshot.signature:
+            return False
+        return self.reload()
+
+    def reload(self) -> bool:
+        """
+        Loads the digit sets from the files and swaps them in if they differ
+        from the current ones, with a new version.
+
+        Returns:
+            Whether the digit sets changed.
+        """
+        current = self._snapshot
+        return current is None or self._load().version != current.version
+
+    def _load(self) -> CatalogSnapshot:
+        """Loads the digit sets, keeping the current version if they are unchanged."""
+        with self._lock:
+            self._next_check = time.monotonic() + self._poll_interval
+            signature = file_signature(self._paths())
+            digit_sets = self._loader()
+            current = self._snapshot
+            if current is not None and digit_sets == current.digit_sets:
+                snapshot = self._snapshot = replace(current, signature=signature)
+                return snapshot
+            snapshot = self._snapshot = CatalogSnapshot(next(_VERSIONS), digit_sets, signature)
+        if current is not None:
+            logger.info("Reloaded the digit-set catalog (%d digit sets).", len(digit_sets))
+        return snapshot
+
+    def watch(self, interval: float | None = None) -> None:
+        """
+        Starts a daemon thread that reloads the catalog when its files
+        change.
+
+        On Linux the thread wakes on inotify events of the files'
+        directories; it also checks the files every `interval` seconds
+        (default: `poll_interval`), e.g., for directories created later.
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        # Written to by `stop_watching` to wake the thread from `select`.
+        wake_read, self._wake_write = os.pipe()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval or self._poll_interval or DEFAULT_POLL_INTERVAL, wake_read),
+            name="basebender-catalog-watch",
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stops the watcher thread, if any, and waits for it to end."""
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            self._stop_watching.set()
+            os.write(self._wake_write, b"\0")
+            watcher.join()
+            os.close(self._wake_write)
+
+    def _watch(self, interval: float, wake_read: int) -> None:
+        directories = {path.parent for path in self._paths() if path is not None}
+        inotify_fd = _inotify_fd(directories)
+        try:
+            while not self._stop_watching.is_set():
+                if inotify_fd is None:
+                    self._stop_watching.wait(interval)
+                elif inotify_fd in select.select([inotify_fd, wake_read], [], [], interval)[0]:
+                    _drain(inotify_fd)
+                if not self._stop_watching.is_set():
+                    try:
+                        self.check()
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        # A failing reload must not end the watcher.
+                        logger.exception("Could not reload the digit-set catalog.")
+        finally:
+            os.close(wake_read)
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+
+def _inotify_fd(directories: Iterable[Path]) -> int | None:
+    """
+    Returns an inotify file descriptor watching the existing `directories`,
+    or `None` if inotify is not available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        inotify_fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except OSError, AttributeError:
+        return None
+    if inotify_fd < 0:
+        return None
+    for directory in directories:
+        if directory.is_dir():
+            libc.inotify_add_watch(inotify_fd, os.fsencode(directory), _IN_EVENTS)
+    return inotify_fd
+
+
+def _drain(inotify_fd: int) -> None:
+    """Reads the pending events; only their arrival matters."""
+    try:
+        while os.read(inotify_fd, 65536):
+            pass
+    except BlockingIOError:
+        pass
+
+
+@functools.cache
+def get_catalog() -> DigitSetCatalog:
+    """Returns the catalog of the predefined digit sets of this process."""
+    return DigitSetCatalog()
+
+
+class CatalogDerived[T]:
+    """
+    A value computed from the catalog, rebuilt when the catalog version
+    changes.
+
+    Examples:
+        >>> catalog = DigitSetCatalog(lambda: {}, lambda: [], poll_interval=0)
+        >>> count = CatalogDerived(lambda snapshot: len(snapshot.digit_sets), catalog)
+        >>> count.get()
+        0
+    """
+
+    def __init__(
+        self,
+        build: Callable[[CatalogSnapshot], T],
+        catalog: DigitSetCatalog | None = None,
+    ) -> None:
+        """
+        Args:
+            build: Computes the value from a catalog snapshot.
+            catalog: The catalog (default: `get_catalog()`).
+        """
+        self._build = build
+        self._catalog = catalog
+        self._lock = threading.Lock()
+        self._entry: tuple[int, T] | None = None
+
+    def get(self) -> T:
+        """Returns the value for the current catalog, building it if needed."""
+        snapshot = (self._catalog or get_catalog()).snapshot()
+        entry = self._entry
+        if entry is not None and entry[0] == snapshot.version:
+            return entry[1]
+        with self._lock:
+            if self._entry is None or self._entry[0] != snapshot.version:
+                self._entry = (snapshot.version, self._build(snapshot))
+            return self._entry[1]
@@ -0,0 +1,309 @@
+"""
+This module stores the digit-set catalog as compiled snapshots, so short-lived
+processes such as CLI invocations skip parsing and validating the TOML
+configuration files.
+
+Block layouts are stored as computed, so loading a snapshot needs neither the
+`toml` package nor the block codec. There are two kinds:
+
+- The package snapshot holds the package defaults as a `marshal` dump. It is
+  built at install time by `bin/generate_resources.py` into the `generated/`
+  directory and is valid while the SHA-256 digest of the package TOML file
+  matches (its modification time changes when the package is installed).
+- The user snapshot holds the merged catalog of all tiers. It lives in the
+  user cache directory and is valid while the paths, modification times and
+  sizes of the files it was built from are unchanged. It is rewritten
+  whenever the TOML files had to be parsed.
+
+The user snapshot is indexed: a header, a `marshal` index of the IDs, names,
+sources, block layouts and digit offsets (counted from the end of the
+index), then the digits of all sets as UTF-8. Only the index is read into
+memory; the file is memory-mapped and the digits of a set are decoded when it
+is looked up (see `IndexedDigitSets`), so memory and load time stay flat for
+catalogs of thousands of digit sets.
+
+Missing, stale or unreadable snapshots are ignored and the TOML files are
+parsed instead.
+"""
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+import platformdirs
+
+from .models import BlockLayout, DigitSet
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the layout of the snapshots changes.
+SNAPSHOT_FORMAT = 2
+
+PACKAGE_SNAPSHOT_PATH = Path(__file__).parent / "generated" / "default_digit_sets.marshal"
+
+# The marshal format may change between Python versions.
+USER_SNAPSHOT_NAME = f"digit_sets.{sys.implementation.cache_tag}.marshal"
+
+type FileSignature = tuple[tuple[str, int, int] | None, ...]
+type DigitSetRecord = tuple[str, str, str, tuple[int, int, str] | None]
+# The name, source, block layout and the start and end of the digits of an
+# indexed digit set.
+type IndexEntry = tuple[str, str, BlockLayout | None, int, int]
+
+# The header of the user snapshot: a magic number and the index length.
+_INDEX_HEADER = struct.Struct(">4sI")
+_INDEX_MAGIC = b"BBDS"
+
+
+def file_signature(paths: Iterable[Path | None]) -> FileSignature:
+    """
+    Returns the modification time and size of every file, or `None` for
+    missing files, to detect changes without reading them.
+    """
+    signature: list[tuple[str, int, int] | None] = []
+    for path in paths:
+        try:
+            stat = path.stat() if path is not None else None
+        except OSError:
+            stat = None
+        signature.append(None if stat is None else (str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def cache_dir() -> Path | None:
+    """
+    Returns the directory of the user snapshot: `BASEBENDER_CACHE_DIR` if it
+    is set (an empty value disables the user snapshot), otherwise the user
+    cache directory of the platform (e.g., `~/.cache/basebender`).
+    """
+    configured = os.environ.get("BASEBENDER_CACHE_DIR")
+    if configured is not None:
+        return Path(configured) if configured else None
+    return Path(platformdirs.user_cache_dir("basebender"))
+
+
+def _to_record(digit_set: DigitSet) -> DigitSetRecord:
+    block = digit_set.block
+    return (
+        digit_set.name,
+        digit_set.digits,
+        digit_set.source,
+        None if block is None else (block.block_size, block.block_chars, block.padding),
+    )
+
+
+def _from_record(record: DigitSetRecord) -> DigitSet:
+    name, digits, source, block = record
+    return DigitSet(name, digits, source, None if block is None else BlockLayout(*block))
+
+
+def _read(path: Path) -> dict[str, Any] | None:
+    """Reads a snapshot, or returns `None` if it is missing or not readable."""
+    try:
+        with open(path, "rb") as file_ptr:
+            data = marshal.load(file_ptr)
+    except OSError, EOFError, ValueError, TypeError:
+        return None
+    if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+        return None
+    return data
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Writes a snapshot atomically, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".snapshot-", delete=False) as temp:
+        try:
+            temp.write(content)
+            temp.close()
+            os.replace(temp.name, path)
+        except BaseException:
+            os.unlink(temp.name)
+            raise
+
+
+def file_digest(path: Path) -> str | None:
+    """Returns the SHA-256 digest of a file, or `None` if it cannot be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_package_snapshot(
+    package_path: Path, snapshot_path: Path = PACKAGE_SNAPSHOT_PATH
+) -> list[DigitSet] | None:
+    """
+    Loads the package digit sets from the package snapshot.
+
+    Args:
+        package_path: The package TOML file the snapshot must match.
+        snapshot_path: The package snapshot.
+
+    Returns:
+        The digit sets in file order, or `None` if there is no valid snapshot.
+    """
+    data = _read(snapshot_path)
+    if data is None or data.get("digest") != file_digest(package_path):
+        return None
+    try:
+        return [_from_record(record) for record in data["digit_sets"]]
+    except KeyError, TypeError, ValueError:
+        return None
+
+
+def write_package_snapshot(
+    package_path: Path, digit_sets: list[DigitSet], snapshot_path: Path = PACKAGE_SNAPSHOT_PATH
+) -> None:
+    """
+    Writes the package snapshot of the digit sets parsed from `package_path`.
+
+    Raises:
+        OSError: If the snapshot cannot be written.
+    """
+    data = {
+        "format": SNAPSHOT_FORMAT,
+        "digest": file_digest(package_path),
+        "digit_sets": [_to_record(digit_set) for digit_set in digit_sets],
+    }
+    write_atomic(snapshot_path, marshal.dumps(data))
+
+
+class IndexedDigitSets(Mapping[str, DigitSet]):
+    """
+    Digit sets by ID, read from an indexed user snapshot.
+
+    The IDs, names, sources and block layouts are held in memory, so
+    iterating over the IDs or testing membership reads no digits; the digits
+    of a set are decoded from the memory-mapped file when it is looked up.
+    The mapping is read-only, like the catalog it holds.
+    """
+
+    def __init__(self, entries: dict[str, IndexEntry], data: mmap.mmap | bytes, digest: str):
+        """
+        Args:
+            entries: The index entries by ID, in catalog order.
+            data: The snapshot; entry offsets are positions in it.
+            digest: The SHA-256 digest of the digits of all sets, used to
+                    compare catalogs without reading them.
+        """
+        self._entries = entries
+        self._data = data
+        self._digest = digest
+
+    def __getitem__(self, digit_set_id: str) -> DigitSet:
+        name, source, block, start, end = self._entries[digit_set_id]
+        return DigitSet(name, str(self._data[start:end], "utf-8"), source, block)
+
+    def __contains__(self, digit_set_id: object) -> bool:
+        return digit_set_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndexedDigitSets):
+            return self._digest == other._digest and self._entries == other._entries
+        return super().__eq__(other)
+
+    # Unhashable, like `dict`.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"<IndexedDigitSets of {len(self._entries)} digit sets>"
+
+
+def load_user_snapshot(signature: FileSignature) -> IndexedDigitSets | None:
+    """
+    Loads the merged catalog from the user snapshot.
+
+    Args:
+        signature: The current `file_signature` of the configuration files.
+
+    Returns:
+        The digit sets by ID, or `None` if there is no snapshot for these
+        files in their current state.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return None
+    try:
+        with open(directory / USER_SNAPSHOT_NAME, "rb") as file_ptr:
+            magic, index_length = _INDEX_HEADER.unpack(file_ptr.read(_INDEX_HEADER.size))
+            if magic != _INDEX_MAGIC:
+                return None
+            index = marshal.loads(file_ptr.read(index_length))
+            if (
+                not isinstance(index, dict)
+                or index.get("format") != SNAPSHOT_FORMAT
+                or index.get("sources") != signature
+            ):
+                return None
+            data = mmap.mmap(file_ptr.fileno(), 0, access=mmap.ACCESS_READ)
+        # The digit offsets of the index count from the end of the index.
+        base = _INDEX_HEADER.size + index_length
+        if len(data) != base + index["digits_length"]:
+            return None
+        entries = {
+            digit_set_id: (
+                name,
+                source,
+                None if block is None else BlockLayout(*block),
+                base + start,
+                base + end,
+            )
+            for digit_set_id, name, source, block, start, end in index["entries"]
+        }
+        return IndexedDigitSets(entries, data, index["digest"])
+    except OSError, EOFError, ValueError, TypeError, KeyError, struct.error:
+        return None
+
+
+def _index_snapshot(signature: FileSignature, digit_sets: Mapping[str, DigitSet]) -> bytes:
+    """Builds an indexed user snapshot; see the module docstring for the layout."""
+    records = []
+    digits = bytearray()
+    for digit_set_id, digit_set in digit_sets.items():
+        name, encoded, source, block = _to_record(digit_set)
+        start = len(digits)
+        digits += encoded.encode("utf-8")
+        records.append((digit_set_id, name, source, block, start, len(digits)))
+    index = marshal.dumps(
+        {
+            "format": SNAPSHOT_FORMAT,
+            "sources": signature,
+            "digest": hashlib.sha256(digits).hexdigest(),
+            "digits_length": len(digits),
+            "entries": records,
+        }
+    )
+    return _INDEX_HEADER.pack(_INDEX_MAGIC, len(index)) + index + digits
+
+
+def save_user_snapshot(signature: FileSignature, digit_sets: Mapping[str, DigitSet]) -> None:
+    """
+    Writes the merged catalog to the user snapshot; failures are logged and
+    otherwise ignored, as the snapshot is only a cache.
+
+    Args:
+        signature: The `file_signature` of the files the catalog was loaded from.
+        digit_sets: The digit sets by ID.
+    """
+    directory = cache_dir()
+    if directory is None:
+        return
+    try:
+        write_atomic(directory / USER_SNAPSHOT_NAME, _index_snapshot(signature, digit_sets))
+    except OSError as exc:
+        logger.debug("Could not write the digit-set snapshot to %s: %s", directory, exc)
@@ -0,0 +1,372 @@
+"""
+This module compiles rebasers for a fixed pair of positional digit sets into
+specialized Python functions, in the spirit of `re.compile`.
+
+The generated source bakes the bases, chunk sizes, translate tables, digit
+pair tables and an unrolled chunk rendering loop in as constants, so the hot
+path avoids the per-call setup and dictionary lookups of the generic engines.
+Compiled functions are cached per digit-set pair, within a memory budget
+(see `CompiledCache`).
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .engines import (
+    parse_divide_and_conquer,
+    power_of_two_exponent,
+    render_divide_and_conquer,
+    run_steps,
+)
+from .models import DigitSet
+
+# Values wider than this are rendered by divide and conquer instead of the
+# unrolled chunk loop, whose cost grows quadratically.
+COMPILED_DIVIDE_AND_CONQUER_BITS = 16384
+
+# The memory budget of a cache of compiled rebasers, in bytes.
+COMPILED_CACHE_BYTES = 64 << 20
+
+# The memory budget of each lookup table of a compiled pair, in bytes. Tables
+# are sized to fit it rather than by entry count, so compiling stays fast and
+# small for any bases and digit widths.
+COMPILED_TABLE_BYTES = 1 << 20
+
+_NATIVE_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_NATIVE_FORMATS = {2: "b", 8: "o", 10: "d", 16: "x"}
+_WORD_LIMIT = 1 << 60
+
+# Approximate memory per entry of a dict (hash slot and entry) and a tuple,
+# besides the key and value objects.
+_DICT_ENTRY_BYTES = 40
+_TUPLE_ENTRY_BYTES = 8
+
+# Approximate memory of a compiled function (code object, function and
+# namespace) besides its tables, also charged for cached failures.
+_FUNCTION_BYTES = 2048
+
+
+@dataclass(frozen=True)
+class CompiledRebaser:
+    """
+    A rebase function specialized for one pair of positional digit sets.
+
+    Calling the object rebases a string exactly like `DigitSetRebaser.rebase`
+    with the same explicit input and output digit sets. For the lowest
+    overhead, call `function` directly.
+
+    Attributes:
+        input_digits: The deduplicated input digits.
+        output_digits: The deduplicated output digits.
+        source: The generated Python source of `function`.
+        function: The generated rebase function.
+        table_bytes: The approximate memory of the lookup tables and other
+            constants of `function`.
+    """
+
+    input_digits: str
+    output_digits: str
+    source: str
+    function: Callable[[str], str]
+    table_bytes: int = 0
+
+    def __call__(self, input_string: str) -> str:
+        return self.function(input_string)
+
+
+class CompiledCache[K]:
+    """
+    A least-recently-used cache of compiled rebasers, bounded by their
+    memory (`CompiledRebaser.table_bytes`) rather than by their number.
+
+    `None` can be cached for keys that cannot be compiled.
+
+    Examples:
+        >>> cache = CompiledCache[str](max_bytes=1 << 20)
+        >>> cache.put("pair", None)
+        >>> cache.lookup("pair"), cache.lookup("other")
+        ((True, None), (False, None))
+    """
+
+    def __init__(self, max_bytes: int = COMPILED_CACHE_BYTES) -> None:
+        """
+        Args:
+            max_bytes: The memory budget; the least recently used entries
+                       are dropped when it is exceeded.
+        """
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[K, CompiledRebaser | None] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _entry_bytes(compiled: CompiledRebaser | None) -> int:
+        return _FUNCTION_BYTES + (0 if compiled is None else compiled.table_bytes)
+
+    def lookup(self, key: K) -> tuple[bool, CompiledRebaser | None]:
+        """
+        Looks up the compiled rebaser of `key`.
+
+        Returns:
+            `(True, compiled)` if `key` is cached (`compiled` may be `None`),
+            otherwise `(False, None)`.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+
+    def put(self, key: K, compiled: CompiledRebaser | None) -> None:
+        """Caches the compiled rebaser of `key`, dropping old entries to fit the budget."""
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entry_bytes(self._entries.pop(key))
+            self._entries[key] = compiled
+            self._bytes += self._entry_bytes(compiled)
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._entry_bytes(evicted)
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate memory of the cached entries."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drops all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _largest_power(base: int, limit: int) -> tuple[int, int]:
+    """Returns `(k, base ** k)` for the largest `k >= 1` with `base ** k <= limit`."""
+    exponent = 1
+    while base ** (exponent + 1) <= limit:
+        exponent += 1
+    return exponent, base**exponent
+
+
+def _namespace_bytes(namespace: dict[str, Any]) -> int:
+    """Returns the approximate memory of the tables of a generated namespace."""
+    total = 0
+    for name, value in namespace.items():
+        # Dicts are counted by their keys, whose values are small integers.
+        if not name.startswith("__") and isinstance(value, (tuple, list, frozenset, dict)):
+            total += sys.getsizeof(value) + sum(map(sys.getsizeof, value))
+    return total
+
+
+def _string_bytes(digits: str, length: int) -> int:
+    """Returns the memory of a string of `length` characters of `digits`."""
+    return sys.getsizeof(max(digits) * length)
+
+
+def _pair_table_fits(input_digits: str) -> bool:
+    """Whether the digit-pair table of `input_digits` fits `COMPILED_TABLE_BYTES`."""
+    base = len(input_digits)
+    entry_bytes = _string_bytes(input_digits, 2) + sys.getsizeof(base * base) + _DICT_ENTRY_BYTES
+    return base * base * entry_bytes <= COMPILED_TABLE_BYTES
+
+
+def _chunk_size(output_digits: str) -> int:
+    """
+    Returns the number of digits per entry of the chunk table: the most whose
+    table of `base ** digits` strings fits `COMPILED_TABLE_BYTES`, at least 1.
+    """
+    base = len(output_digits)
+    digits = 1
+    while (
+        base ** (digits + 1) * (_string_bytes(output_digits, digits + 1) + _TUPLE_ENTRY_BYTES)
+        <= COMPILED_TABLE_BYTES
+    ):
+        digits += 1
+    return digits
+
+
+def _parse_source(input_digits: str, namespace: dict[str, Any]) -> list[str]:
+    base = len(input_digits)
+    namespace["_INPUT_MAP"] = {char: i for i, char in enumerate(input_digits)}
+    if base <= len(_NATIVE_DIGITS):
+        namespace["_INPUT_TABLE"] = str.maketrans(input_digits, _NATIVE_DIGITS[:base])
+        limit = sys.get_int_max_str_digits()
+        native = [f"        value = int(input_string.translate(_INPUT_TABLE), {base})"]
+        if power_of_two_exponent(base) is not None or not limit:
+            return [line.replace("        ", "    ", 1) for line in native]
+        return [
+            f"    if len(input_string) <= {limit}:",
+            *native,
+            "    else:",
+            "        positions = [_INPUT_MAP[char] for char in input_string]",
+            f"        value = _run_steps(_parse_large(positions, {base}))",
+        ]
+
+    if not _pair_table_fits(input_digits):
+        # The pair table of large bases would be too big to build quickly.
+        return [
+            "    positions = [_INPUT_MAP[char] for char in input_string]",
+            f"    value = _run_steps(_parse_large(positions, {base}))",
+        ]
+
+    # Bases above 36: look up two digits at a time and parse in base ** 2.
+    namespace["_PAIRS"] = {
+        high + low: base * high_value + low_value
+        for high_value, high in enumerate(input_digits)
+        for low_value, low in enumerate(input_digits)
+    }
+    return [
+        "    head = len(input_string) % 2",
+        "    positions = [_INPUT_MAP[input_string[0]]] if head else []",
+        "    positions += [",
+        "        _PAIRS[input_string[index : index + 2]]",
+        "        for index in range(head, len(input_string), 2)",
+        "    ]",
+        f"    value = _run_steps(_parse_large(positions, {base * base}))",
+    ]
+
+
+def _render_source(output_digits: str, namespace: dict[str, Any]) -> list[str]:
+    base = len(output_digits)
+    namespace["_OUTPUT_LIST"] = list(output_digits)
+    large = [
+        f"    if value.bit_length() > {COMPILED_DIVIDE_AND_CONQUER_BITS}:",
+        "        return _run_steps(_render_large(value, _OUTPUT_LIST))",
+    ]
+    if base in _NATIVE_FORMATS:
+        namespace["_OUTPUT_TABLE"] = str.maketrans(_NATIVE_DIGITS[:base], output_digits)
+        native = f'    return format(value, "{_NATIVE_FORMATS[base]}").translate(_OUTPUT_TABLE)'
+        if base != 10 or not sys.get_int_max_str_digits():
+            return [native]
+        # Decimal rendering is bound by the integer string conversion limit.
+        return [*large, native]
+
+    chunk_digits = _chunk_size(output_digits)
+    chunk_base = base**chunk_digits
+    chunks_per_word, word_base = _largest_power(chunk_base, _WORD_LIMIT)
+    # Extending every chunk by every digit keeps them in the order of their values.
+    chunks = [""]
+    for _ in range(chunk_digits):
+        chunks = [chunk + digit for chunk in chunks for digit in output_digits]
+    namespace["_CHUNKS"] = tuple(chunks)
+    lines = [
+        *large,
+        "    parts = []",
+        "    while value:",
+        f"        value, word = divmod(value, {word_base})",
+    ]
+    for index in range(chunks_per_word - 1):
+        lines.append(f"        word, chunk_{index} = divmod(word, {chunk_base})")
+    lines.append(f"        chunk_{chunks_per_word - 1} = word")
+    joined = " + ".join(f"_CHUNKS[chunk_{i}]" for i in reversed(range(chunks_per_word)))
+    lines += [
+        f"        parts.append({joined})",
+        "    parts.reverse()",
+        f'    return "".join(parts).lstrip({output_digits[0]!r})',
+    ]
+    return lines
+
+
+def generate_source(input_digits: str, output_digits: str) -> tuple[str, dict[str, Any]]:
+    """
+    Generates the source of a specialized rebase function.
+
+    Args:
+        input_digits: The deduplicated input digits (at least two).
+        output_digits: The deduplicated output digits (at least two).
+
+    Returns:
+        A tuple of the generated source and the namespace of constants it uses.
+    """
+    namespace: dict[str, Any] = {
+        "_INPUT_DIGITS": frozenset(input_digits),
+        "_run_steps": run_steps,
+        "_parse_large": parse_divide_and_conquer,
+        "_render_large": render_divide_and_conquer,
+    }
+    zero = output_digits[0]
+    lines = [
+        "def compiled_rebase(input_string):",
+        "    if not _INPUT_DIGITS.issuperset(input_string):",
+        '        input_string = "".join([char for char in input_string if char in _INPUT_DIGITS])',
+        "    if not input_string:",
+        f"        return {zero!r}",
+        *_parse_source(input_digits, namespace),
+        "    if not value:",
+        f"        return {zero!r}",
+        *_render_source(output_digits, namespace),
+    ]
+    return "\n".join(lines) + "\n", namespace
+
+
+def compile_digit_set_pair(input_digits: str, output_digits: str) -> CompiledRebaser:
+    """
+    Compiles (or returns the cached) rebase function for a pair of digit strings.
+
+    Degenerate digit sets compile to constant functions with the same results
+    as `DigitSetRebaser.rebase`.
+
+    Args:
+        input_digits: The input digits; duplicates are removed.
+        output_digits: The output digits; duplicates are removed.
+
+    Returns:
+        The `CompiledRebaser` for the pair.
+    """
+    key = (DigitSet.deduplicate_digits(input_digits), DigitSet.deduplicate_digits(output_digits))
+    _, compiled = _CACHE.lookup(key)
+    if compiled is None:
+        compiled = _compile_pair(*key)
+        _CACHE.put(key, compiled)
+    return compiled
+
+
+_CACHE = CompiledCache[tuple[str, str]]()
+
+
+def _compile_pair(input_digits: str, output_digits: str) -> CompiledRebaser:
+    if len(input_digits) <= 1:
+        source = f"def compiled_rebase(input_string):\n    return {output_digits[:1]!r}\n"
+        namespace: dict[str, Any] = {}
+    elif len(output_digits) <= 1:
+        # A single-digit output renders only the empty input (as zero).
+        source = (
+            "def compiled_rebase(input_string):\n"
+            f"    return '' if input_string else {output_digits[:1]!r}\n"
+        )
+        namespace = {}
+    else:
+        source, namespace = generate_source(input_digits, output_digits)
+
+    code = compile(
+        source, f"<basebender compiled {len(input_digits)}->{len(output_digits)}>", "exec"
+    )
+    exec(code, namespace)  # pylint: disable=exec-used
+    return CompiledRebaser(
+        input_digits=input_digits,
+        output_digits=output_digits,
+        source=source,
+        function=namespace["compiled_rebase"],
+        table_bytes=_namespace_bytes(namespace) + sys.getsizeof(source),
+    )
+
+
+def compiled_cache_stats() -> tuple[int, int]:
+    """Returns the hit and miss counts of the compiled function cache."""
+    return _CACHE.hits, _CACHE.misses
+
+
+def clear_compiled_cache() -> None:
+    """Discards all cached compiled rebase functions."""
+    _CACHE.clear()
@@ -10,12 +10,17 @@ and manage the application's UI state.
 import importlib.resources
 import logging
 import os
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, cast
 
-import toml
-
-from .models import DigitSet
+from .catalog_cache import (
+    file_signature,
+    load_package_snapshot,
+    load_user_snapshot,
+    save_user_snapshot,
+)
+from .models import BLOCK_MODE, POSITIONAL_MODE, BlockLayout, DigitSet
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +82,46 @@ def _get_config_paths() -> tuple[Path, Path | None, Path | None, Path | None]:
     )
 
 
+def _parse_block_layout(digit_set_entry: dict[str, Any], digits: str) -> BlockLayout:
+    """
+    Builds and validates the block layout of a `mode = "block"` digit set entry.
+
+    The entry must define `block_size` (bytes per block). `block_chars`
+    defaults to the fewest characters able to hold a block and `padding`
+    defaults to no padding.
+
+    Args:
+        digit_set_entry: The raw TOML table of the digit set.
+        digits: The digits of the digit set.
+
+    Returns:
+        The validated `BlockLayout`.
+
+    Raises:
+        ValueError: If the block settings are missing or invalid.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from .block_codec import BlockCodec, minimal_block_chars
+
+    block_size = digit_set_entry.get("block_size")
+    if not isinstance(block_size, int) or isinstance(block_size, bool) or block_size < 1:
+        raise ValueError("'block_size' must be a positive integer")
+
+    block_chars = digit_set_entry.get("block_chars")
+    if block_chars is None:
+        block_chars = minimal_block_chars(len(digits), block_size)
+    elif not isinstance(block_chars, int) or isinstance(block_chars, bool):
+        raise ValueError("'block_chars' must be an integer")
+
+    padding = digit_set_entry.get("padding", "")
+    if not isinstance(padding, str):
+        raise ValueError("'padding' must be a string")
+
+    layout = BlockLayout(block_size=block_size, block_chars=block_chars, padding=padding)
+    BlockCodec(digits, layout)  # Validates the combination of digits and layout
+    return layout
+
+
 def load_digit_sets_from_toml(filepath: Path, source_type: str) -> list[DigitSet]:
     """
     Loads digit sets from a TOML file, associating them with a given source type.
@@ -90,6 +135,9 @@ def load_digit_sets_from_toml(filepath: Path, source_type: str) -> list[DigitSet
         A list of `DigitSet` objects loaded from the file. Returns an empty list
         if the file is not found, is malformed, or contains invalid entries.
     """
+    # Imported here, as a valid snapshot (see `catalog_cache`) needs no parsing.
+    import toml  # pylint: disable=import-outside-toplevel
+
     loaded_digit_sets: list[DigitSet] = []
     try:
         with open(filepath, encoding="utf-8") as file_ptr:
@@ -127,8 +175,32 @@ def load_digit_sets_from_toml(filepath: Path, source_type: str) -> list[DigitSet
                 )
                 continue
 
+            mode = digit_set_entry.get("mode", POSITIONAL_MODE)
+            block_layout: BlockLayout | None = None
+            if mode == BLOCK_MODE:
+                try:
+                    block_layout = _parse_block_layout(digit_set_entry, digits)
+                except ValueError as exc:
+                    logger.warning(
+                        "Digit set entry '%s' in %s has invalid block settings: %s. Skipping.",
+                        digit_set_name,
+                        filepath,
+                        exc,
+                    )
+                    continue
+            elif mode != POSITIONAL_MODE:
+                logger.warning(
+                    "Digit set entry '%s' in %s has unknown mode '%s'. Skipping.",
+                    digit_set_name,
+                    filepath,
+                    mode,
+                )
+                continue
+
             loaded_digit_sets.append(
-                DigitSet(name=digit_set_name, digits=digits, source=source_type)
+                DigitSet(
+                    name=digit_set_name, digits=digits, source=source_type, block=block_layout
+                )
             )
     except FileNotFoundError:
         pass  # No digit sets from this file, which is fine
@@ -139,7 +211,7 @@ def load_digit_sets_from_toml(filepath: Path, source_type: str) -> list[DigitSet
     return loaded_digit_sets
 
 
-def get_all_digit_sets() -> dict[str, DigitSet]:
+def get_all_digit_sets() -> Mapping[str, DigitSet]:
     """
     Loads and merges digit sets from package, system, and user configurations.
 
@@ -147,16 +219,29 @@ def get_all_digit_sets() -> dict[str, DigitSet]:
     and system overrides package defaults. Each digit set is assigned a unique
     ID based on its source and name (e.g., "package:ASCII").
 
+    The merged result is read from the user snapshot while the files are
+    unchanged and the package defaults from the package snapshot while the
+    package file matches it (see `catalog_cache`); otherwise the TOML files
+    are parsed and the user snapshot is refreshed. Digit sets read from the
+    user snapshot load their digits on demand.
+
     Returns:
-        A dictionary where keys are unique IDs (e.g., "package:ASCII") and
-        values are `DigitSet` objects.
+        A read-only mapping where keys are unique IDs (e.g., "package:ASCII")
+        and values are `DigitSet` objects.
     """
     package_path, system_path, user_path, _ = _get_config_paths()
+    signature = file_signature((package_path, system_path, user_path))
+    cached = load_user_snapshot(signature)
+    if cached is not None:
+        return cached
 
     all_digit_sets_list: list[DigitSet] = []
 
     # Load package digit sets
-    all_digit_sets_list.extend(load_digit_sets_from_toml(package_path, "package"))
+    package_digit_sets = load_package_snapshot(package_path)
+    if package_digit_sets is None:
+        package_digit_sets = load_digit_sets_from_toml(package_path, "package")
+    all_digit_sets_list.extend(package_digit_sets)
 
     # Load system digit sets
     if system_path and system_path.exists():
@@ -174,7 +259,9 @@ def get_all_digit_sets() -> dict[str, DigitSet]:
         unique_id = f"{current_digit_set_obj.source}:{current_digit_set_obj.name}"
         final_digit_sets[unique_id] = current_digit_set_obj
 
-    return final_digit_sets
+    save_user_snapshot(signature, final_digit_sets)
+    # Served from the new snapshot, so the digits are not held in memory.
+    return load_user_snapshot(signature) or final_digit_sets
 
 
 def get_ui_state_path() -> Path | None:
@@ -199,6 +286,8 @@ def load_ui_state() -> dict[str, Any]:
         A dictionary containing the loaded UI state. Returns an empty dictionary
         if the file does not exist, is malformed, or an error occurs during loading.
     """
+    import toml  # pylint: disable=import-outside-toplevel
+
     ui_state_path = get_ui_state_path()
     if ui_state_path and ui_state_path.exists():
         try:
@@ -225,6 +314,8 @@ def save_ui_state(state_data: dict[str, Any]) -> None:
     Args:
         state_data: A dictionary containing the UI state to be saved.
     """
+    import toml  # pylint: disable=import-outside-toplevel
+
     ui_state_path = get_ui_state_path()
     if ui_state_path:
         try:
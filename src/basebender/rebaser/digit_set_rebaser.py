@@ -4,10 +4,28 @@ digit sets.
 
 It includes the `DigitSetRebaser` class, which handles the conversion of
 strings from an input digit set to an output digit set, supporting dynamic
-derivation of the input digit set and various rebase operations.
+derivation of the input digit set and various rebase operations. The actual
+conversion is delegated to the engines in `engines`, selected by cost.
 """
 
+from collections.abc import Iterable, Iterator
+
+from .block_codec import BlockCodec
+from .cancellation import CancellationToken
+from .codegen import CompiledRebaser, compile_digit_set_pair
+from .engines import (
+    DEFAULT_SLICE_BUDGET,
+    ConversionContext,
+    ConversionPlan,
+    Steps,
+    arun_steps,
+    get_engines,
+    observe_phase,
+    plan_conversion,
+    run_steps,
+)
 from .models import DigitSet
+from .streaming import BlockRebase, IncrementalRebase, RegroupingRebase, regrouping_ratio
 
 
 class DigitSetRebaser:
@@ -16,20 +34,32 @@ class DigitSetRebaser:
     systems).
 
     It supports explicit input and output digit sets, or dynamic derivation of
-    the input digit set based on the input string.
+    the input digit set based on the input string. Digit sets in block mode
+    (see `BlockLayout`) are encoded and decoded block by block; the value is
+    exchanged with the other side as big-endian bytes.
+
+    Conversions are performed by the cheapest eligible engine (see
+    `explain`); passing `engine` forces a specific engine, e.g. for testing.
     """
 
     def __init__(
         self,
         out_digit_set: DigitSet | None = None,
         in_digit_set: DigitSet | None = None,
+        engine: str | None = None,
     ) -> None:
+        if engine is not None and engine not in get_engines():
+            raise ValueError(f"Unknown conversion engine '{engine}'.")
+        self._engine: str | None = engine
+        self._last_plan: ConversionPlan | None = None
         self._initial_input_digit_set: DigitSet | None = in_digit_set
         self._initial_output_digit_set: DigitSet | None = out_digit_set
         self._in_digit_set_map: dict[str, int] = {}
         self._in_digit_set_list: list[str] = []
         self._out_digit_set_map: dict[str, int] = {}
         self._out_digit_set_list: list[str] = []
+        self._in_block_codec: BlockCodec | None = None
+        self._out_block_codec: BlockCodec | None = None
 
         # Output digit set is always explicitly set or None;
         # not dynamically determined in __init__
@@ -37,6 +67,8 @@ class DigitSetRebaser:
             out_digits = DigitSet.deduplicate_digits(out_digit_set.digits)
             self._out_digit_set_map = {char: i for i, char in enumerate(out_digits)}
             self._out_digit_set_list = list(out_digits)
+            if out_digit_set.block is not None:
+                self._out_block_codec = BlockCodec.from_digit_set(out_digit_set)
 
         # Input digit set is dynamically determined in rebase
         # if _initial_input_digit_set is None
@@ -44,6 +76,8 @@ class DigitSetRebaser:
             in_digits = DigitSet.deduplicate_digits(in_digit_set.digits)
             self._in_digit_set_map = {char: i for i, char in enumerate(in_digits)}
             self._in_digit_set_list = list(in_digits)
+            if in_digit_set.block is not None:
+                self._in_block_codec = BlockCodec.from_digit_set(in_digit_set)
 
     @property
     def initial_input_digit_set(
@@ -129,6 +163,21 @@ class DigitSetRebaser:
         """
         return self._out_digit_set_list
 
+    @property
+    def last_plan(self) -> ConversionPlan | None:
+        """
+        The plan of the most recent conversion, or `None` if no engine has run yet.
+
+        Examples:
+            >>> decimal = DigitSet("Decimal", "0123456789", "test")
+            >>> rebaser = DigitSetRebaser(decimal, DigitSet("Binary", "01", "test"))
+            >>> rebaser.rebase("101")
+            '5'
+            >>> rebaser.last_plan.engine
+            'native'
+        """
+        return self._last_plan
+
     @staticmethod
     def char_to_position(char: str, digit_set_map: dict[str, int]) -> int:
         """
@@ -229,7 +278,195 @@ class DigitSetRebaser:
 
         return "".join(reversed(result_chars))
 
-    def rebase(self, input_string: str) -> str:
+    def _effective_input_digit_set(self, input_string: str) -> tuple[dict[str, int], list[str]]:
+        """
+        Returns the input digit set map and list used for `input_string`.
+
+        The explicit input digit set is used if one was provided; otherwise the
+        digit set is derived from the characters of `input_string`.
+        """
+        if self._initial_input_digit_set:
+            return self._in_digit_set_map, self._in_digit_set_list
+        derived_digits = DigitSet.deduplicate_digits(input_string)
+        return {char: i for i, char in enumerate(derived_digits)}, list(derived_digits)
+
+    def _conversion_context(
+        self,
+        input_string: str,
+        input_digit_set_map: dict[str, int],
+        input_digit_set_list: list[str],
+    ) -> ConversionContext:
+        return ConversionContext(
+            input_length=len(input_string),
+            input_digit_set_map=input_digit_set_map,
+            input_digit_set_list=input_digit_set_list,
+            output_digit_set_list=self._out_digit_set_list,
+            input_block_codec=self._in_block_codec,
+            output_block_codec=self._out_block_codec,
+        )
+
+    def plan(self, input_string: str) -> ConversionPlan | None:
+        """
+        Plans the conversion of `input_string` without performing it.
+
+        Args:
+            input_string: The string that would be rebased.
+
+        Returns:
+            The `ConversionPlan`, or `None` if `rebase` would not run an engine
+            (e.g., empty input, echo or filter mode, or a degenerate digit set).
+
+        Raises:
+            ValueError: If a forced engine cannot perform the conversion.
+        """
+        if not input_string or self._initial_output_digit_set is None:
+            return None
+        input_digit_set_map, input_digit_set_list = self._effective_input_digit_set(input_string)
+        context = self._conversion_context(input_string, input_digit_set_map, input_digit_set_list)
+        if not context.is_block and (context.input_base < 2 or context.output_base < 2):
+            return None
+        return plan_conversion(context, self._engine)
+
+    def explain(self, input_string: str) -> str:
+        """
+        Describes how `input_string` would be rebased.
+
+        Args:
+            input_string: The string that would be rebased.
+
+        Returns:
+            A multi-line description of the selected engine and the estimated
+            cost of every eligible engine.
+
+        Examples:
+            >>> decimal = DigitSet("Decimal", "0123456789", "test")
+            >>> rebaser = DigitSetRebaser(decimal, DigitSet("Binary", "01", "test"))
+            >>> print(rebaser.explain("101"))  # doctest: +ELLIPSIS
+            Engine: native (cheapest estimated cost)
+            ...
+        """
+        plan = self.plan(input_string)
+        if plan is None:
+            return "No conversion engine is used for this input."
+        return plan.explain()
+
+    def compile(self) -> CompiledRebaser:
+        """
+        Compiles this rebaser into a specialized function, like `re.compile`.
+
+        The generated function has the digit tables and bases of this pair
+        baked in and is cached per pair, so compiling the same pair again is
+        cheap. It returns the same results as `rebase`.
+
+        Returns:
+            The `CompiledRebaser` for the input and output digit sets.
+
+        Raises:
+            ValueError: If either digit set is missing (dynamic derivation,
+                        echo or filter mode) or in block mode.
+
+        Examples:
+            >>> decimal = DigitSet("Decimal", "0123456789", "test")
+            >>> compiled = DigitSetRebaser(DigitSet("Binary", "01", "test"), decimal).compile()
+            >>> compiled("255")
+            '11111111'
+        """
+        in_digit_set = self._initial_input_digit_set
+        out_digit_set = self._initial_output_digit_set
+        if in_digit_set is None or out_digit_set is None:
+            raise ValueError(
+                "Only rebasers with explicit input and output digit sets can be compiled."
+            )
+        if self._in_block_codec is not None or self._out_block_codec is not None:
+            raise ValueError("Block-mode digit sets cannot be compiled.")
+        return compile_digit_set_pair(in_digit_set.digits, out_digit_set.digits)
+
+    def is_streamable(self) -> bool:
+        """
+        Whether values can be rebased in chunks with `iter_rebase`.
+
+        This is the case for two block-mode digit sets, and for two positional
+        digit sets whose bases are powers of a common root (see
+        `streaming.regrouping_ratio`).
+        """
+        if self._initial_input_digit_set is None or self._initial_output_digit_set is None:
+            return False
+        if self._in_block_codec is not None or self._out_block_codec is not None:
+            return self._in_block_codec is not None and self._out_block_codec is not None
+        return (
+            regrouping_ratio(len(self._in_digit_set_list), len(self._out_digit_set_list))
+            is not None
+        )
+
+    def streaming_needs_digit_count(self) -> bool:
+        """
+        Whether `iter_rebase` needs the total number of input digits in advance.
+
+        Groups of several input digits are aligned at the end of the value, so
+        the size of the first group depends on the total.
+        """
+        if not self.is_streamable() or self._in_block_codec is not None:
+            return False
+        ratio = regrouping_ratio(len(self._in_digit_set_list), len(self._out_digit_set_list))
+        return ratio is not None and ratio[0] > 1
+
+    def count_input_digits(self, text: str) -> int:
+        """Counts the characters of `text` that belong to the input digit set."""
+        digit_set_map = self._in_digit_set_map
+        return sum(1 for char in text if char in digit_set_map)
+
+    def incremental_rebase(self, digit_count: int | None = None) -> IncrementalRebase:
+        """
+        Creates an object that rebases a value fed in chunks.
+
+        Args:
+            digit_count: The total number of input digits; required if
+                         `streaming_needs_digit_count()`.
+
+        Returns:
+            An `IncrementalRebase` with `feed` and `finish` methods.
+
+        Raises:
+            ValueError: If the digit-set pair is not streamable or the digit
+                        count is missing.
+        """
+        if not self.is_streamable():
+            raise ValueError("This digit-set pair cannot be rebased in chunks.")
+        if self._in_block_codec is not None and self._out_block_codec is not None:
+            return BlockRebase(self._in_block_codec, self._out_block_codec)
+        return RegroupingRebase(
+            "".join(self._in_digit_set_list), "".join(self._out_digit_set_list), digit_count
+        )
+
+    def iter_rebase(self, chunks: Iterable[str], digit_count: int | None = None) -> Iterator[str]:
+        """
+        Rebases a value given in chunks, yielding the output in chunks.
+
+        The concatenated output equals `rebase` of the concatenated input, but
+        only a bounded amount of the value is held in memory.
+
+        Args:
+            chunks: The input chunks.
+            digit_count: As for `incremental_rebase`.
+
+        Yields:
+            The output, one string per input chunk plus a final one.
+
+        Raises:
+            ValueError: As for `incremental_rebase`, or if the input is invalid.
+
+        Examples:
+            >>> hexadecimal = DigitSet("Hex", "0123456789abcdef", "test")
+            >>> rebaser = DigitSetRebaser(DigitSet("Binary", "01", "test"), hexadecimal)
+            >>> "".join(rebaser.iter_rebase(["0f", "a"]))
+            '11111010'
+        """
+        incremental = self.incremental_rebase(digit_count)
+        for chunk in chunks:
+            yield incremental.feed(chunk)
+        yield incremental.finish()
+
+    def rebase(self, input_string: str, *, token: CancellationToken | None = None) -> str:
         """
         Rebases the input string from its determined input digit set to the
         specified output digit set.
@@ -244,27 +481,61 @@ class DigitSetRebaser:
         - If only the input digit set is provided, the input string is filtered
           to include only characters present in the input digit set.
         - If both are provided or derived, performs the full rebase operation.
+        - If either digit set is in block mode, the conversion goes through
+          bytes instead of a single positional number.
 
         Args:
             input_string: The string to be rebased.
+            token: An optional `CancellationToken` with a deadline; it is
+                   checked at every chunk boundary of the conversion.
 
         Returns:
             The rebased string.
+
+        Raises:
+            ValueError: If a forced engine cannot perform the conversion.
+            RebaseTimeoutError: If the token expires or is cancelled.
         """
-        if not input_string:
-            return self._out_digit_set_list[0] if self._out_digit_set_list else ""
+        return run_steps(self._rebase_steps(input_string), token)
+
+    async def arebase(
+        self,
+        input_string: str,
+        *,
+        slice_budget: float = DEFAULT_SLICE_BUDGET,
+        token: CancellationToken | None = None,
+    ) -> str:
+        """
+        Rebases the input string like `rebase`, yielding to the event loop.
 
-        effective_input_digit_set_map: dict[str, int]
-        effective_input_digit_set_list: list[str]
+        The conversion runs in slices of roughly `slice_budget` seconds; in
+        between, other tasks on the event loop get to run, so a large
+        conversion does not stall them.
 
-        if self._initial_input_digit_set:
-            effective_input_digit_set_map = self._in_digit_set_map
-            effective_input_digit_set_list = self._in_digit_set_list
-        else:
-            # Dynamically derive input digit set from input_string
-            derived_digits = DigitSet.deduplicate_digits(input_string)
-            effective_input_digit_set_map = {char: i for i, char in enumerate(derived_digits)}
-            effective_input_digit_set_list = list(derived_digits)
+        Args:
+            input_string: The string to be rebased.
+            slice_budget: The time in seconds to work before yielding.
+            token: An optional `CancellationToken`, as for `rebase`.
+
+        Returns:
+            The rebased string.
+
+        Raises:
+            ValueError: If a forced engine cannot perform the conversion.
+            RebaseTimeoutError: If the token expires or is cancelled.
+        """
+        return await arun_steps(self._rebase_steps(input_string), slice_budget, token)
+
+    def _rebase_steps(self, input_string: str) -> Steps[str]:
+        """Performs `rebase` as a step generator, yielding at chunk boundaries."""
+        if not input_string:
+            # A block encoding of no bytes is empty; positional outputs render zero.
+            renders_zero = self._out_block_codec is None and self._out_digit_set_list
+            return self._out_digit_set_list[0] if renders_zero else ""
+
+        effective_input_digit_set_map, effective_input_digit_set_list = (
+            self._effective_input_digit_set(input_string)
+        )
 
         # Scenario 1: No explicit output digit set, and no initial input digit set
         # (meaning input digit set was dynamically derived).
@@ -280,24 +551,19 @@ class DigitSetRebaser:
             )
             return filtered_string
 
-        # If the effective input digit set is empty or has only one character,
-        # and we are supposed to rebase, return the first char of output or empty.
-        if not effective_input_digit_set_list or len(effective_input_digit_set_list) <= 1:
-            return self._out_digit_set_list[0] if self._out_digit_set_list else ""
-
-        # If the output digit set is empty, return an empty string
-        if not self._out_digit_set_list:
+        context = self._conversion_context(
+            input_string, effective_input_digit_set_map, effective_input_digit_set_list
+        )
+        if not context.is_block and (context.input_base <= 1 or context.output_base <= 1):
+            # If the effective input digit set is empty or has only one character,
+            # return the first char of output or empty. A single-character output
+            # digit set cannot represent any number, so the result is empty.
+            if context.input_base <= 1 and self._out_digit_set_list:
+                return self._out_digit_set_list[0]
             return ""
 
-        # Perform the full rebase
-        integer_value = self.string_to_int_from_base(
-            input_string,
-            effective_input_digit_set_map,
-            len(effective_input_digit_set_list),
-        )
-        final_rebased_string = self.int_to_string_in_base(
-            integer_value,
-            self._out_digit_set_list,
-            len(self._out_digit_set_list),
-        )
-        return final_rebased_string
+        plan = plan_conversion(context, self._engine)
+        self._last_plan = plan
+        engine = get_engines()[plan.engine]
+        value = yield from observe_phase(engine.parse(input_string, context), plan.engine, "parse")
+        return (yield from observe_phase(engine.render(value, context), plan.engine, "render"))
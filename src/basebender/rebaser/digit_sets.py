@@ -2,60 +2,158 @@
 This module manages predefined digit sets and provides utility functions for
 suggesting digit sets based on input strings.
 
-It includes caching mechanisms for efficient retrieval of digit set data.
+The digit sets are held by the reloading catalog of `catalog.get_catalog`.
+Suggestions are answered from a `SuggestIndex` that maps every character to
+the digit sets containing it, rebuilt when the catalog changes.
 """
 
-import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
 
-from .config_loader import get_all_digit_sets
+from .catalog import CatalogDerived, get_catalog
 from .models import DigitSet
 
 
-@functools.cache
-def get_predefined_digit_sets() -> dict[str, DigitSet]:
+def get_predefined_digit_sets() -> Mapping[str, DigitSet]:
     """
-    Returns a dictionary of all loaded predefined digit sets.
+    Returns a mapping of all loaded predefined digit sets.
 
     This function loads digit sets from various configuration sources (package,
-    system, user) and caches the result for efficient retrieval on subsequent calls.
-    The loading order defines precedence: user configuration overrides system,
-    and system overrides package defaults.
+    system, user) on first use; the same mapping is returned until the
+    configuration files change (see `catalog.DigitSetCatalog`). The loading
+    order defines precedence: user configuration overrides system, and system
+    overrides package defaults. Listing the IDs reads no digits when the
+    catalog comes from the indexed snapshot (see `catalog_cache`).
 
     Returns:
-        A dictionary where keys are unique IDs (e.g., "package:ASCII") and
-        values are `DigitSet` objects.
+        A read-only mapping where keys are unique IDs (e.g., "package:ASCII")
+        and values are `DigitSet` objects.
     """
-    return get_all_digit_sets()
+    return get_catalog().digit_sets()
 
 
-def suggest_digit_sets(input_string: str) -> list[str]:
+@dataclass(frozen=True)
+class Suggestion:
+    """
+    A digit set that contains every character of an input.
+
+    Attributes:
+        digit_set_id: The ID of the digit set (e.g., "package:Binary").
+        digit_set: The digit set.
+        coverage: The fraction of the digit set's digits that occur in the
+                  input; 1.0 means the input uses every digit.
+    """
+
+    digit_set_id: str
+    digit_set: DigitSet
+    coverage: float
+
+
+class SuggestIndex:
+    """
+    Maps characters to the digit sets that contain them.
+
+    Every digit set is assigned a bit by rank, smallest digit set first (ties
+    keep the catalog order), and every character maps to the bitmask of the
+    digit sets containing it. The matches of an input are the AND of the masks
+    of its distinct characters, and the best `limit` matches are its lowest
+    set bits, so a query costs one lookup per distinct character instead of a
+    scan of the catalog. The padding character of a block-mode digit set
+    counts as one of its characters.
+
+    Examples:
+        >>> index = SuggestIndex({
+        ...     "Hex": DigitSet("Hex", "0123456789ABCDEF", "test"),
+        ...     "Binary": DigitSet("Binary", "01", "test"),
+        ...     "Decimal": DigitSet("Decimal", "0123456789", "test"),
+        ... })
+        >>> [suggestion.digit_set_id for suggestion in index.suggest("101")]
+        ['Binary', 'Decimal', 'Hex']
+        >>> [suggestion.digit_set_id for suggestion in index.suggest("1A", limit=1)]
+        ['Hex']
+    """
+
+    def __init__(self, digit_sets: Mapping[str, DigitSet]) -> None:
+        """
+        Args:
+            digit_sets: The digit sets by ID, in catalog order.
+        """
+        self._ranked = sorted(digit_sets.items(), key=lambda item: len(self._characters(item[1])))
+        self._sizes = [len(self._characters(digit_set)) for _, digit_set in self._ranked]
+        masks: dict[str, int] = {}
+        for rank, (_, digit_set) in enumerate(self._ranked):
+            bit = 1 << rank
+            for char in self._characters(digit_set):
+                masks[char] = masks.get(char, 0) | bit
+        self._masks = masks
+
+    @staticmethod
+    def _characters(digit_set: DigitSet) -> set[str]:
+        characters = set(digit_set.digits)
+        if digit_set.block is not None and digit_set.block.padding:
+            characters.add(digit_set.block.padding)
+        return characters
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    def suggest(self, input_string: str, limit: int | None = None) -> list[Suggestion]:
+        """
+        Returns the digit sets containing every character of `input_string`.
+
+        Args:
+            input_string: The string for which to suggest digit sets.
+            limit: The maximum number of suggestions, or None for all.
+
+        Returns:
+            The matching digit sets, smallest (closest fit) first.
+        """
+        characters = set(input_string)
+        if not characters:
+            return []
+        mask = -1
+        for char in characters:
+            mask &= self._masks.get(char, 0)
+            if not mask:
+                return []
+        suggestions: list[Suggestion] = []
+        while mask and (limit is None or len(suggestions) < limit):
+            lowest = mask & -mask
+            mask ^= lowest
+            rank = lowest.bit_length() - 1
+            digit_set_id, digit_set = self._ranked[rank]
+            suggestions.append(
+                Suggestion(digit_set_id, digit_set, len(characters) / self._sizes[rank])
+            )
+        return suggestions
+
+
+_SUGGEST_INDEX = CatalogDerived(lambda snapshot: SuggestIndex(snapshot.digit_sets))
+
+
+def get_suggest_index() -> SuggestIndex:
+    """Returns the `SuggestIndex` of the predefined digit sets of the current catalog."""
+    return _SUGGEST_INDEX.get()
+
+
+def suggest_digit_sets(input_string: str, limit: int | None = None) -> list[str]:
     """
     Suggests predefined digit sets that the `input_string` might belong to.
 
-    This function iterates through all known predefined digit sets and identifies
-    those that contain all characters present in the `input_string`.
+    A digit set is suggested if it contains every character of the
+    `input_string`. Smaller digit sets are ranked first, as they fit the input
+    more closely (e.g., Binary before Decimal for "101").
 
     Args:
         input_string: The string for which to suggest digit sets.
+        limit: The maximum number of suggestions, or None for all.
 
     Returns:
         A list of digit set IDs (strings) that are relevant to the input string.
-        The list is currently not sophisticatedly ranked beyond basic matching.
     """
-    if not input_string:
-        return []
-
-    predefined_digit_sets = get_predefined_digit_sets()
-    suggestions: list[str] = []
-
-    for digit_set_id, digit_set_info in predefined_digit_sets.items():
-        if all(char in digit_set_info.digits for char in input_string):
-            suggestions.append(digit_set_id)
-
-    # Basic ordering: exact matches first (if any), then others.
-    # For now, just return the list as is,
-    # more sophisticated ranking can be added later.
-    return suggestions
+    return [
+        suggestion.digit_set_id for suggestion in get_suggest_index().suggest(input_string, limit)
+    ]
 
 
 def main() -> None:
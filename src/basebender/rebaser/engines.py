@@ -0,0 +1,802 @@
+"""
+This module provides the conversion engines used by `DigitSetRebaser` and the
+cost model that selects between them.
+
+Every engine converts in two phases: `parse` turns the input string into an
+intermediate value (an integer, or bytes for block encodings) and `render`
+turns that value into the output string. Both phases are generators that
+yield at chunk boundaries, so callers can interleave other work, enforce
+deadlines or report progress; `run_steps` simply drives them to completion
+and `arun_steps` drives them from a coroutine, yielding to the event loop.
+
+Third-party engines can be registered with `register_engine` or through the
+`basebender.engines` entry-point group.
+"""
+
+import asyncio
+import functools
+import importlib.metadata
+import logging
+import math
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Generator
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+from .block_codec import BlockCodec
+from .cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+ENGINE_ENTRY_POINT_GROUP = "basebender.engines"
+
+# Roughly how many digits of work an engine does between two yields.
+STEP_DIGITS = 4096
+
+# How long (in seconds) `arun_steps` works before yielding to the event loop.
+DEFAULT_SLICE_BUDGET = 0.005
+
+# Digit strings up to this length are handled by the chunked helpers even
+# inside the divide-and-conquer engine.
+DIVIDE_AND_CONQUER_LEAF_DIGITS = 256
+
+_NATIVE_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+_NATIVE_FORMATS = {2: "b", 8: "o", 10: "d", 16: "x"}
+
+type Steps[T] = Generator[None, None, T]
+type IntermediateValue = int | bytes
+
+
+def run_steps[T](steps: Steps[T], token: CancellationToken | None = None) -> T:
+    """
+    Drives a step generator to completion and returns its result.
+
+    Args:
+        steps: A generator returned by an engine's `parse` or `render` method.
+        token: An optional token checked before every step.
+
+    Returns:
+        The value returned by the generator.
+
+    Raises:
+        RebaseTimeoutError: If the token expires or is cancelled.
+    """
+    while True:
+        if token is not None:
+            token.check()
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value  # type: ignore[no-any-return]
+
+
+type PhaseObserver = Callable[[str, str, float], None]
+
+_PHASE_OBSERVERS: list[PhaseObserver] = []
+
+
+def add_phase_observer(observer: PhaseObserver) -> None:
+    """
+    Registers a function called after every conversion phase.
+
+    The observer receives the engine name, the phase ("parse" or "render")
+    and the time spent working on the phase in seconds (time suspended
+    between steps is not counted). It must be cheap and must not raise.
+
+    Args:
+        observer: The function to call.
+    """
+    _PHASE_OBSERVERS.append(observer)
+
+
+def remove_phase_observer(observer: PhaseObserver) -> None:
+    """Unregisters an observer added with `add_phase_observer`."""
+    _PHASE_OBSERVERS.remove(observer)
+
+
+def observe_phase[T](steps: Steps[T], engine_name: str, phase: str) -> Steps[T]:
+    """
+    Reports the working time of a phase to the registered observers.
+
+    Args:
+        steps: The generator of the phase.
+        engine_name: The name of the engine running the phase.
+        phase: "parse" or "render".
+
+    Returns:
+        `steps` itself if no observer is registered, otherwise a generator
+        with the same steps and result that times them.
+    """
+    if not _PHASE_OBSERVERS:
+        return steps
+    return _timed_phase(steps, engine_name, phase)
+
+
+def _timed_phase[T](steps: Steps[T], engine_name: str, phase: str) -> Steps[T]:
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            next(steps)
+        except StopIteration as stop:
+            elapsed += time.perf_counter() - start
+            for observer in _PHASE_OBSERVERS:
+                observer(engine_name, phase, elapsed)
+            return stop.value  # type: ignore[no-any-return]
+        elapsed += time.perf_counter() - start
+        yield
+
+
+async def arun_steps[T](
+    steps: Steps[T],
+    slice_budget: float = DEFAULT_SLICE_BUDGET,
+    token: CancellationToken | None = None,
+) -> T:
+    """
+    Drives a step generator to completion from a coroutine.
+
+    Steps are run back to back until `slice_budget` seconds have passed, then
+    control is handed back to the event loop before the next slice, so other
+    tasks keep running while a large conversion is in progress.
+
+    Args:
+        steps: A generator returned by an engine's `parse` or `render` method.
+        slice_budget: The time in seconds to work before yielding. Zero
+                      yields after every step.
+        token: An optional token checked before every step.
+
+    Returns:
+        The value returned by the generator.
+
+    Raises:
+        RebaseTimeoutError: If the token expires or is cancelled.
+    """
+    slice_start = time.perf_counter()
+    while True:
+        if token is not None:
+            token.check()
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value  # type: ignore[no-any-return]
+        if time.perf_counter() - slice_start >= slice_budget:
+            await asyncio.sleep(0)
+            slice_start = time.perf_counter()
+
+
+def as_int(value: IntermediateValue) -> int:
+    """Converts an intermediate value to an integer, reading bytes as big-endian."""
+    if isinstance(value, bytes):
+        return int.from_bytes(value, "big")
+    return value
+
+
+def as_bytes(value: IntermediateValue) -> bytes:
+    """Converts an intermediate value to bytes, using the shortest big-endian form."""
+    if isinstance(value, bytes):
+        return value
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+
+
+def power_of_two_exponent(base: int) -> int | None:
+    """Returns `k` if `base == 2 ** k` (with `k >= 1`), otherwise `None`."""
+    if base >= 2 and base & (base - 1) == 0:
+        return base.bit_length() - 1
+    return None
+
+
+def chunk_digits(base: int) -> int:
+    """Returns the number of digits of `base` that fit into a 60-bit chunk."""
+    digits = 1
+    while base ** (digits + 1) <= 1 << 60:
+        digits += 1
+    return digits
+
+
+@dataclass(frozen=True)
+class ConversionContext:
+    """
+    Describes a single conversion for engine selection and execution.
+
+    Attributes:
+        input_length: The length of the raw input string.
+        input_digit_set_map: Maps input characters to their positions.
+        input_digit_set_list: The ordered input digits.
+        output_digit_set_list: The ordered output digits.
+        input_block_codec: The codec if the input digit set is in block mode.
+        output_block_codec: The codec if the output digit set is in block mode.
+    """
+
+    input_length: int
+    input_digit_set_map: dict[str, int]
+    input_digit_set_list: list[str]
+    output_digit_set_list: list[str]
+    input_block_codec: BlockCodec | None = None
+    output_block_codec: BlockCodec | None = None
+
+    @property
+    def input_base(self) -> int:
+        """The number of digits in the input digit set."""
+        return len(self.input_digit_set_list)
+
+    @property
+    def output_base(self) -> int:
+        """The number of digits in the output digit set."""
+        return len(self.output_digit_set_list)
+
+    @property
+    def is_block(self) -> bool:
+        """Whether either side of the conversion is a block-mode digit set."""
+        return self.input_block_codec is not None or self.output_block_codec is not None
+
+    @property
+    def estimated_value_bits(self) -> float:
+        """An upper estimate of the number of bits carried by the input."""
+        if self.input_block_codec is not None:
+            layout = self.input_block_codec.layout
+            return self.input_length * 8 * layout.block_size / layout.block_chars
+        if self.input_base < 2:
+            return 0.0
+        return self.input_length * math.log2(self.input_base)
+
+    @property
+    def estimated_output_length(self) -> int:
+        """An upper estimate of the length of the output string."""
+        bits = self.estimated_value_bits
+        if self.output_block_codec is not None:
+            layout = self.output_block_codec.layout
+            return math.ceil(bits / (8 * layout.block_size)) * layout.block_chars
+        if self.output_base < 2:
+            return 0
+        return math.ceil(bits / math.log2(self.output_base)) + 1
+
+    @property
+    def estimated_words(self) -> float:
+        """The estimated size of the intermediate integer in 30-bit machine words."""
+        return self.estimated_value_bits / 30
+
+
+class ConversionEngine(ABC):
+    """
+    Base class for conversion engines.
+
+    Subclasses set `name` and `description`, report whether they can handle
+    a conversion, estimate its cost, and implement the two conversion phases.
+    Costs are in arbitrary units that only need to be comparable between
+    engines; the built-in engines roughly count machine-word operations.
+    """
+
+    name: ClassVar[str]
+    description: ClassVar[str]
+
+    @abstractmethod
+    def is_eligible(self, context: ConversionContext) -> bool:
+        """Returns whether this engine can perform the described conversion."""
+
+    @abstractmethod
+    def estimate_cost(self, context: ConversionContext) -> float:
+        """Returns the estimated cost of the described conversion."""
+
+    @abstractmethod
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        """Parses the input string, ignoring characters outside the input digit set."""
+
+    @abstractmethod
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        """Renders a value produced by `parse` in the output digit set."""
+
+
+def filter_positions(input_string: str, digit_set_map: dict[str, int]) -> list[int]:
+    """Returns the positions of all characters of `input_string` found in the digit set."""
+    return [digit_set_map[char] for char in input_string if char in digit_set_map]
+
+
+def _horner(positions: list[int], base: int) -> int:
+    value = 0
+    for position in positions:
+        value = value * base + position
+    return value
+
+
+def _render_fixed(value: int, width: int, digit_set_list: list[str], base: int) -> list[str]:
+    chars = [digit_set_list[0]] * width
+    index = width - 1
+    while value:
+        value, remainder = divmod(value, base)
+        chars[index] = digit_set_list[remainder]
+        index -= 1
+    return chars
+
+
+def parse_chunked(positions: list[int], base: int) -> Steps[int]:
+    """
+    Parses digit positions by multiplying in chunks of up to 60 bits.
+
+    Args:
+        positions: The digit positions, most significant first.
+        base: The base of the digits.
+
+    Returns:
+        The integer value of the digits.
+    """
+    size = chunk_digits(base)
+    chunk_base = base**size
+    head = len(positions) % size
+    value = _horner(positions[:head], base)
+    steps_per_yield = max(1, STEP_DIGITS // size)
+    for count, offset in enumerate(range(head, len(positions), size), start=1):
+        value = value * chunk_base + _horner(positions[offset : offset + size], base)
+        if count % steps_per_yield == 0:
+            yield
+    return value
+
+
+def render_chunked(value: int, digit_set_list: list[str]) -> Steps[str]:
+    """
+    Renders an integer by dividing off chunks of up to 60 bits.
+
+    Args:
+        value: The non-negative integer to render.
+        digit_set_list: The ordered output digits.
+
+    Returns:
+        The rendered string. Zero renders as the first digit; a digit set with
+        fewer than two digits renders as an empty string.
+    """
+    base = len(digit_set_list)
+    if base < 2:
+        return ""
+    if value == 0:
+        return digit_set_list[0]
+    size = chunk_digits(base)
+    chunk_base = base**size
+    steps_per_yield = max(1, STEP_DIGITS // size)
+    chunks: list[list[str]] = []
+    while value:
+        value, chunk = divmod(value, chunk_base)
+        chunks.append(_render_fixed(chunk, size, digit_set_list, base))
+        if len(chunks) % steps_per_yield == 0:
+            yield
+    chunks.reverse()
+    return "".join(["".join(chunk) for chunk in chunks]).lstrip(digit_set_list[0])
+
+
+def _parse_divide_and_conquer(
+    positions: list[int], base: int, powers: dict[int, int]
+) -> Steps[int]:
+    length = len(positions)
+    if length <= DIVIDE_AND_CONQUER_LEAF_DIGITS:
+        return (yield from parse_chunked(positions, base))
+    low_length = 1 << ((length - 1).bit_length() - 1)
+    if low_length not in powers:
+        powers[low_length] = base**low_length
+    high = yield from _parse_divide_and_conquer(positions[:-low_length], base, powers)
+    low = yield from _parse_divide_and_conquer(positions[-low_length:], base, powers)
+    if length >= STEP_DIGITS:
+        yield
+    return high * powers[low_length] + low
+
+
+def parse_divide_and_conquer(positions: list[int], base: int) -> Steps[int]:
+    """
+    Parses digit positions by recursively splitting them into halves.
+
+    The low half always has a power-of-two length, so only the powers
+    `base ** (2 ** k)` are needed. With CPython's Karatsuba multiplication this
+    is subquadratic in the number of digits.
+
+    Args:
+        positions: The digit positions, most significant first.
+        base: The base of the digits.
+
+    Returns:
+        The integer value of the digits.
+    """
+    return (yield from _parse_divide_and_conquer(positions, base, {}))
+
+
+def render_divide_and_conquer(value: int, digit_set_list: list[str]) -> Steps[str]:
+    """
+    Renders an integer by recursively dividing it by `base ** (leaf * 2 ** k)`.
+
+    Args:
+        value: The non-negative integer to render.
+        digit_set_list: The ordered output digits.
+
+    Returns:
+        The rendered string, with the same conventions as `render_chunked`.
+    """
+    base = len(digit_set_list)
+    if base < 2:
+        return ""
+    if value == 0:
+        return digit_set_list[0]
+    powers = [base**DIVIDE_AND_CONQUER_LEAF_DIGITS]
+    while powers[-1] <= value:
+        powers.append(powers[-1] * powers[-1])
+    parts: list[str] = []
+
+    # Renders `value < powers[level + 1]`, zero-padded to its full width if `pad`.
+    def render_level(value: int, level: int, pad: bool) -> Steps[None]:
+        if level < 0:
+            chars = _render_fixed(value, DIVIDE_AND_CONQUER_LEAF_DIGITS, digit_set_list, base)
+            text = "".join(chars)
+            parts.append(text if pad else text.lstrip(digit_set_list[0]))
+            return
+        high, low = divmod(value, powers[level])
+        if pad or high:
+            yield from render_level(high, level - 1, pad)
+            pad = True
+        yield from render_level(low, level - 1, pad)
+        if DIVIDE_AND_CONQUER_LEAF_DIGITS << level >= STEP_DIGITS:
+            yield
+
+    yield from render_level(value, len(powers) - 2, False)
+    return "".join(parts)
+
+
+def _quadratic_cost(words: float) -> float:
+    return words * words / 4
+
+
+def _subquadratic_cost(words: float) -> float:
+    return 6 * math.pow(words, 1.585) + 200
+
+
+class ChunkedEngine(ConversionEngine):
+    """Schoolbook conversion that processes up to 60 bits per bignum operation."""
+
+    name = "chunked"
+    description = "Horner parsing and repeated division in 60-bit chunks (quadratic)."
+
+    def is_eligible(self, context: ConversionContext) -> bool:
+        return not context.is_block
+
+    def estimate_cost(self, context: ConversionContext) -> float:
+        linear = context.input_length + context.estimated_output_length
+        return linear + 2 * _quadratic_cost(context.estimated_words)
+
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        positions = filter_positions(input_string, context.input_digit_set_map)
+        return (yield from parse_chunked(positions, context.input_base))
+
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        return (yield from render_chunked(as_int(value), context.output_digit_set_list))
+
+
+class DivideAndConquerEngine(ConversionEngine):
+    """Recursive splitting that benefits from fast multiplication of large integers."""
+
+    name = "divide-and-conquer"
+    description = "Recursive splitting with cached powers of the base (subquadratic)."
+
+    def is_eligible(self, context: ConversionContext) -> bool:
+        return not context.is_block
+
+    def estimate_cost(self, context: ConversionContext) -> float:
+        linear = context.input_length + context.estimated_output_length
+        return linear + _subquadratic_cost(context.estimated_words)
+
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        positions = filter_positions(input_string, context.input_digit_set_map)
+        return (yield from parse_divide_and_conquer(positions, context.input_base))
+
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        return (yield from render_divide_and_conquer(as_int(value), context.output_digit_set_list))
+
+
+class BitRegroupingEngine(ConversionEngine):
+    """
+    Linear-time conversion between two power-of-two bases.
+
+    Digits are packed into bytes in groups whose bit width is a multiple of
+    both the digit width and 8, and unpacked the same way on output.
+    """
+
+    name = "bit-regrouping"
+    description = "Linear regrouping of bits between power-of-two bases."
+
+    def is_eligible(self, context: ConversionContext) -> bool:
+        return (
+            not context.is_block
+            and power_of_two_exponent(context.input_base) is not None
+            and power_of_two_exponent(context.output_base) is not None
+        )
+
+    def estimate_cost(self, context: ConversionContext) -> float:
+        return float(context.input_length + context.estimated_output_length)
+
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        bits = power_of_two_exponent(context.input_base)
+        assert bits is not None
+        group_bits = math.lcm(bits, 8)
+        group_digits = group_bits // bits
+        group_bytes = group_bits // 8
+        positions = filter_positions(input_string, context.input_digit_set_map)
+        positions[:0] = [0] * (-len(positions) % group_digits)
+        data = bytearray()
+        steps_per_yield = max(1, STEP_DIGITS // group_digits)
+        for count, offset in enumerate(range(0, len(positions), group_digits), start=1):
+            group = 0
+            for position in positions[offset : offset + group_digits]:
+                group = group << bits | position
+            data += group.to_bytes(group_bytes, "big")
+            if count % steps_per_yield == 0:
+                yield
+        return bytes(data)
+
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        digit_set_list = context.output_digit_set_list
+        bits = power_of_two_exponent(context.output_base)
+        assert bits is not None
+        group_bits = math.lcm(bits, 8)
+        group_digits = group_bits // bits
+        group_bytes = group_bits // 8
+        mask = (1 << bits) - 1
+        shifts = range(group_bits - bits, -1, -bits)
+        data = as_bytes(value)
+        data = bytes(-len(data) % group_bytes) + data
+        chars: list[str] = []
+        steps_per_yield = max(1, STEP_DIGITS // group_digits)
+        for count, offset in enumerate(range(0, len(data), group_bytes), start=1):
+            group = int.from_bytes(data[offset : offset + group_bytes], "big")
+            chars.extend([digit_set_list[group >> shift & mask] for shift in shifts])
+            if count % steps_per_yield == 0:
+                yield
+        return "".join(chars).lstrip(digit_set_list[0]) or digit_set_list[0]
+
+
+class NativeEngine(ConversionEngine):
+    """
+    Conversion through the built-in `int()` and `format()` functions.
+
+    The input is translated to the alphabet understood by `int()` and the
+    output of `format()` is translated to the output digit set, so both
+    phases run in C. Only bases up to 36 can be parsed and only bases 2, 8,
+    10 and 16 can be rendered; non-power-of-two bases are also bound by the
+    interpreter's integer string conversion length limit.
+    """
+
+    name = "native"
+    description = "Built-in int()/format() with translate tables."
+
+    def is_eligible(self, context: ConversionContext) -> bool:
+        if context.is_block or context.input_base > len(_NATIVE_DIGITS):
+            return False
+        if context.output_base not in _NATIVE_FORMATS:
+            return False
+        limit = sys.get_int_max_str_digits()
+        if limit:
+            if power_of_two_exponent(context.input_base) is None and (
+                context.input_length > limit
+            ):
+                return False
+            if context.output_base == 10 and context.estimated_output_length > limit:
+                return False
+        return True
+
+    def estimate_cost(self, context: ConversionContext) -> float:
+        cost = (context.input_length + context.estimated_output_length) / 10
+        if power_of_two_exponent(context.input_base) is None:
+            cost += _quadratic_cost(context.estimated_words) / 8
+        if context.output_base == 10:
+            cost += _quadratic_cost(context.estimated_words) / 8
+        return cost
+
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        digit_set_map = context.input_digit_set_map
+        if not set(input_string).issubset(digit_set_map):
+            input_string = "".join([char for char in input_string if char in digit_set_map])
+        if not input_string:
+            return 0
+        table = str.maketrans(
+            "".join(context.input_digit_set_list), _NATIVE_DIGITS[: context.input_base]
+        )
+        yield
+        return int(input_string.translate(table), context.input_base)
+
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        digit_set_list = context.output_digit_set_list
+        native = format(as_int(value), _NATIVE_FORMATS[context.output_base])
+        yield
+        table = str.maketrans(_NATIVE_DIGITS[: context.output_base], "".join(digit_set_list))
+        return native.translate(table)
+
+
+class BlockEngine(ConversionEngine):
+    """
+    Conversion where at least one side is a block-mode digit set.
+
+    Block-mode sides are decoded or encoded block by block; a positional side
+    exchanges its value as big-endian bytes.
+    """
+
+    name = "block"
+    description = "Independent fixed-size byte blocks (Base32/Base64/Base85-style)."
+
+    def is_eligible(self, context: ConversionContext) -> bool:
+        return context.is_block
+
+    def estimate_cost(self, context: ConversionContext) -> float:
+        cost = float(context.input_length + context.estimated_output_length)
+        if context.input_block_codec is None or context.output_block_codec is None:
+            words = context.estimated_words
+            cost += min(_quadratic_cost(words), _subquadratic_cost(words))
+        return cost
+
+    def parse(self, input_string: str, context: ConversionContext) -> Steps[IntermediateValue]:
+        codec = context.input_block_codec
+        if codec is None:
+            if context.input_base < 2:
+                return 0
+            positions = filter_positions(input_string, context.input_digit_set_map)
+            return (yield from parse_divide_and_conquer(positions, context.input_base))
+        decoded: list[bytes] = []
+        for part in codec.iter_decode(
+            input_string[offset : offset + STEP_DIGITS]
+            for offset in range(0, len(input_string), STEP_DIGITS)
+        ):
+            decoded.append(part)
+            yield
+        return b"".join(decoded)
+
+    def render(self, value: IntermediateValue, context: ConversionContext) -> Steps[str]:
+        codec = context.output_block_codec
+        if codec is None:
+            return (
+                yield from render_divide_and_conquer(as_int(value), context.output_digit_set_list)
+            )
+        data = as_bytes(value)
+        encoded: list[str] = []
+        for part in codec.iter_encode(
+            data[offset : offset + STEP_DIGITS] for offset in range(0, len(data), STEP_DIGITS)
+        ):
+            encoded.append(part)
+            yield
+        return "".join(encoded)
+
+
+@dataclass(frozen=True)
+class ConversionPlan:
+    """
+    Records which engine a conversion uses and why.
+
+    Attributes:
+        engine: The name of the selected engine.
+        forced: Whether the engine was forced by the caller instead of chosen by cost.
+        input_length: The length of the raw input string.
+        input_base: The number of digits in the input digit set.
+        output_base: The number of digits in the output digit set.
+        estimated_output_length: An upper estimate of the output length.
+        costs: The estimated cost of every eligible engine, cheapest first.
+    """
+
+    engine: str
+    forced: bool
+    input_length: int
+    input_base: int
+    output_base: int
+    estimated_output_length: int
+    costs: dict[str, float] = field(default_factory=dict)
+
+    def explain(self) -> str:
+        """
+        Returns a human-readable description of the plan.
+
+        Examples:
+            >>> plan = ConversionPlan("native", False, 3, 2, 10, 2, {"native": 0.5})
+            >>> print(plan.explain())
+            Engine: native (cheapest estimated cost)
+            Input: 3 characters in base 2
+            Output: up to 2 characters in base 10
+            Candidates:
+              * native               cost=0.5
+        """
+        reason = "forced by caller" if self.forced else "cheapest estimated cost"
+        lines = [
+            f"Engine: {self.engine} ({reason})",
+            f"Input: {self.input_length} characters in base {self.input_base}",
+            f"Output: up to {self.estimated_output_length} characters in base {self.output_base}",
+            "Candidates:",
+        ]
+        for name, cost in self.costs.items():
+            marker = "*" if name == self.engine else " "
+            lines.append(f"  {marker} {name:<20} cost={cost:.1f}")
+        return "\n".join(lines)
+
+
+_ENGINES: dict[str, ConversionEngine] = {}
+
+
+def register_engine(engine: ConversionEngine) -> None:
+    """
+    Registers a conversion engine, replacing any engine with the same name.
+
+    Args:
+        engine: The engine instance to register.
+    """
+    _ENGINES[engine.name] = engine
+
+
+@functools.cache
+def _load_entry_point_engines() -> None:
+    for entry_point in importlib.metadata.entry_points(group=ENGINE_ENTRY_POINT_GROUP):
+        try:
+            loaded = entry_point.load()
+            engine = loaded() if isinstance(loaded, type) else loaded
+            if not isinstance(engine, ConversionEngine):
+                raise TypeError(f"{loaded!r} is not a ConversionEngine")
+            register_engine(engine)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Catching broad exception so a broken plugin cannot break conversions.
+            logger.warning("Could not load conversion engine '%s': %s", entry_point.name, exc)
+
+
+def get_engines() -> dict[str, ConversionEngine]:
+    """
+    Returns all registered engines by name, loading entry-point engines on first use.
+
+    Returns:
+        A dictionary mapping engine names to engine instances, in registration order.
+    """
+    _load_entry_point_engines()
+    return _ENGINES
+
+
+def plan_conversion(
+    context: ConversionContext, forced_engine: str | None = None
+) -> ConversionPlan:
+    """
+    Selects the engine for a conversion.
+
+    Args:
+        context: The conversion to plan.
+        forced_engine: The name of an engine to use instead of the cheapest one.
+
+    Returns:
+        The `ConversionPlan` describing the selected engine and all candidates.
+
+    Raises:
+        ValueError: If the forced engine is unknown or cannot perform the
+                    conversion, or if no engine is eligible.
+    """
+    engines = get_engines()
+    costs = {
+        name: engine.estimate_cost(context)
+        for name, engine in engines.items()
+        if engine.is_eligible(context)
+    }
+    costs = dict(sorted(costs.items(), key=lambda item: item[1]))
+
+    if forced_engine is not None:
+        if forced_engine not in engines:
+            raise ValueError(f"Unknown conversion engine '{forced_engine}'.")
+        if forced_engine not in costs:
+            raise ValueError(f"Conversion engine '{forced_engine}' cannot perform this rebase.")
+        selected = forced_engine
+    elif costs:
+        selected = next(iter(costs))
+    else:
+        raise ValueError("No conversion engine can perform this rebase.")
+
+    return ConversionPlan(
+        engine=selected,
+        forced=forced_engine is not None,
+        input_length=context.input_length,
+        input_base=context.input_base,
+        output_base=context.output_base,
+        estimated_output_length=context.estimated_output_length,
+        costs=costs,
+    )
+
+
+for _builtin_engine in (
+    NativeEngine(),
+    BitRegroupingEngine(),
+    ChunkedEngine(),
+    DivideAndConquerEngine(),
+    BlockEngine(),
+):
+    register_engine(_builtin_engine)
@@ -0,0 +1,217 @@
+"""
+This module rebases an input that is edited over time, e.g., while a user
+types.
+
+`LiveRebase` keeps the current text together with the integer value of the
+part of it that has already been parsed. Appending digits only parses the new
+digits and shifts the known value; deleting trailing digits divides them off.
+Short inputs are converted from scratch by the compiled function of the pair,
+which is cheaper than any bookkeeping.
+
+Only pairs of explicit positional digit sets are updated incrementally; for
+other rebasers (derived input digit sets, block mode, echo and filter modes)
+every result is a full `DigitSetRebaser.rebase`.
+"""
+
+from .cancellation import CancellationToken
+from .codegen import CompiledRebaser
+from .digit_set_rebaser import DigitSetRebaser
+from .engines import (
+    DEFAULT_SLICE_BUDGET,
+    ConversionContext,
+    Steps,
+    arun_steps,
+    filter_positions,
+    get_engines,
+    observe_phase,
+    parse_divide_and_conquer,
+    plan_conversion,
+    run_steps,
+)
+
+# Inputs up to this length are converted by the compiled function, if given.
+COMPILED_CHARS = 4096
+
+
+class LiveRebase:
+    """
+    The rebased value of a text that is changed by appending, deleting and
+    replacing.
+
+    The result of `rebase` and `arebase` always equals
+    `DigitSetRebaser.rebase(text)` for the current `text`.
+
+    Examples:
+        >>> from basebender.rebaser.models import DigitSet
+        >>> decimal = DigitSet("Decimal", "0123456789", "test")
+        >>> live = LiveRebase(DigitSetRebaser(DigitSet("Binary", "01", "test"), decimal))
+        >>> live.append("12")
+        >>> live.rebase()
+        '1100'
+        >>> live.append("8")
+        >>> live.rebase()
+        '10000000'
+        >>> live.replace("5", start=1)
+        >>> live.rebase()
+        '1111'
+    """
+
+    def __init__(
+        self,
+        rebaser: DigitSetRebaser,
+        compiled: CompiledRebaser | None = None,
+        compiled_chars: int = COMPILED_CHARS,
+    ) -> None:
+        """
+        Args:
+            rebaser: The rebaser of the digit-set pair.
+            compiled: The compiled function of the pair, used for inputs of
+                      up to `compiled_chars` characters.
+            compiled_chars: The longest input converted by `compiled`.
+        """
+        self._rebaser = rebaser
+        self._compiled = compiled
+        self._compiled_chars = compiled_chars
+        self._text = ""
+        # `_value` is the parsed value of `_text[:_parsed_length]`, or None.
+        self._value: int | None = None
+        self._parsed_length = 0
+        in_digit_set = rebaser.initial_input_digit_set
+        out_digit_set = rebaser.initial_output_digit_set
+        self._incremental = (
+            in_digit_set is not None
+            and out_digit_set is not None
+            and in_digit_set.block is None
+            and out_digit_set.block is None
+            and len(rebaser.input_digit_set_list) >= 2
+            and len(rebaser.output_digit_set_list) >= 2
+        )
+
+    @property
+    def rebaser(self) -> DigitSetRebaser:
+        """The rebaser of the digit-set pair."""
+        return self._rebaser
+
+    @property
+    def text(self) -> str:
+        """The current input text."""
+        return self._text
+
+    @property
+    def incremental(self) -> bool:
+        """Whether edits update the parsed value instead of converting from scratch."""
+        return self._incremental
+
+    def append(self, text: str) -> None:
+        """Appends `text` to the input."""
+        self._text += text
+
+    def delete(self, count: int) -> None:
+        """
+        Deletes the last `count` characters of the input (all if it is shorter).
+
+        Raises:
+            ValueError: If `count` is negative.
+        """
+        if count < 0:
+            raise ValueError("The number of characters to delete must not be negative.")
+        self._truncate(max(0, len(self._text) - count))
+
+    def replace(self, text: str, start: int = 0) -> None:
+        """
+        Replaces the input from position `start` to its end with `text`.
+
+        Raises:
+            ValueError: If `start` is not within the current input.
+        """
+        if not 0 <= start <= len(self._text):
+            raise ValueError(f"Position {start} is outside of the input.")
+        self._truncate(start)
+        self._text += text
+
+    def _truncate(self, length: int) -> None:
+        """Shortens the input to `length` characters, dividing off parsed digits."""
+        if self._value is not None and length < self._parsed_length:
+            removed = len(
+                filter_positions(
+                    self._text[length : self._parsed_length], self._rebaser.input_digit_set_map
+                )
+            )
+            if length < self._parsed_length // 2:
+                # Parsing the rest again is cheaper than a long division.
+                self._value, self._parsed_length = None, 0
+            else:
+                self._value //= len(self._rebaser.input_digit_set_list) ** removed
+                self._parsed_length = length
+        self._text = self._text[:length]
+
+    def _context(self) -> ConversionContext:
+        return ConversionContext(
+            input_length=len(self._text),
+            input_digit_set_map=self._rebaser.input_digit_set_map,
+            input_digit_set_list=self._rebaser.input_digit_set_list,
+            output_digit_set_list=self._rebaser.output_digit_set_list,
+        )
+
+    def _incremental_steps(self) -> Steps[str]:
+        """Parses the digits added since the last result and renders the value."""
+        context = self._context()
+        plan = plan_conversion(context)
+        base = context.input_base
+        length = len(self._text)
+        value = self._value or 0
+        positions = filter_positions(
+            self._text[self._parsed_length : length], context.input_digit_set_map
+        )
+        if positions:
+            added = yield from observe_phase(
+                parse_divide_and_conquer(positions, base), plan.engine, "parse"
+            )
+            value = value * base ** len(positions) + added
+        self._value, self._parsed_length = value, length
+        engine = get_engines()[plan.engine]
+        return (yield from observe_phase(engine.render(value, context), plan.engine, "render"))
+
+    def _compiled_result(self) -> str | None:
+        if self._compiled is not None and len(self._text) <= self._compiled_chars:
+            return self._compiled.function(self._text)
+        return None
+
+    def rebase(self, *, token: CancellationToken | None = None) -> str:
+        """
+        Rebases the current text.
+
+        Args:
+            token: An optional `CancellationToken`, as for `DigitSetRebaser.rebase`.
+
+        Returns:
+            The rebased text.
+
+        Raises:
+            RebaseTimeoutError: If the token expires or is cancelled.
+        """
+        if not self._incremental:
+            return self._rebaser.rebase(self._text, token=token)
+        compiled = self._compiled_result()
+        if compiled is not None:
+            return compiled
+        return run_steps(self._incremental_steps(), token)
+
+    async def arebase(
+        self,
+        *,
+        slice_budget: float = DEFAULT_SLICE_BUDGET,
+        token: CancellationToken | None = None,
+    ) -> str:
+        """
+        Rebases the current text like `rebase`, yielding to the event loop
+        every `slice_budget` seconds.
+
+        The text must not be edited until the result is returned.
+        """
+        if not self._incremental:
+            return await self._rebaser.arebase(self._text, slice_budget=slice_budget, token=token)
+        compiled = self._compiled_result()
+        if compiled is not None:
+            return compiled
+        return await arun_steps(self._incremental_steps(), slice_budget, token)
@@ -2,11 +2,34 @@
 This module defines data models used across the BaseBender application.
 
 It includes the `DigitSet` dataclass, which represents a set of characters
-used in a positional number system, along with its name and source.
+used in a positional number system, along with its name and source, and the
+`BlockLayout` dataclass describing digit sets used as block encodings.
 """
 
 from dataclasses import dataclass
 
+POSITIONAL_MODE = "positional"
+BLOCK_MODE = "block"
+
+
+@dataclass(frozen=True)
+class BlockLayout:
+    """
+    Describes how a block-mode digit set groups bytes into characters.
+
+    Attributes:
+        block_size (int): The number of bytes encoded per block (e.g., 3 for
+                          Base64, 5 for Base32, 4 for Base85).
+        block_chars (int): The number of characters produced per full block
+                           (e.g., 4 for Base64, 8 for Base32, 5 for Base85).
+        padding (str): The character used to pad a partial final block to
+                       `block_chars` characters, or an empty string for no padding.
+    """
+
+    block_size: int
+    block_chars: int
+    padding: str = ""
+
 
 @dataclass(frozen=True)
 class DigitSet:
@@ -21,11 +44,20 @@ class DigitSet:
                       "0123456789" for decimal).
         source (str): The origin of the digit set (e.g., "package", "system",
                       "user", "cli_input", "gui_input").
+        block (BlockLayout | None): The block layout if the digit set is used as
+                                    a block encoding of bytes, or `None` for the
+                                    default positional mode.
     """
 
     name: str
     digits: str
     source: str
+    block: BlockLayout | None = None
+
+    @property
+    def mode(self) -> str:
+        """The conversion mode of the digit set, either "positional" or "block"."""
+        return BLOCK_MODE if self.block is not None else POSITIONAL_MODE
 
     @staticmethod
     def deduplicate_digits(digits: str) -> str:
@@ -0,0 +1,212 @@
+"""
+This module provides bulk generation of sequential numbers rendered in a
+digit set.
+
+Instead of converting every integer of a range from scratch, the generators
+keep the digits of the previous value and apply the step digit by digit with
+carry (or borrow) propagation, so each value usually costs only a handful of
+digit updates plus the final string join.
+"""
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TextIO
+
+from .models import DigitSet
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _int_to_positions(integer_value: int, base: int) -> list[int]:
+    """
+    Splits a non-negative integer into its digit positions, least significant first.
+
+    Args:
+        integer_value: The integer to split.
+        base: The base of the target number system.
+
+    Returns:
+        A list of digit positions, least significant digit first. Zero yields `[0]`.
+    """
+    positions: list[int] = []
+    while integer_value > 0:
+        integer_value, remainder = divmod(integer_value, base)
+        positions.append(remainder)
+    return positions or [0]
+
+
+def _add_in_place(
+    positions: list[int], chars: list[str], step_positions: list[int], digit_list: list[str]
+) -> None:
+    """
+    Adds the step to the digits in place, propagating the carry upwards.
+
+    Only the digits touched by the step or the carry are updated, so the
+    amortized cost of adding a small step is constant.
+    """
+    base = len(digit_list)
+    step_length = len(step_positions)
+    index = 0
+    carry = 0
+    while index < step_length or carry:
+        if index == len(positions):
+            positions.append(0)
+            chars.append(digit_list[0])
+        total = positions[index] + carry
+        if index < step_length:
+            total += step_positions[index]
+        carry = int(total >= base)
+        if carry:
+            total -= base
+        positions[index] = total
+        chars[index] = digit_list[total]
+        index += 1
+
+
+def _subtract_in_place(
+    positions: list[int], chars: list[str], step_positions: list[int], digit_list: list[str]
+) -> None:
+    """
+    Subtracts the step from the digits in place, propagating the borrow upwards.
+
+    The caller guarantees that the result is not negative. Leading zero digits
+    are left in place.
+    """
+    base = len(digit_list)
+    step_length = len(step_positions)
+    index = 0
+    borrow = 0
+    while index < step_length or borrow:
+        total = positions[index] - borrow
+        if index < step_length:
+            total -= step_positions[index]
+        borrow = int(total < 0)
+        if borrow:
+            total += base
+        positions[index] = total
+        chars[index] = digit_list[total]
+        index += 1
+
+
+def generate_digit_strings(
+    digit_set: DigitSet,
+    start: int,
+    stop: int,
+    step: int = 1,
+    width: int | None = None,
+) -> Iterator[str]:
+    """
+    Yields every value of `range(start, stop, step)` rendered in the given digit set.
+
+    The first value is converted normally; every following value is derived
+    from the previous one by adding (or subtracting) the step digit by digit.
+
+    Args:
+        digit_set: The digit set used to render the values.
+        start: The first value of the range (inclusive).
+        stop: The end of the range (exclusive).
+        step: The difference between consecutive values. May be negative.
+        width: An optional fixed width. Shorter values are left-padded with the
+               first digit of the digit set.
+
+    Yields:
+        The string representation of each value in the range.
+
+    Raises:
+        ValueError: If the step is zero, the digit set has fewer than two
+                    distinct digits, the range contains negative values, or a
+                    value does not fit into the requested width.
+
+    Examples:
+        >>> list(generate_digit_strings(DigitSet("Binary", "01", "test"), 0, 4))
+        ['0', '1', '10', '11']
+        >>> hexadecimal = DigitSet("Hex", "0123456789ABCDEF", "test")
+        >>> list(generate_digit_strings(hexadecimal, 14, 18, width=3))
+        ['00E', '00F', '010', '011']
+    """
+    if step == 0:
+        raise ValueError("Step must not be zero.")
+    if width is not None and width < 1:
+        raise ValueError("Width must be greater than 0.")
+
+    digit_list = list(DigitSet.deduplicate_digits(digit_set.digits))
+    base = len(digit_list)
+    if base < 2:
+        raise ValueError("Digit set must contain at least two distinct digits.")
+
+    values = range(start, stop, step)
+    if not values:
+        return
+    if min(values[0], values[-1]) < 0:
+        raise ValueError("Negative values cannot be rendered in a digit set.")
+
+    min_length = width or 1
+    largest_length = len(_int_to_positions(max(values[0], values[-1]), base))
+    if width is not None and largest_length > width:
+        raise ValueError(
+            f"Values in the range need {largest_length} digits, exceeding width {width}."
+        )
+
+    positions = _int_to_positions(values[0], base)
+    positions.extend([0] * (min_length - len(positions)))
+    chars = [digit_list[position] for position in positions]
+    step_positions = _int_to_positions(abs(step), base)
+
+    yield "".join(reversed(chars))
+
+    for _ in range(len(values) - 1):
+        if step > 0:
+            _add_in_place(positions, chars, step_positions, digit_list)
+        else:
+            _subtract_in_place(positions, chars, step_positions, digit_list)
+            while len(positions) > min_length and positions[-1] == 0:
+                positions.pop()
+                chars.pop()
+        yield "".join(reversed(chars))
+
+
+def write_digit_strings(
+    stream: TextIO,
+    digit_strings: Iterable[str],
+    separator: str = "\n",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Writes digit strings to a stream in chunks.
+
+    Values are collected into chunks of `chunk_size` and written with a single
+    `write` call per chunk, which keeps memory bounded for very large ranges.
+    Every value, including the last one, is followed by `separator`.
+
+    Args:
+        stream: A text stream or buffer (e.g., an open file or `io.StringIO`).
+        digit_strings: The strings to write, typically from `generate_digit_strings`.
+        separator: The string written after every value.
+        chunk_size: The number of values written per `write` call.
+
+    Returns:
+        The number of values written.
+
+    Raises:
+        ValueError: If `chunk_size` is not positive, or if `digit_strings`
+                    raises it while being consumed.
+
+    Examples:
+        >>> import io
+        >>> buffer = io.StringIO()
+        >>> binary = DigitSet("Binary", "01", "test")
+        >>> write_digit_strings(buffer, generate_digit_strings(binary, 0, 3))
+        3
+        >>> buffer.getvalue()
+        '0\\n1\\n10\\n'
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be greater than 0.")
+
+    iterator = iter(digit_strings)
+    written = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        chunk.append("")
+        stream.write(separator.join(chunk))
+        written += len(chunk) - 1
+    return written
@@ -0,0 +1,186 @@
+"""
+This module rebases values that arrive in chunks, without holding the whole
+value in memory.
+
+Only some digit-set pairs can be streamed:
+
+- Two block-mode digit sets: the input is decoded and re-encoded block by block.
+- Two positional digit sets whose bases are powers of a common root (e.g.,
+  hexadecimal and binary, or hexadecimal and Base64): every group of `a`
+  input digits maps to exactly `b` output digits, where
+  `input_base ** a == output_base ** b`. Groups are aligned at the least
+  significant end, so if `a > 1` the total number of input digits must be
+  known in advance to size the first group.
+"""
+
+from abc import ABC, abstractmethod
+
+from .block_codec import BlockCodec, IncrementalBlockDecoder, IncrementalBlockEncoder
+
+# Largest exponent tried when looking for `input_base ** a == output_base ** b`.
+MAX_GROUP_DIGITS = 16
+
+# Group values below this limit are rendered from a precomputed table.
+_GROUP_TABLE_LIMIT = 1 << 16
+
+
+def regrouping_ratio(input_base: int, output_base: int) -> tuple[int, int] | None:
+    """
+    Finds how many input digits correspond to how many output digits.
+
+    Args:
+        input_base: The base of the input digit set.
+        output_base: The base of the output digit set.
+
+    Returns:
+        The smallest `(a, b)` with `input_base ** a == output_base ** b`, or
+        `None` if the bases are not powers of a common root.
+
+    Examples:
+        >>> regrouping_ratio(16, 64)
+        (3, 2)
+        >>> regrouping_ratio(16, 2)
+        (1, 4)
+        >>> regrouping_ratio(10, 2) is None
+        True
+    """
+    if input_base < 2 or output_base < 2:
+        return None
+    for input_digits in range(1, MAX_GROUP_DIGITS + 1):
+        for output_digits in range(1, MAX_GROUP_DIGITS + 1):
+            if input_base**input_digits == output_base**output_digits:
+                return input_digits, output_digits
+    return None
+
+
+class IncrementalRebase(ABC):
+    """
+    Rebases a value fed in chunks; the concatenated outputs of `feed` and
+    `finish` equal `DigitSetRebaser.rebase` of the concatenated inputs.
+    """
+
+    @abstractmethod
+    def feed(self, chunk: str) -> str:
+        """Adds the next chunk of input and returns the output it completes."""
+
+    @abstractmethod
+    def finish(self) -> str:
+        """Ends the input and returns the remaining output."""
+
+
+class RegroupingRebase(IncrementalRebase):
+    """
+    Streams a positional value between bases that are powers of a common root.
+    """
+
+    def __init__(
+        self,
+        input_digits: str,
+        output_digits: str,
+        digit_count: int | None = None,
+    ) -> None:
+        """
+        Args:
+            input_digits: The deduplicated input digits.
+            output_digits: The deduplicated output digits.
+            digit_count: The total number of input digits (characters outside
+                         the input digit set do not count). Required if a
+                         group spans more than one input digit.
+
+        Raises:
+            ValueError: If the bases are not related or `digit_count` is
+                        required but missing.
+        """
+        ratio = regrouping_ratio(len(input_digits), len(output_digits))
+        if ratio is None:
+            raise ValueError(
+                f"Base {len(input_digits)} cannot be streamed to base {len(output_digits)}."
+            )
+        self._group_digits, self._output_group_digits = ratio
+        if self._group_digits > 1 and digit_count is None:
+            raise ValueError(
+                "The total number of input digits is required for this digit-set pair."
+            )
+
+        self._input_base = len(input_digits)
+        self._input_map = {char: i for i, char in enumerate(input_digits)}
+        self._output_digits = output_digits
+        self._zero = output_digits[0]
+        self._pending: list[int] = []
+        # The first group holds the digits left over when aligning at the end.
+        self._need = ((digit_count or 0) % self._group_digits) or self._group_digits
+        self._started = False
+
+        group_limit = self._input_base**self._group_digits
+        self._table: list[str] | None = None
+        if group_limit <= _GROUP_TABLE_LIMIT:
+            self._table = [self._render_group(value) for value in range(group_limit)]
+        self._translate: dict[int, str] | None = None
+        if self._group_digits == 1 and self._table is not None:
+            self._translate = str.maketrans(dict(zip(input_digits, self._table, strict=True)))
+
+    def _render_group(self, value: int) -> str:
+        output_base = len(self._output_digits)
+        chars = []
+        for _ in range(self._output_group_digits):
+            value, remainder = divmod(value, output_base)
+            chars.append(self._output_digits[remainder])
+        return "".join(reversed(chars))
+
+    def _strip_leading_zeros(self, output: str) -> str:
+        if self._started:
+            return output
+        output = output.lstrip(self._zero)
+        self._started = bool(output)
+        return output
+
+    def feed(self, chunk: str) -> str:
+        input_map = self._input_map
+        if not input_map.keys() >= set(chunk):
+            chunk = "".join([char for char in chunk if char in input_map])
+        if self._translate is not None:
+            return self._strip_leading_zeros(chunk.translate(self._translate))
+
+        pending = self._pending
+        pending.extend([input_map[char] for char in chunk])
+        base = self._input_base
+        parts: list[str] = []
+        start = 0
+        while len(pending) - start >= self._need:
+            value = 0
+            for position in pending[start : start + self._need]:
+                value = value * base + position
+            parts.append(
+                self._table[value] if self._table is not None else self._render_group(value)
+            )
+            start += self._need
+            self._need = self._group_digits
+        del pending[:start]
+        return self._strip_leading_zeros("".join(parts))
+
+    def finish(self) -> str:
+        """
+        Ends the input and returns the remaining output.
+
+        Raises:
+            ValueError: If fewer input digits arrived than announced.
+        """
+        if self._pending:
+            raise ValueError("The input ended before the announced number of digits.")
+        return "" if self._started else self._zero
+
+
+class BlockRebase(IncrementalRebase):
+    """
+    Streams text between two block-mode digit sets.
+    """
+
+    def __init__(self, input_codec: BlockCodec, output_codec: BlockCodec) -> None:
+        self._decoder = IncrementalBlockDecoder(input_codec)
+        self._encoder = IncrementalBlockEncoder(output_codec)
+
+    def feed(self, chunk: str) -> str:
+        return self._encoder.feed(self._decoder.feed(chunk))
+
+    def finish(self) -> str:
+        return self._encoder.feed(self._decoder.finish()) + self._encoder.finish()
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_cache_dir(tmp_path_factory):
+    # Keeps the digit-set snapshots of the tests out of the user cache directory.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+        yield
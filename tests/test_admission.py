@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from basebender.api.admission import AdmissionConfig, AdmissionMiddleware
+
+
+def _make_app(config, release=None):
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, config=config)
+
+    @app.post("/rebase")
+    async def rebase(request: Request):
+        body = await request.body()
+        if release is not None:
+            await release.wait()
+        return {"length": len(body)}
+
+    @app.get("/digitsets")
+    async def digit_sets():
+        return []
+
+    return app
+
+
+async def _post(app, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/rebase", **kwargs)
+
+
+def test_small_request_is_admitted():
+    response = asyncio.run(_post(_make_app(AdmissionConfig(max_input_bytes=10)), content=b"12345"))
+    assert response.status_code == 200
+    assert response.json() == {"length": 5}
+
+
+def test_declared_content_length_over_limit_returns_413():
+    response = asyncio.run(
+        _post(_make_app(AdmissionConfig(max_input_bytes=10)), content=b"x" * 11)
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"]["message"] == "Input Too Large"
+
+
+def test_streamed_body_over_limit_returns_413():
+    async def chunks():
+        for _ in range(5):
+            yield b"x" * 4
+
+    response = asyncio.run(_post(_make_app(AdmissionConfig(max_input_bytes=10)), content=chunks()))
+    assert response.status_code == 413
+
+
+def test_concurrency_limit_returns_429_with_retry_after():
+    async def scenario():
+        release = asyncio.Event()
+        app = _make_app(AdmissionConfig(max_concurrency=1, retry_after=3), release)
+        first = asyncio.create_task(_post(app, content=b"1"))
+        await asyncio.sleep(0.05)
+        rejected = await _post(app, content=b"2")
+        release.set()
+        return await first, rejected
+
+    first, rejected = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "3"
+    assert rejected.json()["detail"]["message"] == "Too Many Requests"
+
+
+def test_other_paths_are_not_limited():
+    async def scenario():
+        transport = httpx.ASGITransport(
+            app=_make_app(AdmissionConfig(max_concurrency=1, max_input_bytes=1))
+        )
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/digitsets")
+
+    assert asyncio.run(scenario()).status_code == 200
+
+
+def test_session_limit_closes_extra_websockets():
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, config=AdmissionConfig(max_sessions=1))
+
+    @app.websocket("/rebase/live")
+    async def live(websocket: WebSocket):
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+
+    client = TestClient(app)
+    with client.websocket_connect("/rebase/live") as first:
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            with client.websocket_connect("/rebase/live"):
+                pass
+        assert exc_info.value.code == 1013
+        first.send_text("open")
+        assert first.receive_text() == "open"
+    with client.websocket_connect("/rebase/live") as again:
+        again.send_text("reopened")
+        assert again.receive_text() == "reopened"
+
+
+def test_config_from_environment(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_MAX_CONCURRENCY", "8")
+    monkeypatch.setenv("BASEBENDER_MAX_SESSIONS", "2")
+    monkeypatch.setenv("BASEBENDER_MAX_INPUT_BYTES", "0")
+    config = AdmissionConfig.from_environment()
+    assert config.max_concurrency == 8
+    assert config.max_sessions == 2
+    assert config.max_input_bytes == 0
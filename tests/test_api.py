@@ -1,6 +1,13 @@
+import json
+
 from fastapi.testclient import TestClient
 
+from basebender.api import main
 from basebender.api.main import APP
+from basebender.api.settings import slice_budget
+from basebender.rebaser.cancellation import RebaseTimeoutError
+from basebender.rebaser.engines import DEFAULT_SLICE_BUDGET
+from basebender.rebaser.models import DigitSet
 
 client = TestClient(APP)
 
@@ -23,6 +30,108 @@ def test_list_digit_sets():
     assert "source" in data[0]
 
 
+def test_list_digit_sets_is_cacheable():
+    response = client.get("/digitsets")
+    etag = response.headers["etag"]
+    assert etag.startswith('"')
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    not_modified = client.get("/digitsets", headers={"If-None-Match": f'"stale", W/{etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    stale = client.get("/digitsets", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == response.content
+
+
+def test_list_digit_sets_pages_and_prefix(monkeypatch):
+    catalog = {
+        f"{source}:Set{index}": DigitSet(name=f"Set{index}", digits="01", source=source)
+        for source in ("package", "user")
+        for index in range(3)
+    }
+    monkeypatch.setattr("basebender.api.main._load_digit_set_data", lambda: catalog)
+    response = client.get("/digitsets", params={"prefix": "user:", "offset": 1, "limit": 1})
+    assert response.status_code == 200
+    assert [entry["id"] for entry in response.json()] == ["user:Set1"]
+    assert response.headers["x-total-count"] == "3"
+
+    etag = response.headers["etag"]
+    repeat = client.get(
+        "/digitsets",
+        params={"prefix": "user:", "offset": 1, "limit": 1},
+        headers={"If-None-Match": etag},
+    )
+    assert repeat.status_code == 304
+
+    tail = client.get("/digitsets", params={"offset": 4})
+    assert [entry["id"] for entry in tail.json()] == ["user:Set1", "user:Set2"]
+    assert tail.headers["x-total-count"] == "6"
+    assert client.get("/digitsets", params={"prefix": "system:"}).json() == []
+    assert client.get("/digitsets", params={"limit": 0}).status_code == 422
+
+
+def test_suggest_ranks_closest_fit_first():
+    response = client.get("/suggest", params={"text": "101", "limit": 3})
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert len(suggestions) == 3
+    assert suggestions[0]["id"] == "package:Binary"
+    assert suggestions[0]["coverage"] == 1.0
+    coverages = [suggestion["coverage"] for suggestion in suggestions]
+    assert coverages == sorted(coverages, reverse=True)
+
+
+def test_suggest_no_match_and_limit_validation():
+    assert client.get("/suggest", params={"text": "\U0001f600"}).json() == {"suggestions": []}
+    assert client.get("/suggest", params={"text": "1", "limit": 0}).status_code == 422
+
+
+def test_suggest_is_cacheable():
+    response = client.get("/suggest", params={"text": "DEADBEEF"})
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    not_modified = client.get(
+        "/suggest", params={"text": "DEADBEEF"}, headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    other = client.get("/suggest", params={"text": "DEADBEEF", "limit": 1})
+    assert other.headers["etag"] != etag
+
+
+def test_suggest_batch():
+    response = client.post("/suggest/batch", json={"texts": ["101", "", "101"], "limit": 2})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 3
+    assert results[0] == results[2]
+    assert [suggestion["id"] for suggestion in results[0]["suggestions"]][0] == "package:Binary"
+    assert len(results[0]["suggestions"]) == 2
+    assert results[1] == {"suggestions": []}
+
+
+def test_list_digit_sets_body_follows_catalog(monkeypatch):
+    body = client.get("/digitsets").content
+    catalog = {
+        "test:Ternary": DigitSet(name="Ternary", digits="012", source="test"),
+    }
+    monkeypatch.setattr("basebender.api.main._load_digit_set_data", lambda: catalog)
+    response = client.get("/digitsets")
+    assert response.content != body
+    assert response.json() == [
+        {
+            "id": "test:Ternary",
+            "name": "Ternary",
+            "digits": "012",
+            "source": "test",
+            "mode": "positional",
+        }
+    ]
+
+
 def test_rebase_binary_to_decimal():
     response = client.post(
         "/rebase",
@@ -38,6 +147,29 @@ def test_rebase_binary_to_decimal():
     assert data["error"] is None
 
 
+def test_rebase_schema_documents_response_model():
+    schema = APP.openapi()["paths"]["/rebase"]["post"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/RebaseResponse"
+    }
+
+
+def test_rebase_compiles_new_pairs_in_the_background():
+    body = {"input_text": "zyx", "source_digit_set": "xyz", "target_digit_set": "0123456789"}
+    rebaser = main._get_rebaser(
+        DigitSet(name="Provided", digits="0123456789", source="api_input"),
+        DigitSet(name="Provided", digits="xyz", source="api_input"),
+    )
+    assert main._COMPILED.lookup(rebaser) == (False, None)
+    first = client.post("/rebase", json=body)
+    assert first.json()["rebased_text"] == "21"
+    main._COMPILE_POOL.submit(lambda: None).result()
+    found, compiled = main._COMPILED.lookup(rebaser)
+    assert found
+    assert compiled is not None
+    assert client.post("/rebase", json=body).json() == first.json()
+
+
 def test_rebase_with_direct_strings():
     response = client.post(
         "/rebase",
@@ -93,3 +225,312 @@ def test_rebase_no_digit_sets_dynamic():
     assert response.status_code == 200
     data = response.json()
     assert data["rebased_text"] == "hello"
+
+
+def test_rebase_large_input_in_slices(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_SLICE_BUDGET_MS", "0")
+    response = client.post(
+        "/rebase",
+        json={
+            "input_text": "1" * 5000,
+            "source_digit_set": "01",
+            "target_digit_set": "0123456789",
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["rebased_text"] == str(int("1" * 5000, 2))
+
+
+def test_invalid_slice_budget_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_SLICE_BUDGET_MS", "fast")
+    assert slice_budget() == DEFAULT_SLICE_BUDGET
+    monkeypatch.setenv("BASEBENDER_SLICE_BUDGET_MS", "20")
+    assert slice_budget() == 0.02
+
+
+def test_rebase_timeout_returns_503(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_REBASE_TIMEOUT", "0.000001")
+    response = client.post(
+        "/rebase",
+        json={"input_text": "1" * 50000, "source_digit_set": "01", "target_digit_set": "012"},
+    )
+    assert response.status_code == 503
+    assert response.json()["detail"]["message"] == "Rebase Timeout"
+
+
+def test_routing_stats():
+    response = client.get("/stats/routing")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["routes"]) == {"inline", "thread", "process"}
+    assert data["routes"]["inline"]["queued"] == 0
+    assert data["process_cost"] > data["thread_cost"]
+
+
+def test_rebase_estimated_output_over_budget_returns_413(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_MAX_OUTPUT_CHARS", "100")
+    response = client.post(
+        "/rebase",
+        json={"input_text": "9" * 200, "source_digit_set": "0123456789", "target_digit_set": "01"},
+    )
+    assert response.status_code == 413
+    assert response.json()["detail"]["message"] == "Output Too Large"
+
+
+def test_rebase_batch():
+    response = client.post(
+        "/rebase/batch",
+        json={
+            "inputs": ["101", "", "11111111"],
+            "source_digit_set": "01",
+            "target_digit_set_id": "package:Decimal",
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["rebased_text"] for item in data["results"]] == ["5", "0", "255"]
+    assert data["source_digit_set_used"] == "Provided: '01'"
+
+
+def test_rebase_batch_matches_single_rebase_for_dynamic_source():
+    inputs = ["abc", "zz9", "hello"]
+    response = client.post("/rebase/batch", json={"inputs": inputs, "target_digit_set": "01"})
+    assert response.status_code == 200
+    expected = [
+        client.post("/rebase", json={"input_text": text, "target_digit_set": "01"}).json()[
+            "rebased_text"
+        ]
+        for text in inputs
+    ]
+    assert [item["rebased_text"] for item in response.json()["results"]] == expected
+
+
+def test_rebase_batch_reports_item_errors():
+    response = client.post(
+        "/rebase/batch",
+        json={
+            "inputs": ["AA==", "A"],
+            "source_digit_set_id": "package:Base64 Block",
+            "target_digit_set": "01",
+        },
+    )
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert first["error"] is None
+    assert second["rebased_text"] is None
+    assert second["error"]["message"] == "Rebase Error"
+
+
+def test_rebase_batch_large_batch_runs_in_thread_pool(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_BATCH_INLINE_CHARS", "0")
+    response = client.post(
+        "/rebase/batch",
+        json={
+            "inputs": ["ff", "10"],
+            "source_digit_set": "0123456789abcdef",
+            "target_digit_set": "01",
+        },
+    )
+    assert response.status_code == 200
+    assert [item["rebased_text"] for item in response.json()["results"]] == ["11111111", "10000"]
+
+
+def test_rebase_batch_invalid_target_id():
+    response = client.post(
+        "/rebase/batch", json={"inputs": ["1"], "target_digit_set_id": "missing"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["message"] == "Invalid Target Digit Set ID"
+
+
+def _stream_results(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_rebase_stream_plain_text():
+    response = client.post(
+        "/rebase/stream",
+        params={"source_digit_set": "01", "target_digit_set_id": "package:Decimal"},
+        content="101\n11111111\n\n1",
+        headers={"content-type": "text/plain"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [item["rebased_text"] for item in _stream_results(response)] == ["5", "255", "0", "1"]
+
+
+def test_rebase_stream_ndjson_with_invalid_lines():
+    body = '"101"\n{"input_text": "11"}\n\nnot json\n42\n'
+    response = client.post(
+        "/rebase/stream",
+        params={"source_digit_set": "01", "target_digit_set": "0123456789"},
+        content=body,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    results = _stream_results(response)
+    assert [item["rebased_text"] for item in results] == ["5", "3", None, None]
+    assert results[2]["error"]["message"] == "Invalid Line"
+    assert results[3]["error"]["message"] == "Invalid Line"
+
+
+def test_rebase_stream_chunked_body_keeps_order():
+    lines = [format(value, "b") for value in range(1000)]
+    body = ("\n".join(lines) + "\n").encode()
+
+    def chunks():
+        for offset in range(0, len(body), 97):
+            yield body[offset : offset + 97]
+
+    response = client.post(
+        "/rebase/stream",
+        params={"source_digit_set": "01", "target_digit_set": "0123456789"},
+        content=chunks(),
+    )
+    assert [item["rebased_text"] for item in _stream_results(response)] == [
+        str(value) for value in range(1000)
+    ]
+
+
+def test_rebase_stream_reports_overlong_lines(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_MAX_INPUT_BYTES", "8")
+    response = client.post(
+        "/rebase/stream",
+        params={"source_digit_set": "01", "target_digit_set": "0123456789"},
+        content="1\n" + "1" * 20 + "\n10",
+    )
+    results = _stream_results(response)
+    assert [item["rebased_text"] for item in results] == ["1", None, "2"]
+    assert results[1]["error"]["message"] == "Input Too Large"
+
+
+def test_rebase_stream_timeout_keeps_finished_results(monkeypatch):
+    iter_batch_results = main._iter_batch_results
+
+    def first_only(rebaser, inputs, token):
+        yield next(iter_batch_results(rebaser, inputs, token))
+        raise RebaseTimeoutError("The rebase timed out.")
+
+    monkeypatch.setattr(main, "_iter_batch_results", first_only)
+    response = client.post(
+        "/rebase/stream",
+        params={"source_digit_set": "01", "target_digit_set": "0123456789"},
+        content="101\n11\n1\n",
+    )
+    results = _stream_results(response)
+    assert [item["rebased_text"] for item in results] == ["5", None, None]
+    assert [item["error"]["message"] for item in results[1:]] == ["Rebase Timeout"] * 2
+
+
+def test_rebase_stream_invalid_source_id():
+    response = client.post(
+        "/rebase/stream", params={"source_digit_set_id": "package:NonExistent"}, content="1"
+    )
+    assert response.status_code == 400
+
+
+def test_rebase_raw_streams_related_bases():
+    value = "0f" * 5000
+    response = client.post(
+        "/rebase/raw",
+        params={"source_digit_set": "0123456789abcdef", "target_digit_set": "01"},
+        content=iter([value[:777].encode(), value[777:].encode()]),
+        headers={"content-type": "text/plain"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == format(int(value, 16), "b")
+
+
+def test_rebase_raw_spools_grouped_input():
+    value = "1" + "0110" * 1000
+    response = client.post(
+        "/rebase/raw",
+        params={"source_digit_set": "01", "target_digit_set": "0123456789abcdef"},
+        content=value,
+        headers={"content-type": "application/octet-stream"},
+    )
+    assert response.text == format(int(value, 2), "x")
+
+
+def test_rebase_raw_limits_spooled_bodies(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_MAX_RAW_BYTES", "16")
+    params = {"source_digit_set": "01", "target_digit_set": "0123456789abcdef"}
+    response = client.post("/rebase/raw", params=params, content="1" * 17)
+    assert response.status_code == 413
+    assert response.json()["detail"]["message"] == "Input Too Large"
+    assert client.post("/rebase/raw", params=params, content="1" * 16).text == "ffff"
+
+
+def test_rebase_raw_block_pair():
+    response = client.post(
+        "/rebase/raw",
+        params={
+            "source_digit_set_id": "package:Base64 Block",
+            "target_digit_set_id": "package:Base32 Block",
+        },
+        content="aGVsbG8gd29ybGQ=",
+    )
+    assert response.text == "NBSWY3DPEB3W64TMMQ======"
+
+
+def test_rebase_raw_buffers_other_pairs(monkeypatch):
+    response = client.post(
+        "/rebase/raw",
+        params={"source_digit_set": "0123456789", "target_digit_set": "01"},
+        content="255",
+    )
+    assert response.text == "11111111"
+    monkeypatch.setenv("BASEBENDER_MAX_INPUT_BYTES", "4")
+    response = client.post(
+        "/rebase/raw",
+        params={"source_digit_set": "0123456789", "target_digit_set": "01"},
+        content="12345",
+    )
+    assert response.status_code == 413
+
+
+def test_rebase_raw_rejects_json():
+    response = client.post(
+        "/rebase/raw", params={"target_digit_set": "01"}, json={"input_text": "1"}
+    )
+    assert response.status_code == 415
+
+
+def test_register_digit_set_and_rebase_with_its_id():
+    digits = "".join(chr(code) for code in range(0x4E00, 0x4E00 + 5000))
+    response = client.post("/digitsets", json={"digits": digits, "name": "CJK"})
+    assert response.status_code == 201
+    registered = response.json()
+    assert registered["id"].startswith("registered:")
+    assert registered["name"] == "CJK"
+    assert registered["expires_in"] > 0
+
+    repeat = client.post("/digitsets", json={"digits": digits + digits[:10]})
+    assert repeat.status_code == 200
+    assert repeat.json()["id"] == registered["id"]
+
+    response = client.post(
+        "/rebase",
+        json={
+            "input_text": "123456789",
+            "source_digit_set_id": "package:Decimal",
+            "target_digit_set_id": registered["id"],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["target_digit_set_used"] == "CJK"
+    back = client.post(
+        "/rebase",
+        json={
+            "input_text": response.json()["rebased_text"],
+            "source_digit_set_id": registered["id"],
+            "target_digit_set_id": "package:Decimal",
+        },
+    )
+    assert back.json()["rebased_text"] == "123456789"
+
+
+def test_register_invalid_digit_set():
+    response = client.post("/digitsets", json={"digits": "x"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["message"] == "Invalid Digit Set"
@@ -0,0 +1,77 @@
+import base64
+
+import pytest
+
+from basebender.rebaser.block_codec import BlockCodec, minimal_block_chars
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+BASE32_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+BASE64_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+BASE85_DIGITS = "".join(chr(code) for code in range(33, 118))
+RFC1924_DIGITS = (
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{|}~"
+)
+
+BASE32_CODEC = BlockCodec(BASE32_DIGITS, BlockLayout(block_size=5, block_chars=8, padding="="))
+BASE64_CODEC = BlockCodec(BASE64_DIGITS, BlockLayout(block_size=3, block_chars=4, padding="="))
+BASE85_CODEC = BlockCodec(BASE85_DIGITS, BlockLayout(block_size=4, block_chars=5))
+RFC1924_CODEC = BlockCodec(RFC1924_DIGITS, BlockLayout(block_size=4, block_chars=5))
+
+SAMPLES = [b"", b"f", b"fo", b"foo", b"foob", b"fooba", b"foobar", bytes(range(1, 256)) * 3]
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_matches_standard_library_encodings(data):
+    assert BASE32_CODEC.encode(data) == base64.b32encode(data).decode()
+    assert BASE64_CODEC.encode(data) == base64.b64encode(data).decode()
+    assert BASE85_CODEC.encode(data) == base64.a85encode(data).decode()
+    assert RFC1924_CODEC.encode(data) == base64.b85encode(data).decode()
+
+
+@pytest.mark.parametrize("data", SAMPLES)
+def test_round_trip(data):
+    for codec in (BASE32_CODEC, BASE64_CODEC, BASE85_CODEC, RFC1924_CODEC):
+        assert codec.decode(codec.encode(data)) == data
+
+
+def test_decode_ignores_foreign_characters():
+    assert BASE64_CODEC.decode("Zm9v\nYmFy\n") == b"foobar"
+
+
+def test_streaming_with_uneven_chunks():
+    data = bytes(range(256)) * 4
+    chunks = [data[offset : offset + 7] for offset in range(0, len(data), 7)]
+    encoded = "".join(BASE64_CODEC.iter_encode(chunks))
+    assert encoded == base64.b64encode(data).decode()
+    text_chunks = [encoded[offset : offset + 5] for offset in range(0, len(encoded), 5)]
+    assert b"".join(BASE64_CODEC.iter_decode(text_chunks)) == data
+
+
+def test_decode_invalid_final_block_raises_error():
+    with pytest.raises(ValueError, match="Invalid final block length"):
+        BASE64_CODEC.decode("Zm9vY")
+
+
+def test_decode_out_of_range_block_raises_error():
+    with pytest.raises(ValueError, match="out of range"):
+        BASE85_CODEC.decode("uuuuu")
+
+
+def test_minimal_block_chars():
+    assert minimal_block_chars(32, 5) == 8
+    assert minimal_block_chars(64, 3) == 4
+    assert minimal_block_chars(85, 4) == 5
+
+
+def test_invalid_layouts_raise_error():
+    with pytest.raises(ValueError, match="cannot represent"):
+        BlockCodec(BASE64_DIGITS, BlockLayout(block_size=3, block_chars=3))
+    with pytest.raises(ValueError, match="also a digit"):
+        BlockCodec(BASE64_DIGITS, BlockLayout(block_size=3, block_chars=4, padding="A"))
+    with pytest.raises(ValueError, match="duplicate digits"):
+        BlockCodec("0012", BlockLayout(block_size=1, block_chars=8))
+
+
+def test_from_digit_set_requires_block_mode():
+    with pytest.raises(ValueError, match="not a block digit set"):
+        BlockCodec.from_digit_set(DigitSet(name="Decimal", digits="0123456789", source="test"))
@@ -0,0 +1,113 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from basebender.api.main import APP
+from basebender.rebaser.catalog import CatalogDerived, DigitSetCatalog, get_catalog
+from basebender.rebaser.config_loader import load_digit_sets_from_toml
+from basebender.rebaser.models import DigitSet
+
+
+def _write(path, *digit_sets):
+    entries = "".join(
+        f'[[digit_sets]]\nname = "{name}"\ndigits = "{digits}"\n\n' for name, digits in digit_sets
+    )
+    path.write_text(entries, encoding="utf-8")
+
+
+def _catalog(path, poll_interval=0.0):
+    def load():
+        return {f"user:{ds.name}": ds for ds in load_digit_sets_from_toml(path, "user")}
+
+    return DigitSetCatalog(load, lambda: [path], poll_interval=poll_interval)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_check_reloads_changed_files_with_a_new_version(tmp_path):
+    path = tmp_path / "digit_sets.toml"
+    _write(path, ("Ternary", "012"))
+    catalog = _catalog(path)
+    first = catalog.snapshot()
+    assert list(first.digit_sets) == ["user:Ternary"]
+    assert not catalog.check()
+    assert catalog.snapshot() is first
+
+    _write(path, ("Ternary", "012"), ("Quaternary", "0123"))
+    assert catalog.check()
+    second = catalog.snapshot()
+    assert second.version > first.version
+    assert set(second.digit_sets) == {"user:Ternary", "user:Quaternary"}
+    assert first.digit_sets == {"user:Ternary": DigitSet("Ternary", "012", "user")}
+
+
+def test_rewriting_the_same_digit_sets_keeps_the_version(tmp_path):
+    path = tmp_path / "digit_sets.toml"
+    _write(path, ("Ternary", "012"))
+    catalog = _catalog(path)
+    version = catalog.version
+    path.write_text(path.read_text(encoding="utf-8") + "\n# comment\n", encoding="utf-8")
+    assert not catalog.check()
+    assert catalog.version == version
+
+
+def test_reads_poll_the_files(tmp_path):
+    path = tmp_path / "digit_sets.toml"
+    _write(path, ("Ternary", "012"))
+    catalog = _catalog(path, poll_interval=0.05)
+    version = catalog.version
+    path.unlink()
+    _wait_for(lambda: catalog.version != version)
+    assert catalog.digit_sets() == {}
+
+
+def test_watcher_reloads_the_catalog(tmp_path):
+    path = tmp_path / "digit_sets.toml"
+    catalog = _catalog(path, poll_interval=0.2)
+    assert catalog.digit_sets() == {}
+    catalog.watch()
+    try:
+        _write(path, ("Ternary", "012"))
+        _wait_for(lambda: "user:Ternary" in catalog._snapshot.digit_sets)
+    finally:
+        catalog.stop_watching()
+
+
+def test_catalog_derived_is_rebuilt_per_version(tmp_path):
+    path = tmp_path / "digit_sets.toml"
+    _write(path, ("Ternary", "012"))
+    catalog = _catalog(path)
+    builds = []
+    derived = CatalogDerived(lambda snapshot: builds.append(snapshot.version) or builds, catalog)
+    derived.get()
+    derived.get()
+    _write(path, ("Binary", "01"))
+    catalog.check()
+    derived.get()
+    assert len(builds) == 2
+
+
+def test_api_serves_the_reloaded_catalog(monkeypatch):
+    client = TestClient(APP)
+    catalog = get_catalog()
+    before = client.get("/digitsets")
+    loader = catalog._loader
+
+    def load_with_extra():
+        return {**loader(), "user:Sexagesimal": DigitSet("Sexagesimal", "0123456789" * 6, "user")}
+
+    monkeypatch.setattr(catalog, "_loader", load_with_extra)
+    try:
+        assert catalog.reload()
+        after = client.get("/digitsets")
+        assert after.headers["etag"] != before.headers["etag"]
+        assert "user:Sexagesimal" in {item["id"] for item in after.json()}
+    finally:
+        monkeypatch.undo()
+        assert catalog.reload()
+    assert client.get("/digitsets").headers["etag"] == before.headers["etag"]
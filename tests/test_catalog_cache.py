@@ -0,0 +1,135 @@
+import os
+
+from basebender.rebaser import config_loader
+from basebender.rebaser.catalog_cache import (
+    USER_SNAPSHOT_NAME,
+    IndexedDigitSets,
+    cache_dir,
+    file_signature,
+    load_package_snapshot,
+    load_user_snapshot,
+    save_user_snapshot,
+    write_package_snapshot,
+)
+from basebender.rebaser.config_loader import get_all_digit_sets, load_digit_sets_from_toml
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+DIGIT_SETS = {
+    "user:Test": DigitSet("Test", "abc", "user"),
+    "user:Blocks": DigitSet("Blocks", "0123456789ABCDEF", "user", BlockLayout(1, 1, "=")),
+}
+
+
+def _use_files(monkeypatch, package_path, user_path):
+    monkeypatch.setattr(
+        "basebender.rebaser.config_loader._get_config_paths",
+        lambda: (package_path, None, user_path, None),
+    )
+
+
+def test_cache_dir_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path))
+    assert cache_dir() == tmp_path
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", "")
+    assert cache_dir() is None
+    signature = file_signature([])
+    save_user_snapshot(signature, DIGIT_SETS)
+    assert load_user_snapshot(signature) is None
+
+
+def test_user_snapshot_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path / "cache"))
+    source = tmp_path / "digit_sets.toml"
+    source.write_text("")
+    signature = file_signature([source, None])
+    save_user_snapshot(signature, DIGIT_SETS)
+    loaded = load_user_snapshot(signature)
+    assert loaded == DIGIT_SETS
+    assert list(loaded) == list(DIGIT_SETS)
+    assert load_user_snapshot(file_signature([None, None])) is None
+
+
+def test_user_snapshot_is_indexed(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path))
+    signature = file_signature([None])
+    digit_sets = {
+        f"user:Set{index}": DigitSet(f"Set{index}", "🕐🕑🕒" + str(index), "user")
+        for index in range(100)
+    }
+    save_user_snapshot(signature, digit_sets)
+    loaded = load_user_snapshot(signature)
+    assert isinstance(loaded, IndexedDigitSets)
+    assert len(loaded) == 100
+    assert "user:Set42" in loaded
+    assert "user:Set100" not in loaded
+    assert loaded["user:Set42"] == digit_sets["user:Set42"]
+    assert loaded == load_user_snapshot(signature)
+
+    save_user_snapshot(signature, {**digit_sets, "user:Set0": DigitSet("Set0", "ab", "user")})
+    assert load_user_snapshot(signature) != loaded
+
+
+def test_truncated_user_snapshot_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path))
+    signature = file_signature([])
+    save_user_snapshot(signature, DIGIT_SETS)
+    path = tmp_path / USER_SNAPSHOT_NAME
+    path.write_bytes(path.read_bytes()[:-1])
+    assert load_user_snapshot(signature) is None
+
+
+def test_corrupt_user_snapshot_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path))
+    (tmp_path / USER_SNAPSHOT_NAME).write_bytes(b"\x00garbage")
+    assert load_user_snapshot(file_signature([])) is None
+
+
+def test_package_snapshot_requires_matching_digest(tmp_path):
+    package_path = tmp_path / "default_digit_sets.toml"
+    package_path.write_text('[[digit_sets]]\nname = "Test"\ndigits = "abc"\n')
+    snapshot_path = tmp_path / "generated" / "default_digit_sets.marshal"
+    digit_sets = load_digit_sets_from_toml(package_path, "package")
+    write_package_snapshot(package_path, digit_sets, snapshot_path)
+    assert load_package_snapshot(package_path, snapshot_path) == digit_sets
+    package_path.write_text('[[digit_sets]]\nname = "Test"\ndigits = "abcd"\n')
+    assert load_package_snapshot(package_path, snapshot_path) is None
+    assert load_package_snapshot(package_path, tmp_path / "missing.marshal") is None
+
+
+def test_get_all_digit_sets_uses_snapshot_until_files_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", str(tmp_path / "cache"))
+    user_toml = tmp_path / "digit_sets.toml"
+    user_toml.write_text('[[digit_sets]]\nname = "Mine"\ndigits = "xyz"\n')
+    _use_files(monkeypatch, tmp_path / "missing.toml", user_toml)
+    first = get_all_digit_sets()
+    assert (tmp_path / "cache" / USER_SNAPSHOT_NAME).exists()
+
+    parsed = []
+    monkeypatch.setattr(
+        config_loader,
+        "load_digit_sets_from_toml",
+        lambda *args: parsed.append(args) or load_digit_sets_from_toml(*args),
+    )
+    assert get_all_digit_sets() == first
+    assert not parsed
+
+    user_toml.write_text('[[digit_sets]]\nname = "Mine"\ndigits = "xyzw"\n')
+    stat = user_toml.stat()
+    os.utime(user_toml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert get_all_digit_sets()["user:Mine"].digits == "xyzw"
+    assert parsed
+
+
+def test_get_all_digit_sets_reads_package_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("BASEBENDER_CACHE_DIR", "")
+    package_path = tmp_path / "default_digit_sets.toml"
+    package_path.write_text('[[digit_sets]]\nname = "Test"\ndigits = "abc"\n')
+    snapshot_path = tmp_path / "default_digit_sets.marshal"
+    write_package_snapshot(package_path, [DigitSet("Snapshot", "01", "package")], snapshot_path)
+    monkeypatch.setattr(
+        config_loader,
+        "load_package_snapshot",
+        lambda path: load_package_snapshot(path, snapshot_path),
+    )
+    _use_files(monkeypatch, package_path, None)
+    assert list(get_all_digit_sets()) == ["package:Snapshot"]
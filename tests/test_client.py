@@ -0,0 +1,153 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+
+from basebender.api.main import APP
+from basebender.client import APIError, AsyncBaseBenderClient, BaseBenderClient, Batching
+
+DECIMAL = "0123456789"
+BINARY = "01"
+
+
+def _count_requests(client):
+    paths = []
+    client._http.event_hooks["request"].append(lambda request: paths.append(request.url.path))
+    return paths
+
+
+def _count_async_requests(client):
+    paths = []
+
+    async def record(request):
+        paths.append(request.url.path)
+
+    client._http.event_hooks["request"].append(record)
+    return paths
+
+
+def test_rebase_and_batch():
+    with BaseBenderClient.for_app(APP) as client:
+        assert (
+            client.rebase(
+                "255",
+                source_digit_set_id="package:Decimal",
+                target_digit_set_id="package:Hexadecimal",
+            )
+            == "FF"
+        )
+        results = client.rebase_batch(
+            ["5", "7"], source_digit_set=DECIMAL, target_digit_set=BINARY
+        )
+        assert results == ["101", "111"]
+
+
+def test_digit_sets_are_cached_and_ids_checked_locally():
+    with BaseBenderClient.for_app(APP) as client:
+        paths = _count_requests(client)
+        assert client.digit_sets()["package:Binary"].digits == BINARY
+        client.digit_sets()
+        assert paths == ["/digitsets"]
+
+        with pytest.raises(ValueError, match="package:Nope"):
+            client.rebase("1", source_digit_set_id="package:Nope", target_digit_set=BINARY)
+        assert paths == ["/digitsets"]
+
+
+def test_api_errors_are_raised():
+    with BaseBenderClient.for_app(APP) as client:
+        with pytest.raises(APIError) as exc_info:
+            client.rebase("1", source_digit_set_id="registered:0", target_digit_set=BINARY)
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.message == "Invalid Source Digit Set ID"
+
+
+def test_concurrent_calls_are_batched():
+    with BaseBenderClient.for_app(APP, batching=Batching(window=0.5, max_size=8)) as client:
+        paths = _count_requests(client)
+        results = [None] * 8
+        barrier = threading.Barrier(8)
+
+        def call(index):
+            barrier.wait()
+            results[index] = client.rebase(
+                str(index), source_digit_set=DECIMAL, target_digit_set=BINARY
+            )
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert results == [format(index, "b") if index else "0" for index in range(8)]
+    assert paths == ["/rebase/batch"]
+
+
+def test_async_client_batches_calls():
+    async def main():
+        async with AsyncBaseBenderClient.for_app(APP, batching=Batching(window=0.01)) as client:
+            paths = _count_async_requests(client)
+            results = await asyncio.gather(
+                *(
+                    client.rebase(str(n), source_digit_set=DECIMAL, target_digit_set=BINARY)
+                    for n in range(1, 20)
+                ),
+                client.rebase(
+                    "255",
+                    source_digit_set_id="package:Decimal",
+                    target_digit_set_id="package:Hexadecimal",
+                ),
+            )
+            return results, paths
+
+    results, paths = asyncio.run(main())
+    assert results[:-1] == [format(n, "b") for n in range(1, 20)]
+    assert results[-1] == "FF"
+    assert sorted(paths) == ["/digitsets", "/rebase/batch", "/rebase/batch"]
+
+
+def test_async_client_without_batching_and_errors():
+    async def main():
+        async with AsyncBaseBenderClient.for_app(APP) as client:
+            paths = _count_async_requests(client)
+            text = await client.rebase("12", source_digit_set=DECIMAL, target_digit_set=BINARY)
+            with pytest.raises(APIError):
+                await client.rebase("1", source_digit_set_id="registered:0", target_digit_set="01")
+            return text, paths
+
+    text, paths = asyncio.run(main())
+    assert text == "1100"
+    assert paths == ["/rebase", "/rebase"]
+
+
+def _short_batch_app():
+    app = FastAPI()
+
+    @app.post("/rebase/batch")
+    async def rebase_batch():
+        return {"results": [{"rebased_text": "1", "error": None}]}
+
+    return app
+
+
+def test_short_batch_response_fails_every_call():
+    with BaseBenderClient.for_app(_short_batch_app()) as client:
+        with pytest.raises(APIError, match="Expected 2 batch results, got 1"):
+            client.rebase_batch(["1", "2"], source_digit_set=DECIMAL, target_digit_set=BINARY)
+
+    async def main():
+        batching = Batching(window=0.01)
+        async with AsyncBaseBenderClient.for_app(_short_batch_app(), batching=batching) as client:
+            return await asyncio.gather(
+                *(
+                    client.rebase(text, source_digit_set=DECIMAL, target_digit_set=BINARY)
+                    for text in ("1", "2")
+                ),
+                return_exceptions=True,
+            )
+
+    results = asyncio.run(asyncio.wait_for(main(), timeout=5))
+    assert [type(result) for result in results] == [APIError, APIError]
+    assert results[0].message == "Invalid Response"
@@ -0,0 +1,148 @@
+import asyncio
+
+import httpx
+import pytest
+
+from basebender.api.coalescing import CoalescingConfig, ResultCoalescer, request_key
+from basebender.api.main import APP
+from basebender.rebaser.cancellation import RebaseTimeoutError
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+BINARY = DigitSet(name="Binary", digits="01", source="test")
+DECIMAL = DigitSet(name="Decimal", digits="0123456789", source="test")
+
+
+def test_request_key_normalizes_digit_sets():
+    renamed = DigitSet(name="Bits", digits="0110", source="other")
+    assert request_key("101", BINARY, DECIMAL) == request_key("101", renamed, DECIMAL)
+    assert request_key("101", BINARY, DECIMAL) != request_key("101", DECIMAL, BINARY)
+    assert request_key("101", BINARY, DECIMAL) != request_key("1010", BINARY, DECIMAL)
+    assert request_key("101", None, DECIMAL) != request_key("101", BINARY, DECIMAL)
+    block = DigitSet(name="Block", digits="01", source="test", block=BlockLayout(1, 8))
+    assert request_key("101", BINARY, block) != request_key("101", BINARY, BINARY)
+
+
+def test_concurrent_identical_requests_share_one_computation():
+    coalescer = ResultCoalescer(CoalescingConfig(cache_ttl=0))
+    calls = []
+
+    async def compute(token):
+        calls.append(token)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def scenario():
+        return await asyncio.gather(*(coalescer.run("key", compute) for _ in range(10)))
+
+    assert asyncio.run(scenario()) == ["result"] * 10
+    assert len(calls) == 1
+    stats = coalescer.stats()
+    assert stats.coalesced == 9
+    assert stats.in_flight == 0
+    assert stats.cache_entries == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    coalescer = ResultCoalescer()
+
+    async def compute(token):
+        await asyncio.sleep(0.01)
+        raise ValueError("bad input")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(coalescer.run("key", compute) for _ in range(3)), return_exceptions=True
+        )
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(scenario()))
+    assert coalescer.stats().cache_entries == 0
+
+
+def test_computation_is_cancelled_only_when_every_waiter_has_gone():
+    coalescer = ResultCoalescer(CoalescingConfig(cache_ttl=0))
+    tokens = []
+
+    async def compute(token):
+        tokens.append(token)
+        while True:
+            token.check()
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        first = asyncio.create_task(coalescer.run("key", compute))
+        second = asyncio.create_task(coalescer.run("key", compute))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        await asyncio.sleep(0.02)
+        assert not tokens[0].cancelled
+        second.cancel()
+        await asyncio.sleep(0.02)
+        assert tokens[0].cancelled
+        assert coalescer.stats().in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_result_cache_hits_expiry_and_budget(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("basebender.api.coalescing.time.monotonic", lambda: now[0])
+    coalescer = ResultCoalescer(CoalescingConfig(cache_ttl=5, cache_bytes=600))
+
+    async def compute(token):
+        return "x" * 100
+
+    async def run(key):
+        return await coalescer.run(key, compute)
+
+    asyncio.run(run("a"))
+    asyncio.run(run("a"))
+    stats = coalescer.stats()
+    assert (stats.cache_hits, stats.cache_misses, stats.cache_entries) == (1, 1, 1)
+
+    now[0] += 10
+    asyncio.run(run("a"))
+    assert coalescer.stats().cache_misses == 2
+
+    for key in "bcdefg":
+        asyncio.run(run(key))
+    stats = coalescer.stats()
+    assert stats.cache_evictions > 0
+    assert stats.cache_bytes <= 600
+
+
+def test_timeout_applies_to_the_shared_computation():
+    coalescer = ResultCoalescer()
+
+    async def compute(token):
+        while True:
+            token.check()
+            await asyncio.sleep(0.005)
+
+    with pytest.raises(RebaseTimeoutError):
+        asyncio.run(coalescer.run("key", compute, timeout=0.02))
+
+
+def test_api_coalesces_identical_rebase_requests():
+    payload = {
+        "input_text": "7" * 20000,
+        "source_digit_set": "0123456789",
+        "target_digit_set": "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    }
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=APP)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            before = (await client.get("/stats/coalescing")).json()
+            responses = await asyncio.gather(
+                *(client.post("/rebase", json=payload) for _ in range(5))
+            )
+            after = (await client.get("/stats/coalescing")).json()
+        return before, responses, after
+
+    before, responses, after = asyncio.run(scenario())
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.json()["rebased_text"] for response in responses}) == 1
+    shared = (after["coalesced"] - before["coalesced"]) + (
+        after["cache_hits"] - before["cache_hits"]
+    )
+    assert shared == 4
@@ -0,0 +1,137 @@
+import random
+import sys
+
+import pytest
+
+from basebender.rebaser.codegen import (
+    COMPILED_TABLE_BYTES,
+    CompiledCache,
+    clear_compiled_cache,
+    compile_digit_set_pair,
+)
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+PRINTABLE = "".join(chr(code) for code in range(33, 127))
+DIGIT_SETS = [
+    DigitSet(name="Binary", digits="01", source="test"),
+    DigitSet(name="Ternary", digits="abc", source="test"),
+    DigitSet(name="Decimal", digits="0123456789", source="test"),
+    DigitSet(name="Hexadecimal", digits="0123456789ABCDEF", source="test"),
+    DigitSet(name="Base36", digits="0123456789abcdefghijklmnopqrstuvwxyz", source="test"),
+    DigitSet(name="Base62", digits=PRINTABLE[15:77], source="test"),
+    DigitSet(name="Printable", digits=PRINTABLE, source="test"),
+    DigitSet(name="Clock", digits="🕐🕑🕒🕓🕔🕕🕖", source="test"),
+]
+
+
+def _random_input(digit_set, length, seed):
+    rng = random.Random(seed)
+    return "".join(rng.choice(digit_set.digits) for _ in range(length))
+
+
+@pytest.mark.parametrize("in_digit_set", DIGIT_SETS, ids=lambda digit_set: digit_set.name)
+@pytest.mark.parametrize("out_digit_set", DIGIT_SETS, ids=lambda digit_set: digit_set.name)
+@pytest.mark.parametrize("length", [1, 2, 17, 700])
+def test_compiled_matches_rebase(in_digit_set, out_digit_set, length):
+    rebaser = DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=in_digit_set)
+    compiled = rebaser.compile()
+    input_string = _random_input(in_digit_set, length, seed=length)
+    assert compiled(input_string) == rebaser.rebase(input_string)
+
+
+def test_compiled_handles_large_values():
+    decimal, printable = DIGIT_SETS[2], DIGIT_SETS[6]
+    rebaser = DigitSetRebaser(out_digit_set=printable, in_digit_set=decimal)
+    input_string = _random_input(decimal, 20000, seed=1)
+    compiled = rebaser.compile()
+    assert compiled(input_string) == rebaser.rebase(input_string)
+    back = DigitSetRebaser(out_digit_set=decimal, in_digit_set=printable).compile()
+    assert back(compiled(input_string)) == input_string.lstrip("0")
+
+
+@pytest.mark.parametrize("input_string", ["", "xyz", "0", "000", "1x0y1", "  10  "])
+def test_compiled_edge_cases_match_rebase(input_string):
+    rebaser = DigitSetRebaser(out_digit_set=DIGIT_SETS[3], in_digit_set=DIGIT_SETS[0])
+    assert rebaser.compile()(input_string) == rebaser.rebase(input_string)
+
+
+@pytest.mark.parametrize(
+    ("in_digits", "out_digits"), [("a", "01"), ("01", "a"), ("01", ""), ("", "01")]
+)
+@pytest.mark.parametrize("input_string", ["", "0", "1a"])
+def test_compiled_degenerate_digit_sets_match_rebase(in_digits, out_digits, input_string):
+    rebaser = DigitSetRebaser(
+        out_digit_set=DigitSet(name="Out", digits=out_digits, source="test"),
+        in_digit_set=DigitSet(name="In", digits=in_digits, source="test"),
+    )
+    assert rebaser.compile()(input_string) == rebaser.rebase(input_string)
+
+
+def test_compiled_functions_are_cached_per_pair():
+    clear_compiled_cache()
+    first = DigitSetRebaser(out_digit_set=DIGIT_SETS[0], in_digit_set=DIGIT_SETS[2]).compile()
+    second = DigitSetRebaser(out_digit_set=DIGIT_SETS[0], in_digit_set=DIGIT_SETS[2]).compile()
+    assert first is second
+    assert compile_digit_set_pair("0123456789", "011") is first
+    assert compile_digit_set_pair("0123456789", "10").output_digits == "10"
+
+
+def test_compiled_source_bakes_in_constants():
+    compiled = compile_digit_set_pair(PRINTABLE, "0123456789ABCDEF")
+    assert "def compiled_rebase" in compiled.source
+    assert f"{len(PRINTABLE) ** 2}" in compiled.source
+    assert compiled.input_digits == PRINTABLE
+
+
+def test_compiled_very_large_bases_skip_the_pair_table():
+    cjk = DigitSet(
+        name="CJK",
+        digits="".join(chr(code) for code in range(0x4E00, 0x4E00 + 5000)),
+        source="test",
+    )
+    rebaser = DigitSetRebaser(out_digit_set=DIGIT_SETS[2], in_digit_set=cjk)
+    compiled = rebaser.compile()
+    assert "_PAIRS" not in compiled.source
+    input_string = _random_input(cjk, 50, seed=3)
+    assert compiled(input_string) == rebaser.rebase(input_string)
+
+
+@pytest.mark.parametrize(
+    "output_digits",
+    ["012", "".join(chr(code) for code in range(0x100, 0x100 + 255))],
+)
+def test_compiled_chunk_table_fits_the_memory_budget(output_digits):
+    compiled = compile_digit_set_pair(DIGIT_SETS[2].digits, output_digits)
+    chunks = compiled.function.__globals__["_CHUNKS"]
+    table_bytes = sys.getsizeof(chunks) + sum(map(sys.getsizeof, chunks))
+    assert table_bytes <= COMPILED_TABLE_BYTES
+    out_digit_set = DigitSet(name="Out", digits=output_digits, source="test")
+    rebaser = DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=DIGIT_SETS[2])
+    assert compiled("9" * 200) == rebaser.rebase("9" * 200)
+
+
+def test_compiled_cache_is_bounded_by_memory():
+    first = compile_digit_set_pair(DIGIT_SETS[2].digits, "012")
+    cache = CompiledCache[str](max_bytes=first.table_bytes * 2 + 10_000)
+    for key in "abc":
+        cache.put(key, first)
+    assert len(cache) == 2
+    assert cache.lookup("a") == (False, None)
+    assert cache.lookup("c") == (True, first)
+    assert cache.nbytes <= first.table_bytes * 2 + 10_000
+
+
+def test_compile_requires_explicit_digit_sets():
+    with pytest.raises(ValueError, match="explicit input and output"):
+        DigitSetRebaser(out_digit_set=DIGIT_SETS[0]).compile()
+    with pytest.raises(ValueError, match="explicit input and output"):
+        DigitSetRebaser(in_digit_set=DIGIT_SETS[0]).compile()
+
+
+def test_compile_rejects_block_digit_sets():
+    block = DigitSet(
+        name="Hex Block", digits="0123456789ABCDEF", source="test", block=BlockLayout(1, 2)
+    )
+    with pytest.raises(ValueError, match="Block-mode"):
+        DigitSetRebaser(out_digit_set=block, in_digit_set=DIGIT_SETS[0]).compile()
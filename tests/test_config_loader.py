@@ -6,6 +6,7 @@ from basebender.rebaser.config_loader import (
     load_ui_state,
     save_ui_state,
 )
+from basebender.rebaser.models import BlockLayout
 
 
 def test_load_digit_sets_from_toml_file_not_found():
@@ -70,3 +71,32 @@ def test_load_ui_state_missing_file(tmp_path, monkeypatch):
     )
     result = load_ui_state()
     assert result == {}
+
+
+def test_load_digit_sets_from_toml_block_mode(tmp_path):
+    toml_file = tmp_path / "block.toml"
+    toml_file.write_text(
+        "[[digit_sets]]\n"
+        'name = "Base16 Block"\n'
+        'digits = "0123456789ABCDEF"\n'
+        'mode = "block"\n'
+        "block_size = 1\n"
+    )
+    result = load_digit_sets_from_toml(toml_file, "test")
+    assert len(result) == 1
+    assert result[0].mode == "block"
+    assert result[0].block == BlockLayout(block_size=1, block_chars=2, padding="")
+
+
+def test_load_digit_sets_from_toml_invalid_block_settings(tmp_path):
+    toml_file = tmp_path / "block.toml"
+    toml_file.write_text(
+        "[[digit_sets]]\n"
+        'name = "Broken"\n'
+        'digits = "01"\n'
+        'mode = "block"\n'
+        "block_size = 1\n"
+        "block_chars = 2\n"
+        '[[digit_sets]]\nname = "Unknown"\ndigits = "01"\nmode = "other"\n'
+    )
+    assert load_digit_sets_from_toml(toml_file, "test") == []
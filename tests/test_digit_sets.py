@@ -1,7 +1,9 @@
 from basebender.rebaser.digit_sets import (
+    SuggestIndex,
     get_predefined_digit_sets,
     suggest_digit_sets,
 )
+from basebender.rebaser.models import BlockLayout, DigitSet
 
 
 def test_get_predefined_digit_sets_returns_all():
@@ -43,3 +45,40 @@ def test_suggest_digit_sets_no_match():
 def test_suggest_digit_sets_empty_string():
     suggestions = suggest_digit_sets("")
     assert len(suggestions) == 0
+
+
+def test_suggest_digit_sets_ranks_smallest_first_and_limits():
+    suggestions = suggest_digit_sets("101")
+    assert suggestions[0] == "package:Binary"
+    assert suggest_digit_sets("101", limit=2) == suggestions[:2]
+
+
+def test_suggest_index_matches_linear_scan():
+    digit_sets = {
+        "a": DigitSet("a", "0123456789", "test"),
+        "b": DigitSet("b", "01", "test"),
+        "c": DigitSet("c", "0123456789ABCDEF", "test"),
+        "d": DigitSet("d", "012", "test"),
+        "e": DigitSet("e", "xyz", "test"),
+    }
+    index = SuggestIndex(digit_sets)
+    for text in ["0", "01", "012", "9", "A0", "xy", "0x", "?"]:
+        found = [suggestion.digit_set_id for suggestion in index.suggest(text)]
+        expected = sorted(
+            (key for key, value in digit_sets.items() if set(text) <= set(value.digits)),
+            key=lambda key: len(digit_sets[key].digits),
+        )
+        assert found == expected
+
+
+def test_suggest_index_coverage_and_block_padding():
+    index = SuggestIndex(
+        {
+            "Quaternary": DigitSet("Quaternary", "0123", "test"),
+            "Padded": DigitSet("Padded", "0123", "test", BlockLayout(1, 4, "=")),
+        }
+    )
+    (suggestion,) = index.suggest("01=")
+    assert suggestion.digit_set_id == "Padded"
+    assert suggestion.coverage == 3 / 5
+    assert index.suggest("0123")[0].coverage == 1.0
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.engines import (
+    ConversionContext,
+    ConversionEngine,
+    get_engines,
+    plan_conversion,
+    register_engine,
+)
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+BINARY = DigitSet(name="Binary", digits="01", source="test")
+OCTAL = DigitSet(name="Octal", digits="01234567", source="test")
+DECIMAL = DigitSet(name="Decimal", digits="0123456789", source="test")
+HEX = DigitSet(name="Hexadecimal", digits="0123456789ABCDEF", source="test")
+BASE62 = DigitSet(
+    name="Base62",
+    digits="0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    source="test",
+)
+BASE64 = DigitSet(
+    name="Base64",
+    digits="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    source="test",
+)
+CLOCK = DigitSet(name="Clock", digits="🕐🕑🕒🕓🕔🕕🕖🕗🕘🕙🕚🕛", source="test")
+BASE64_BLOCK = DigitSet(
+    name="Base64 Block",
+    digits=BASE64.digits,
+    source="test",
+    block=BlockLayout(block_size=3, block_chars=4, padding="="),
+)
+
+PAIRS = [
+    (BINARY, DECIMAL),
+    (DECIMAL, HEX),
+    (HEX, BINARY),
+    (OCTAL, BASE64),
+    (BASE64, HEX),
+    (BASE62, CLOCK),
+    (CLOCK, DECIMAL),
+]
+
+
+def _reference(text, source, target):
+    value = 0
+    for char in text:
+        if char in source.digits:
+            value = value * len(source.digits) + source.digits.index(char)
+    return DigitSetRebaser.int_to_string_in_base(value, list(target.digits), len(target.digits))
+
+
+def _random_input(source, length, seed):
+    generator = random.Random(seed)
+    return "".join(generator.choice(source.digits) for _ in range(length))
+
+
+@pytest.mark.parametrize(("source", "target"), PAIRS)
+@pytest.mark.parametrize("length", [1, 5, 300, 5000])
+def test_every_eligible_engine_matches_reference(source, target, length):
+    text = _random_input(source, length, seed=length)
+    expected = _reference(text, source, target)
+    plan = DigitSetRebaser(out_digit_set=target, in_digit_set=source).plan(text)
+    assert plan is not None
+    for engine in plan.costs:
+        rebaser = DigitSetRebaser(out_digit_set=target, in_digit_set=source, engine=engine)
+        assert rebaser.rebase(text) == expected, engine
+
+
+def test_engines_ignore_foreign_characters_and_leading_zeros():
+    for engine in ("chunked", "divide-and-conquer", "native", "bit-regrouping"):
+        rebaser = DigitSetRebaser(out_digit_set=BINARY, in_digit_set=HEX, engine=engine)
+        assert rebaser.rebase("00 0F-F") == "11111111", engine
+        assert rebaser.rebase("0x") == "0", engine
+
+
+def test_selection_prefers_linear_engines_for_power_of_two_bases():
+    rebaser = DigitSetRebaser(out_digit_set=BASE64, in_digit_set=HEX)
+    rebaser.rebase("DEADBEEF" * 100)
+    assert rebaser.last_plan is not None
+    assert rebaser.last_plan.engine == "bit-regrouping"
+    assert not rebaser.last_plan.forced
+
+
+def test_selection_prefers_divide_and_conquer_for_large_inputs():
+    text = _random_input(BASE62, 100_000, seed=1)
+    plan = DigitSetRebaser(out_digit_set=CLOCK, in_digit_set=BASE62).plan(text)
+    assert plan is not None
+    assert plan.engine == "divide-and-conquer"
+    small_plan = DigitSetRebaser(out_digit_set=CLOCK, in_digit_set=BASE62).plan("Zz")
+    assert small_plan is not None
+    assert small_plan.engine == "chunked"
+
+
+def test_block_digit_sets_use_block_engine():
+    plan = DigitSetRebaser(out_digit_set=BASE64_BLOCK, in_digit_set=HEX).plan("DEADBEEF")
+    assert plan is not None
+    assert list(plan.costs) == ["block"]
+
+
+def test_explain_describes_the_plan():
+    rebaser = DigitSetRebaser(out_digit_set=DECIMAL, in_digit_set=BINARY, engine="chunked")
+    explanation = rebaser.explain("101")
+    assert "Engine: chunked (forced by caller)" in explanation
+    assert "native" in explanation
+    assert DigitSetRebaser(in_digit_set=BINARY).explain("101").startswith("No conversion")
+
+
+def test_forced_engine_errors():
+    with pytest.raises(ValueError, match="Unknown conversion engine 'missing'."):
+        DigitSetRebaser(out_digit_set=DECIMAL, in_digit_set=BINARY, engine="missing")
+    rebaser = DigitSetRebaser(out_digit_set=BASE62, in_digit_set=BINARY, engine="native")
+    with pytest.raises(ValueError, match="cannot perform this rebase"):
+        rebaser.rebase("101")
+
+
+def test_registered_engine_is_selected_when_cheapest():
+    class ReversingEngine(ConversionEngine):
+        name = "test-reversing"
+        description = "Test engine that reverses the input."
+
+        def is_eligible(self, context):
+            return context.input_base == 3
+
+        def estimate_cost(self, context):
+            return -1.0
+
+        def parse(self, input_string, context):
+            yield
+            return int(input_string[::-1], 3)
+
+        def render(self, value, context):
+            yield
+            return str(value)
+
+    register_engine(ReversingEngine())
+    try:
+        ternary = DigitSet(name="Ternary", digits="012", source="test")
+        context = ConversionContext(
+            input_length=2,
+            input_digit_set_map={"0": 0, "1": 1, "2": 2},
+            input_digit_set_list=["0", "1", "2"],
+            output_digit_set_list=list(DECIMAL.digits),
+        )
+        assert plan_conversion(context).engine == "test-reversing"
+        assert DigitSetRebaser(out_digit_set=DECIMAL, in_digit_set=ternary).rebase("21") == "5"
+    finally:
+        del get_engines()["test-reversing"]
@@ -0,0 +1,198 @@
+import asyncio
+import random
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from basebender.api import main
+from basebender.api.main import APP
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.live import LiveRebase
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+BINARY = DigitSet(name="Binary", digits="01", source="test")
+DECIMAL = DigitSet(name="Decimal", digits="0123456789", source="test")
+HEX = DigitSet(name="Hex", digits="0123456789abcdef", source="test")
+
+client = TestClient(APP)
+
+
+@pytest.mark.parametrize(
+    ("source", "target"), [(DECIMAL, BINARY), (BINARY, HEX), (HEX, DECIMAL), (DECIMAL, HEX)]
+)
+def test_random_edits_match_full_rebase(source, target):
+    rebaser = DigitSetRebaser(out_digit_set=target, in_digit_set=source)
+    live = LiveRebase(rebaser, compiled_chars=0)
+    assert live.incremental
+    generator = random.Random(7)
+    alphabet = source.digits + " x"
+    for _ in range(200):
+        choice = generator.random()
+        if choice < 0.5:
+            live.append("".join(generator.choices(alphabet, k=generator.randint(0, 40))))
+        elif choice < 0.8:
+            live.delete(generator.randint(0, 30))
+        else:
+            text = "".join(generator.choices(alphabet, k=generator.randint(0, 20)))
+            live.replace(text, start=generator.randint(0, len(live.text)))
+        assert live.rebase() == rebaser.rebase(live.text)
+
+
+def test_compiled_function_handles_short_inputs():
+    rebaser = DigitSetRebaser(out_digit_set=BINARY, in_digit_set=DECIMAL)
+    live = LiveRebase(rebaser, rebaser.compile())
+    live.append("255")
+    assert live.rebase() == "11111111"
+    live.delete(10)
+    assert live.text == ""
+    assert live.rebase() == "0"
+
+
+def test_other_rebasers_convert_from_scratch():
+    block = DigitSet(
+        name="Block", digits="0123456789abcdef", source="test", block=BlockLayout(1, 2)
+    )
+    for rebaser in (
+        DigitSetRebaser(out_digit_set=BINARY),
+        DigitSetRebaser(out_digit_set=block, in_digit_set=DECIMAL),
+    ):
+        live = LiveRebase(rebaser)
+        assert not live.incremental
+        live.append("1201")
+        assert live.rebase() == rebaser.rebase("1201")
+
+
+def test_invalid_edits_are_rejected():
+    live = LiveRebase(DigitSetRebaser(out_digit_set=BINARY, in_digit_set=DECIMAL))
+    live.append("12")
+    with pytest.raises(ValueError):
+        live.delete(-1)
+    with pytest.raises(ValueError):
+        live.replace("3", start=5)
+    assert live.text == "12"
+
+
+def _receive_result(websocket):
+    message = websocket.receive_json()
+    assert message["type"] == "result", message
+    return message
+
+
+def test_live_session_pushes_results_for_edits():
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_json(
+            {"type": "configure", "source_digit_set": "0123456789", "target_digit_set": "01"}
+        )
+        assert _receive_result(websocket)["rebased_text"] == "0"
+        websocket.send_json({"type": "append", "text": "12", "seq": 1})
+        result = _receive_result(websocket)
+        assert (result["seq"], result["rebased_text"], result["input_length"]) == (1, "1100", 2)
+        websocket.send_json({"type": "delete", "count": 1, "seq": 2})
+        assert _receive_result(websocket)["rebased_text"] == "1"
+        websocket.send_json({"type": "replace", "text": "255", "seq": 3})
+        assert _receive_result(websocket)["rebased_text"] == "11111111"
+        websocket.send_json(
+            {
+                "type": "configure",
+                "source_digit_set": "0123456789",
+                "target_digit_set_id": "package:Hexadecimal",
+            }
+        )
+        result = _receive_result(websocket)
+        assert result["rebased_text"] == "FF"
+        assert result["target_digit_set_used"] == "Hexadecimal"
+
+
+def test_live_session_reports_errors_and_continues():
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json()["message"] == "Invalid Message"
+        websocket.send_json({"type": "configure", "source_digit_set_id": "missing", "seq": 4})
+        error = websocket.receive_json()
+        assert (error["type"], error["seq"]) == ("error", 4)
+        assert error["message"] == "Invalid Source Digit Set ID"
+        websocket.send_json({"type": "replace", "text": "1", "start": 3, "seq": 5})
+        assert websocket.receive_json()["message"] == "Invalid Edit"
+        websocket.send_json({"type": "append", "text": "abc", "seq": 6})
+        result = _receive_result(websocket)
+        assert (result["seq"], result["rebased_text"]) == (6, "abc")
+
+
+def test_live_session_skips_outdated_results():
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_json(
+            {"type": "configure", "source_digit_set": "0123456789", "target_digit_set": "01"}
+        )
+        _receive_result(websocket)
+        for seq in range(1, 51):
+            websocket.send_json({"type": "append", "text": "9" * 2000, "seq": seq})
+        results = []
+        while not results or results[-1]["seq"] != 50:
+            results.append(_receive_result(websocket))
+    seqs = [result["seq"] for result in results]
+    assert seqs == sorted(seqs)
+    assert results[-1]["input_length"] == 100000
+    expected = DigitSetRebaser(out_digit_set=BINARY, in_digit_set=DECIMAL).rebase("9" * 100000)
+    assert results[-1]["rebased_text"] == expected
+
+
+def test_live_session_limits_the_input_in_utf8_bytes(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_MAX_INPUT_BYTES", "5")
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_json({"type": "append", "text": "\u00e9\u00e9", "seq": 1})
+        assert _receive_result(websocket)["rebased_text"] == "\u00e9\u00e9"
+        websocket.send_json({"type": "append", "text": "\u00e9", "seq": 2})
+        error = websocket.receive_json()
+        assert (error["seq"], error["message"]) == (2, "Invalid Edit")
+        websocket.send_json({"type": "delete", "count": 1, "seq": 3})
+        assert _receive_result(websocket)["rebased_text"] == "\u00e9"
+        websocket.send_json({"type": "replace", "text": "abcde", "seq": 4})
+        assert _receive_result(websocket)["rebased_text"] == "abcde"
+
+
+def test_live_session_closes_clients_that_flood_the_queue(monkeypatch):
+    monkeypatch.setattr("basebender.api.live.MAX_LIVE_PENDING_MESSAGES", 0)
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_json({"type": "append", "text": "1"})
+        with pytest.raises(WebSocketDisconnect) as exc_info:
+            websocket.receive_json()
+    assert exc_info.value.code == 1008
+
+
+def test_live_session_reports_binary_frames_and_continues():
+    with client.websocket_connect("/rebase/live") as websocket:
+        websocket.send_bytes(b"hi")
+        error = websocket.receive_json()
+        assert (error["type"], error["seq"], error["message"]) == (
+            "error",
+            None,
+            "Invalid Message",
+        )
+        websocket.send_json({"type": "append", "text": "abc", "seq": 1})
+        assert _receive_result(websocket)["rebased_text"] == "abc"
+
+
+class _RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def test_live_session_results_carry_the_seq_of_applied_edits_only():
+    async def scenario():
+        websocket = _RecordingWebSocket()
+        session = main._live_session(websocket)
+        session.receive('{"type": "append", "text": "12", "seq": 1}')
+        session.receive('{"type": "replace", "text": "3", "start": 9, "seq": 2}')
+        worker = asyncio.create_task(session.run())
+        while len(websocket.sent) < 2:
+            await asyncio.sleep(0.01)
+        worker.cancel()
+        return websocket.sent
+
+    error, result = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert (error["type"], error["seq"], error["message"]) == ("error", 2, "Invalid Edit")
+    assert (result["type"], result["seq"], result["rebased_text"]) == ("result", 1, "12")
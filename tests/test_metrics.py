@@ -0,0 +1,135 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from basebender.api.main import APP
+from basebender.api.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    GaugeFunction,
+    Histogram,
+    MetricsRegistry,
+    input_size_class,
+)
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.engines import add_phase_observer, remove_phase_observer
+from basebender.rebaser.models import DigitSet
+
+client = TestClient(APP)
+
+
+def _sample(text, line_start):
+    """Returns the value of the first sample line starting with `line_start`."""
+    for line in text.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_input_size_class_boundaries():
+    assert input_size_class(0) == "<=64"
+    assert input_size_class(64) == "<=64"
+    assert input_size_class(65) == "<=1024"
+    assert input_size_class(262145) == ">262144"
+
+
+def test_counter_merges_thread_shards():
+    counter = Counter("test_events", "Events.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc("b", amount=2.5)
+    assert counter.values() == {("a",): 4000.0, ("b",): 2.5}
+    assert 'test_events_total{kind="a"} 4000' in counter.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Durations.", ("endpoint",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/x")
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP test_seconds Durations.", "# TYPE test_seconds histogram"]
+    assert lines[2:] == [
+        'test_seconds_bucket{endpoint="/x",le="0.1"} 1',
+        'test_seconds_bucket{endpoint="/x",le="1"} 3',
+        'test_seconds_bucket{endpoint="/x",le="+Inf"} 4',
+        'test_seconds_sum{endpoint="/x"} 6.05',
+        'test_seconds_count{endpoint="/x"} 4',
+    ]
+
+
+def test_registry_renders_gauges_and_escapes_labels():
+    registry = MetricsRegistry()
+    registry.register(GaugeFunction("test_level", "Level.", ("name",), lambda: [(('a"b',), 3)]))
+    assert registry.render() == (
+        '# HELP test_level Level.\n# TYPE test_level gauge\ntest_level{name="a\\"b"} 3\n'
+    )
+
+
+def test_phase_observers_receive_parse_and_render_times():
+    observed = []
+
+    def observer(engine_name, phase, seconds):
+        observed.append((engine_name, phase, seconds))
+
+    rebaser = DigitSetRebaser(
+        out_digit_set=DigitSet(name="Hex", digits="0123456789abcdef", source="test"),
+        in_digit_set=DigitSet(name="Decimal", digits="0123456789", source="test"),
+    )
+    add_phase_observer(observer)
+    try:
+        assert rebaser.rebase("255") == "ff"
+    finally:
+        remove_phase_observer(observer)
+    assert [phase for _, phase, _ in observed] == ["parse", "render"]
+    assert all(seconds >= 0 for _, _, seconds in observed)
+
+
+def test_metrics_endpoint_reports_requests_conversions_and_caches():
+    payload = {
+        "input_text": "9" * 5000,
+        "source_digit_set": "0123456789",
+        "target_digit_set": "01",
+    }
+    before = client.get("/metrics").text
+    assert client.post("/rebase", json=payload).status_code == 200
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CONTENT_TYPE
+    text = response.text
+    requests = 'basebender_requests_total{endpoint="/rebase",status="200"}'
+    assert _sample(text, requests) == _sample(before, requests) + 1
+    latency = 'basebender_request_duration_seconds_count{endpoint="/rebase",input_chars="<=16384"}'
+    assert _sample(text, latency) == _sample(before, latency) + 1
+    assert 'basebender_conversion_phase_seconds_count{engine="' in text
+    assert 'phase="parse"}' in text and 'phase="render"}' in text
+    assert 'basebender_cache_hits_total{cache="rebaser"}' in text
+    assert 'basebender_conversions{route="inline",state="running"}' in text
+    assert "# TYPE basebender_requests_in_flight gauge" in text
+
+
+def test_metrics_count_errors_by_type():
+    errors = 'basebender_errors_total{endpoint="/rebase",type="Invalid Source Digit Set ID"}'
+    before = _sample(client.get("/metrics").text, errors)
+    payload = {"input_text": "1", "source_digit_set_id": "package:NonExistent"}
+    assert client.post("/rebase", json=payload).status_code == 400
+    assert client.post("/rebase", json={"input_text": 5}).status_code == 422
+
+    text = client.get("/metrics").text
+    assert _sample(text, errors) == before + 1
+    assert 'basebender_errors_total{endpoint="/rebase",type="Validation Error"}' in text
+
+
+def test_unknown_paths_share_one_endpoint_label():
+    client.get("/no/such/path")
+    assert (
+        'basebender_requests_total{endpoint="other",status="404"}' in client.get("/metrics").text
+    )
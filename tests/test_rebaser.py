@@ -4,10 +4,14 @@ This module contains unit tests for the `rebaser` package,
 specifically for the `DigitSetRebaser` class.
 """
 
+import asyncio
+import threading
+
 import pytest
 
+from basebender.rebaser.cancellation import CancellationToken, RebaseTimeoutError
 from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
-from basebender.rebaser.models import DigitSet
+from basebender.rebaser.models import BlockLayout, DigitSet
 
 # Define some common DigitSet instances for testing
 DECIMAL_DIGIT_SET = DigitSet(name="Decimal", digits="0123456789", source="test")
@@ -397,3 +401,183 @@ def test_rebase_with_explicitly_empty_output_digit_set() -> None:
     assert rebaser.rebase("123") == ""
     assert rebaser.rebase("0") == ""
     assert rebaser.rebase("") == ""
+
+
+BASE64_BLOCK_DIGIT_SET = DigitSet(
+    name="Base64 Block",
+    digits="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    source="test",
+    block=BlockLayout(block_size=3, block_chars=4, padding="="),
+)
+
+
+def test_rebase_hexadecimal_to_block_digit_set() -> None:
+    """
+    Tests rebasing a positional digit set into a block-mode digit set. It
+    verifies that the value is encoded as its big-endian bytes, block by block.
+    """
+    rebaser = DigitSetRebaser(out_digit_set=BASE64_BLOCK_DIGIT_SET, in_digit_set=HEX_DIGIT_SET)
+    assert rebaser.rebase("DEADBEEF") == "3q2+7w=="
+    assert rebaser.rebase("0") == "AA=="
+    assert rebaser.rebase("") == ""
+
+
+def test_rebase_block_digit_set_to_hexadecimal() -> None:
+    """
+    Tests rebasing a block-mode digit set into a positional digit set. It
+    verifies that the decoded bytes are rendered as a big-endian number.
+    """
+    rebaser = DigitSetRebaser(out_digit_set=HEX_DIGIT_SET, in_digit_set=BASE64_BLOCK_DIGIT_SET)
+    assert rebaser.rebase("3q2+7w==") == "DEADBEEF"
+    assert rebaser.rebase("") == "0"
+
+
+def test_rebase_between_block_digit_sets() -> None:
+    """
+    Tests rebasing between two block-mode digit sets. It verifies that the
+    bytes are re-encoded without going through a positional number.
+    """
+    base16_block = DigitSet(
+        name="Base16 Block",
+        digits="0123456789ABCDEF",
+        source="test",
+        block=BlockLayout(block_size=1, block_chars=2),
+    )
+    rebaser = DigitSetRebaser(out_digit_set=BASE64_BLOCK_DIGIT_SET, in_digit_set=base16_block)
+    assert rebaser.rebase("00666F6F") == "AGZvbw=="
+
+
+def test_arebase_matches_rebase():
+    rebaser = DigitSetRebaser(out_digit_set=BASE62_DIGIT_SET, in_digit_set=DECIMAL_DIGIT_SET)
+    input_string = "123456789" * 3000
+    assert asyncio.run(rebaser.arebase(input_string)) == rebaser.rebase(input_string)
+
+
+@pytest.mark.parametrize("input_string", ["", "ABC", "1010"])
+def test_arebase_matches_rebase_for_trivial_inputs(input_string):
+    rebaser = DigitSetRebaser(out_digit_set=DECIMAL_DIGIT_SET, in_digit_set=BINARY_DIGIT_SET)
+    assert asyncio.run(rebaser.arebase(input_string)) == rebaser.rebase(input_string)
+
+
+def test_arebase_yields_to_other_tasks():
+    rebaser = DigitSetRebaser(
+        out_digit_set=BASE62_DIGIT_SET, in_digit_set=DECIMAL_DIGIT_SET, engine="chunked"
+    )
+    ticks = 0
+
+    async def ticker(done):
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0)
+
+    async def main():
+        done = asyncio.Event()
+        ticker_task = asyncio.create_task(ticker(done))
+        result = await rebaser.arebase("9" * 50000, slice_budget=0)
+        done.set()
+        await ticker_task
+        return result
+
+    assert asyncio.run(main()) == rebaser.rebase("9" * 50000)
+    assert ticks > 1
+
+
+def test_rebase_with_expired_token_raises_timeout():
+    rebaser = DigitSetRebaser(out_digit_set=BASE62_DIGIT_SET, in_digit_set=DECIMAL_DIGIT_SET)
+    with pytest.raises(RebaseTimeoutError, match="time limit of 0 s"):
+        rebaser.rebase("123456789" * 1000, token=CancellationToken(0))
+
+
+def test_rebase_cancelled_from_another_thread():
+    rebaser = DigitSetRebaser(
+        out_digit_set=BASE62_DIGIT_SET, in_digit_set=DECIMAL_DIGIT_SET, engine="chunked"
+    )
+    token = CancellationToken()
+    timer = threading.Timer(0.05, token.cancel)
+    timer.start()
+    try:
+        with pytest.raises(RebaseTimeoutError, match="cancelled"):
+            rebaser.rebase("9" * 2_000_000, token=token)
+    finally:
+        timer.cancel()
+
+
+def test_arebase_with_expired_token_raises_timeout():
+    rebaser = DigitSetRebaser(out_digit_set=BASE62_DIGIT_SET, in_digit_set=DECIMAL_DIGIT_SET)
+    with pytest.raises(TimeoutError):
+        asyncio.run(rebaser.arebase("1234", token=CancellationToken(0)))
+
+
+def test_rebase_with_generous_token_succeeds():
+    rebaser = DigitSetRebaser(out_digit_set=DECIMAL_DIGIT_SET, in_digit_set=BINARY_DIGIT_SET)
+    token = CancellationToken(60)
+    assert rebaser.rebase("1010", token=token) == "10"
+    assert 0 < token.remaining() <= 60
+
+
+BASE64_DIGITS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+BASE64_POSITIONAL = DigitSet(name="Base64", digits=BASE64_DIGITS, source="test")
+BASE64_BLOCK = DigitSet(
+    name="Base64 Block", digits=BASE64_DIGITS, source="test", block=BlockLayout(3, 4, "=")
+)
+HEX_BLOCK = DigitSet(
+    name="Hex Block", digits="0123456789abcdef", source="test", block=BlockLayout(1, 2)
+)
+
+
+def _chunks(text, size):
+    return [text[offset : offset + size] for offset in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize(
+    ("in_digit_set", "out_digit_set"),
+    [
+        (HEX_DIGIT_SET, BINARY_DIGIT_SET),
+        (BINARY_DIGIT_SET, HEX_DIGIT_SET),
+        (HEX_DIGIT_SET, BASE64_POSITIONAL),
+        (BASE64_POSITIONAL, OCTAL_DIGIT_SET),
+        (DECIMAL_DIGIT_SET, DigitSet(name="Letters", digits="abcdefghij", source="test")),
+    ],
+)
+@pytest.mark.parametrize("input_string", ["", "0", "0001", "10 1x0", "1" * 37, "0110" * 50])
+def test_iter_rebase_positional_matches_rebase(in_digit_set, out_digit_set, input_string):
+    rebaser = DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=in_digit_set)
+    assert rebaser.is_streamable()
+    digit_count = rebaser.count_input_digits(input_string)
+    for size in (1, 3, 64):
+        chunks = _chunks(input_string, size)
+        assert "".join(rebaser.iter_rebase(chunks, digit_count)) == rebaser.rebase(input_string)
+
+
+def test_iter_rebase_block_matches_rebase():
+    rebaser = DigitSetRebaser(out_digit_set=BASE64_BLOCK, in_digit_set=HEX_BLOCK)
+    input_string = bytes(range(256)).hex() + "4142"
+    assert rebaser.is_streamable()
+    assert not rebaser.streaming_needs_digit_count()
+    assert "".join(rebaser.iter_rebase(_chunks(input_string, 7))) == rebaser.rebase(input_string)
+
+
+def test_iter_rebase_requires_digit_count_for_grouped_input():
+    rebaser = DigitSetRebaser(out_digit_set=HEX_DIGIT_SET, in_digit_set=BINARY_DIGIT_SET)
+    assert rebaser.streaming_needs_digit_count()
+    with pytest.raises(ValueError, match="total number of input digits"):
+        list(rebaser.iter_rebase(["101"]))
+    with pytest.raises(ValueError, match="ended before"):
+        list(rebaser.iter_rebase(["101"], digit_count=6))
+
+
+@pytest.mark.parametrize(
+    ("in_digit_set", "out_digit_set"),
+    [
+        (DECIMAL_DIGIT_SET, BINARY_DIGIT_SET),
+        (HEX_BLOCK, HEX_DIGIT_SET),
+        (None, HEX_DIGIT_SET),
+        (HEX_DIGIT_SET, SINGLE_CHAR_DIGIT_SET),
+    ],
+)
+def test_unrelated_pairs_are_not_streamable(in_digit_set, out_digit_set):
+    rebaser = DigitSetRebaser(out_digit_set=out_digit_set, in_digit_set=in_digit_set)
+    assert not rebaser.is_streamable()
+    with pytest.raises(ValueError, match="cannot be rebased in chunks"):
+        rebaser.incremental_rebase()
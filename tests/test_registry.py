@@ -0,0 +1,83 @@
+import os
+import time
+
+import pytest
+
+from basebender.api.registry import DigitSetRegistry, registered_digit_set_id
+
+
+def test_register_returns_content_hash_id():
+    registry = DigitSetRegistry()
+    registration = registry.register("0123456789abcdefa", name="Hex")
+    assert registration.created
+    assert registration.digit_set_id == registered_digit_set_id("0123456789abcdef")
+    assert registration.digit_set.digits == "0123456789abcdef"
+    assert registry.get(registration.digit_set_id) is registration.digit_set
+
+
+def test_repeat_registration_is_deduplicated():
+    registry = DigitSetRegistry()
+    first = registry.register("01")
+    second = registry.register("0101", name="Other")
+    assert not second.created
+    assert second.digit_set is first.digit_set
+    assert second.expires_at >= first.expires_at
+    assert len(registry) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    registry = DigitSetRegistry(max_entries=2)
+    first = registry.register("01")
+    second = registry.register("012")
+    registry.get(first.digit_set_id)
+    third = registry.register("0123")
+    assert registry.get(second.digit_set_id) is None
+    assert registry.get(first.digit_set_id) is not None
+    assert registry.get(third.digit_set_id) is not None
+
+
+def test_registrations_expire():
+    registry = DigitSetRegistry(ttl=0.01)
+    registration = registry.register("01")
+    time.sleep(0.02)
+    assert registry.get(registration.digit_set_id) is None
+    assert len(registry) == 0
+
+
+def test_single_digit_alphabet_is_rejected():
+    with pytest.raises(ValueError, match="at least two distinct digits"):
+        DigitSetRegistry().register("aaa")
+
+
+def test_registrations_are_shared_through_the_directory(tmp_path):
+    first = DigitSetRegistry(directory=tmp_path)
+    second = DigitSetRegistry(directory=tmp_path)
+    registration = first.register("0123456789abcdef", name="Hex")
+    shared = second.get(registration.digit_set_id)
+    assert shared == registration.digit_set
+    repeat = second.register("0123456789abcdef", name="Other")
+    assert not repeat.created
+    assert repeat.digit_set.name == "Hex"
+
+
+def test_shared_registrations_expire_and_are_pruned(tmp_path):
+    registration = DigitSetRegistry(ttl=0.01, directory=tmp_path).register("01")
+    time.sleep(0.02)
+    assert DigitSetRegistry(ttl=0.01, directory=tmp_path).get(registration.digit_set_id) is None
+    registry = DigitSetRegistry(max_entries=1, directory=tmp_path)
+    older = registry.register("012").digit_set_id.partition(":")[2]
+    os.utime(tmp_path / f"{older}.json", (time.time() - 1, time.time() - 1))
+    registry.register("0123")
+    assert [path.stem for path in tmp_path.glob("*.json")] == [
+        registered_digit_set_id("0123").partition(":")[2]
+    ]
+
+
+def test_shared_lookup_rejects_foreign_ids_and_files(tmp_path):
+    registry = DigitSetRegistry(directory=tmp_path)
+    assert registry.get("registered:../../etc/passwd") is None
+    digit_set_id = registered_digit_set_id("01")
+    (tmp_path / f"{digit_set_id.partition(':')[2]}.json").write_text(
+        '{"name": "Forged", "digits": "012"}'
+    )
+    assert registry.get(digit_set_id) is None
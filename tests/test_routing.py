@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from basebender.api import routing
+from basebender.api.routing import (
+    ROUTE_INLINE,
+    ROUTE_PROCESS,
+    ROUTE_THREAD,
+    RequestRouter,
+    RoutingConfig,
+)
+from basebender.rebaser.cancellation import CancellationToken, RebaseTimeoutError
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.models import DigitSet
+
+DECIMAL = DigitSet(name="Decimal", digits="0123456789", source="test")
+BASE62 = DigitSet(
+    name="Base62",
+    digits="0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    source="test",
+)
+REBASER = DigitSetRebaser(out_digit_set=BASE62, in_digit_set=DECIMAL)
+
+
+@pytest.fixture(name="router")
+def fixture_router():
+    router = RequestRouter(
+        RoutingConfig(thread_cost=1_000, process_cost=100_000, thread_workers=2, process_workers=1)
+    )
+    yield router
+    router.shutdown()
+
+
+@pytest.mark.parametrize(
+    ("length", "route"), [(10, ROUTE_INLINE), (1_000, ROUTE_THREAD), (20_000, ROUTE_PROCESS)]
+)
+def test_choose_route_by_estimated_cost(router, length, route):
+    assert router.choose_route(REBASER, "7" * length) == route
+
+
+def test_choose_route_without_process_pool_uses_threads():
+    router = RequestRouter(
+        RoutingConfig(thread_cost=1_000, process_cost=100_000, process_workers=0)
+    )
+    assert router.choose_route(REBASER, "7" * 20_000) == ROUTE_THREAD
+
+
+def test_choose_route_inline_when_no_engine_runs(router):
+    assert router.choose_route(DigitSetRebaser(), "7" * 20_000) == ROUTE_INLINE
+
+
+@pytest.mark.parametrize(
+    ("length", "route"), [(10, ROUTE_INLINE), (1_000, ROUTE_THREAD), (20_000, ROUTE_PROCESS)]
+)
+def test_rebase_on_every_route(router, length, route):
+    input_text = "7" * length
+    result = asyncio.run(router.rebase(REBASER, input_text, CancellationToken(60)))
+    assert result == REBASER.rebase(input_text)
+    stats = router.stats()
+    assert stats[route] == {"queued": 0, "running": 0, "completed": 1}
+    assert sum(counters["completed"] for counters in stats.values()) == 1
+
+
+def test_rebase_in_thread_respects_token(router):
+    with pytest.raises(RebaseTimeoutError):
+        asyncio.run(router.rebase(REBASER, "7" * 1_000, CancellationToken(0)))
+    assert router.stats()[ROUTE_THREAD]["completed"] == 1
+
+
+def test_cancelling_the_token_stops_the_process_pool_worker(router):
+    async def scenario():
+        token = CancellationToken()
+        conversion = asyncio.create_task(router.rebase(REBASER, "7" * 3_000_000, token))
+        await asyncio.sleep(0.2)
+        token.cancel()
+        with pytest.raises(RebaseTimeoutError):
+            await conversion
+        # The only worker is free again well before the conversion would end.
+        return await asyncio.wait_for(
+            router.rebase(REBASER, "7" * 20_000, CancellationToken(60)), timeout=5
+        )
+
+    assert asyncio.run(scenario()) == REBASER.rebase("7" * 20_000)
+
+
+def test_process_conversions_without_a_cancel_slot_use_threads(monkeypatch, router):
+    monkeypatch.setattr(routing, "PROCESS_CANCEL_SLOTS", 0)
+    input_text = "7" * 20_000
+    assert asyncio.run(router.rebase(REBASER, input_text, CancellationToken(60))) == (
+        REBASER.rebase(input_text)
+    )
+    assert router.stats()[ROUTE_THREAD]["completed"] == 1
+
+
+def test_config_from_environment(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_THREAD_COST", "5")
+    monkeypatch.setenv("BASEBENDER_PROCESS_WORKERS", "0")
+    monkeypatch.setenv("BASEBENDER_THREAD_WORKERS", "invalid")
+    config = RoutingConfig.from_environment()
+    assert config.thread_cost == 5
+    assert config.process_workers == 0
+    assert config.thread_workers == RoutingConfig().thread_workers
@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+from basebender.rebaser.digit_set_rebaser import DigitSetRebaser
+from basebender.rebaser.models import DigitSet
+from basebender.rebaser.sequence import generate_digit_strings, write_digit_strings
+
+BINARY_DIGIT_SET = DigitSet(name="Binary", digits="01", source="test")
+HEX_DIGIT_SET = DigitSet(name="Hexadecimal", digits="0123456789ABCDEF", source="test")
+CLOCK_DIGIT_SET = DigitSet(name="Clock", digits="🕐🕑🕒", source="test")
+
+
+def _reference(digit_set, values, width=None):
+    digit_list = list(digit_set.digits)
+    rendered = [
+        DigitSetRebaser.int_to_string_in_base(value, digit_list, len(digit_list))
+        for value in values
+    ]
+    if width is None:
+        return rendered
+    return [digit_list[0] * (width - len(text)) + text for text in rendered]
+
+
+@pytest.mark.parametrize(
+    ("start", "stop", "step"),
+    [(0, 300, 1), (5, 1000, 7), (250, 3, -1), (4095, 0, -13), (0, 1, 1), (3, 3, 1)],
+)
+def test_generate_matches_int_to_string_in_base(start, stop, step):
+    result = list(generate_digit_strings(HEX_DIGIT_SET, start, stop, step))
+    assert result == _reference(HEX_DIGIT_SET, range(start, stop, step))
+
+
+def test_generate_with_fixed_width():
+    result = list(generate_digit_strings(BINARY_DIGIT_SET, 0, 9, width=4))
+    assert result == _reference(BINARY_DIGIT_SET, range(9), width=4)
+
+
+def test_generate_descending_keeps_fixed_width():
+    result = list(generate_digit_strings(CLOCK_DIGIT_SET, 10, -1, -1, width=3))
+    assert result == _reference(CLOCK_DIGIT_SET, range(10, -1, -1), width=3)
+
+
+def test_generate_width_too_small_raises_error():
+    with pytest.raises(ValueError, match="exceeding width 3"):
+        list(generate_digit_strings(BINARY_DIGIT_SET, 0, 9, width=3))
+
+
+def test_generate_negative_values_raise_error():
+    with pytest.raises(ValueError, match="Negative values"):
+        list(generate_digit_strings(BINARY_DIGIT_SET, 2, -3, -1))
+
+
+def test_generate_zero_step_raises_error():
+    with pytest.raises(ValueError, match="Step must not be zero."):
+        list(generate_digit_strings(BINARY_DIGIT_SET, 0, 3, 0))
+
+
+def test_generate_single_digit_set_raises_error():
+    with pytest.raises(ValueError, match="at least two distinct digits"):
+        list(generate_digit_strings(DigitSet(name="X", digits="XX", source="test"), 0, 3))
+
+
+def test_write_digit_strings_in_chunks():
+    buffer = io.StringIO()
+    written = write_digit_strings(
+        buffer, generate_digit_strings(HEX_DIGIT_SET, 0, 1000, 3), chunk_size=64
+    )
+    assert written == len(range(0, 1000, 3))
+    assert buffer.getvalue() == "".join(
+        f"{text}\n" for text in _reference(HEX_DIGIT_SET, range(0, 1000, 3))
+    )
+
+
+def test_write_digit_strings_custom_separator():
+    buffer = io.StringIO()
+    assert write_digit_strings(buffer, ["a", "b"], separator=",") == 2
+    assert buffer.getvalue() == "a,b,"
+
+
+def test_write_digit_strings_empty_range():
+    buffer = io.StringIO()
+    assert write_digit_strings(buffer, generate_digit_strings(HEX_DIGIT_SET, 5, 5)) == 0
+    assert buffer.getvalue() == ""
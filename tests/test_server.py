@@ -0,0 +1,72 @@
+import argparse
+
+import pytest
+
+from basebender.api import server
+from basebender.api.server import ServerConfig, add_server_arguments, config_from_args
+
+
+def _parse(argv):
+    parser = argparse.ArgumentParser()
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_config_defaults_to_one_worker_per_cpu(monkeypatch):
+    for name in ("HOST", "PORT", "WORKERS", "BACKLOG", "KEEP_ALIVE", "RELOAD"):
+        monkeypatch.delenv(f"BASEBENDER_{name}", raising=False)
+    monkeypatch.setattr(server.os, "process_cpu_count", lambda: 6)
+    assert config_from_args(_parse([])) == ServerConfig(workers=6)
+
+
+def test_cli_options_override_the_environment(monkeypatch):
+    monkeypatch.setenv("BASEBENDER_PORT", "9000")
+    monkeypatch.setenv("BASEBENDER_WORKERS", "3")
+    monkeypatch.setenv("BASEBENDER_KEEP_ALIVE", "30")
+    config = config_from_args(_parse(["--workers", "2", "--backlog", "64", "--reload"]))
+    assert (config.port, config.workers, config.backlog) == (9000, 2, 64)
+    assert config.keep_alive == 30
+    assert config.reload
+
+
+def test_invalid_worker_count_is_rejected():
+    with pytest.raises(ValueError, match="must be positive"):
+        config_from_args(_parse(["--workers", "0"]))
+
+
+def test_reload_runs_uvicorn_with_the_import_path(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server.uvicorn, "run", lambda app, **kwargs: calls.append((app, kwargs)))
+    server.serve(ServerConfig(port=8123, reload=True))
+    assert calls == [
+        (
+            server.APP_IMPORT_PATH,
+            {
+                "host": "0.0.0.0",
+                "port": 8123,
+                "backlog": 2048,
+                "timeout_keep_alive": 5,
+                "reload": True,
+            },
+        )
+    ]
+
+
+def test_single_worker_preloads_and_serves_in_process(monkeypatch):
+    served = []
+
+    class FakeServer:
+        def __init__(self, config):
+            self.config = config
+
+        def run(self):
+            served.append(self.config)
+
+    monkeypatch.setattr(server.uvicorn, "Server", FakeServer)
+    monkeypatch.setenv("BASEBENDER_WARMUP_PAIRS", "none")
+    server.serve(ServerConfig(workers=1, backlog=10, keep_alive=7))
+    assert len(served) == 1
+    assert served[0].backlog == 10
+    assert served[0].timeout_keep_alive == 7
+    assert served[0].loop == server.event_loop_implementation()
+    assert served[0].http == server.http_implementation()
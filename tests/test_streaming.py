@@ -0,0 +1,26 @@
+from basebender.api.streaming import LineSplitter
+
+
+def _split(chunks, max_line_bytes=0):
+    splitter = LineSplitter(max_line_bytes)
+    lines = []
+    for chunk in chunks:
+        lines.extend(splitter.feed(chunk))
+    return lines + splitter.close()
+
+
+def test_lines_across_chunks():
+    assert _split([b"ab", b"c\nd", b"e\r\n", b"f"]) == [b"abc", b"de", b"f"]
+
+
+def test_trailing_newline_adds_no_line():
+    assert _split([b"a\nb\n"]) == [b"a", b"b"]
+
+
+def test_empty_lines_are_kept():
+    assert _split([b"\n\na"]) == [b"", b"", b"a"]
+
+
+def test_overlong_lines_are_reported_as_none():
+    assert _split([b"ok\n", b"x" * 5, b"x" * 5, b"\nok"], max_line_bytes=4) == [b"ok", None, b"ok"]
+    assert _split([b"ok\n123456789"], max_line_bytes=4) == [b"ok", None]
@@ -0,0 +1,137 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from basebender.api import main
+from basebender.api.settings import warmup_pairs
+from basebender.api.warmup import (
+    MAX_WARMUP_ALL_DIGIT_SETS,
+    MAX_WARMUP_PAIRS,
+    WarmupState,
+    parse_warmup_pairs,
+    sample_input,
+    warm_up,
+)
+from basebender.rebaser.models import BlockLayout, DigitSet
+
+CATALOG = {
+    "test:Binary": DigitSet(name="Binary", digits="01", source="test"),
+    "test:Decimal": DigitSet(name="Decimal", digits="0123456789", source="test"),
+    "test:Hex Block": DigitSet(
+        name="Hex Block", digits="0123456789ABCDEF", source="test", block=BlockLayout(1, 2)
+    ),
+}
+
+
+def test_parse_warmup_pairs():
+    assert len(parse_warmup_pairs("all", CATALOG)) == 6
+    assert parse_warmup_pairs("none", CATALOG) == []
+    pairs = parse_warmup_pairs("test:Decimal>test:Binary,bogus,test:Binary>missing", CATALOG)
+    assert pairs == [(CATALOG["test:Decimal"], CATALOG["test:Binary"])]
+
+
+def test_all_warmup_pairs_are_capped():
+    catalog = {
+        f"test:Set{index}": DigitSet(name=f"Set{index}", digits="01", source="test")
+        for index in range(MAX_WARMUP_ALL_DIGIT_SETS)
+    }
+    assert len(parse_warmup_pairs("all", catalog)) == MAX_WARMUP_PAIRS
+    assert len(parse_warmup_pairs("all", catalog, limit=5)) == 5
+    assert MAX_WARMUP_PAIRS == main.REBASER_CACHE_SIZE
+
+
+def test_all_warmup_pairs_skip_large_catalogs():
+    catalog = {
+        f"test:Set{index}": DigitSet(name=f"Set{index}", digits="01", source="test")
+        for index in range(MAX_WARMUP_ALL_DIGIT_SETS + 1)
+    }
+    assert parse_warmup_pairs("all", catalog) == []
+    assert len(parse_warmup_pairs("test:Set1>test:Set2", catalog)) == 1
+
+
+def test_all_warmup_pairs_cover_every_digit_set_first():
+    catalog = {
+        f"test:Set{index}": DigitSet(name=f"Set{index}", digits="01", source="test")
+        for index in range(MAX_WARMUP_ALL_DIGIT_SETS)
+    }
+    pairs = parse_warmup_pairs("all", catalog, limit=len(catalog))
+    assert {source.name for source, _ in pairs} == {
+        digit_set.name for digit_set in catalog.values()
+    }
+    assert {target.name for _, target in pairs} == {
+        digit_set.name for digit_set in catalog.values()
+    }
+    assert all(source is not target for source, target in pairs)
+
+
+def test_sets_warmup_pairs_every_digit_set_with_the_partner():
+    catalog = {"package:Decimal": DigitSet(name="Decimal", digits="0123456789", source="test")}
+    catalog.update(CATALOG)
+    pairs = parse_warmup_pairs("sets", catalog)
+    assert len(pairs) == 2 * len(CATALOG)
+    assert all(catalog["package:Decimal"] in pair for pair in pairs)
+    assert {digit_set for pair in pairs for digit_set in pair} == set(catalog.values())
+
+    large = {
+        f"test:Set{index}": DigitSet(name=f"Set{index}", digits="01", source="test")
+        for index in range(1000)
+    }
+    pairs = parse_warmup_pairs("sets", large)
+    assert len(pairs) == MAX_WARMUP_PAIRS
+    assert all(large["test:Set0"] in pair for pair in pairs)
+
+
+def test_warmup_pairs_default_to_sets(monkeypatch):
+    monkeypatch.delenv("BASEBENDER_WARMUP_PAIRS", raising=False)
+    assert warmup_pairs() == "sets"
+
+
+def test_sample_input_is_valid_for_block_digit_sets():
+    assert sample_input(CATALOG["test:Hex Block"]) == "00"
+    assert sample_input(CATALOG["test:Binary"]) == "1111"
+
+
+def test_warm_up_records_progress_and_skips_failing_pairs():
+    state = WarmupState()
+    finished = []
+
+    def warm_pair(source, target):
+        if target.block is not None:
+            raise ValueError("unsupported")
+
+    warm_up(state, lambda: CATALOG, warm_pair, "all", finish=lambda: finished.append(True))
+    assert state.ready
+    assert state.warmed_pairs == 4
+    assert state.duration is not None
+    assert finished == [True]
+
+
+def test_warm_up_failure_keeps_the_state_not_ready():
+    def load_catalog():
+        raise OSError("catalog unreadable")
+
+    state = WarmupState()
+    warm_up(state, load_catalog, lambda source, target: None, "all")
+    assert not state.ready
+    assert state.error == "catalog unreadable"
+
+
+def test_ready_is_503_until_warm(monkeypatch):
+    monkeypatch.setattr(main, "WARMUP", WarmupState())
+    response = TestClient(main.APP).get("/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+
+
+def test_lifespan_warms_up_the_api(monkeypatch):
+    monkeypatch.setattr(main, "WARMUP", WarmupState())
+    monkeypatch.setenv("BASEBENDER_WARMUP_PAIRS", "package:Decimal>package:Binary")
+    with TestClient(main.APP) as client:
+        deadline = time.monotonic() + 30
+        response = client.get("/ready")
+        while response.status_code == 503 and time.monotonic() < deadline:
+            time.sleep(0.05)
+            response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+    assert response.json()["warmed_pairs"] == 1
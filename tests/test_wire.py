@@ -0,0 +1,135 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from basebender.api.main import APP
+from basebender.api.wire import (
+    FRAMES,
+    FRAMES_MEDIA_TYPE,
+    JSON,
+    MSGPACK_MEDIA_TYPE,
+    decode_frames,
+    encode_frames,
+    fields_to_dict,
+    msgpack_available,
+    request_format,
+    response_format,
+)
+
+client = TestClient(APP)
+
+CJK = "".join(chr(code) for code in range(0x4E00, 0x4E00 + 256))
+
+
+def test_frames_round_trip_and_nulls():
+    fields = ["", None, "🕐🕑", CJK]
+    assert decode_frames(encode_frames(fields)) == fields
+    assert encode_frames([]) == b""
+
+
+def test_truncated_or_invalid_frames_are_rejected():
+    data = encode_frames(["abc"])
+    with pytest.raises(ValueError):
+        decode_frames(data[:-1])
+    with pytest.raises(ValueError):
+        decode_frames(data[:2])
+    with pytest.raises(ValueError):
+        decode_frames(b"\x00\x00\x00\x01\xff")
+
+
+def test_fields_to_dict_omits_nulls_and_checks_count():
+    assert fields_to_dict(("a", "b", "c"), ["1", None]) == {"a": "1"}
+    with pytest.raises(ValueError):
+        fields_to_dict(("a",), ["1", "2"])
+
+
+def test_format_negotiation():
+    assert request_format("application/x-basebender-frames; charset=binary") == FRAMES
+    assert request_format("application/json") == JSON
+    assert response_format("text/html, application/x-basebender-frames;q=0.9") == FRAMES
+    assert response_format(None) == JSON
+
+
+def test_rebase_with_frames():
+    body = encode_frames(["🕐🕑🕒", None, "package:Clock Emojis", CJK])
+    response = client.post(
+        "/rebase",
+        content=body,
+        headers={"Content-Type": FRAMES_MEDIA_TYPE, "Accept": FRAMES_MEDIA_TYPE},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == FRAMES_MEDIA_TYPE
+    json_response = client.post(
+        "/rebase",
+        json={
+            "input_text": "🕐🕑🕒",
+            "source_digit_set_id": "package:Clock Emojis",
+            "target_digit_set": CJK,
+        },
+    ).json()
+    assert decode_frames(response.content) == [
+        json_response["rebased_text"],
+        json_response["source_digit_set_used"],
+        json_response["target_digit_set_used"],
+    ]
+
+
+def test_frames_request_with_json_response():
+    body = encode_frames(["101", None, "package:Binary", None, "package:Decimal"])
+    response = client.post("/rebase", content=body, headers={"Content-Type": FRAMES_MEDIA_TYPE})
+    assert response.json()["rebased_text"] == "5"
+
+
+def test_invalid_bodies_are_rejected():
+    response = client.post(
+        "/rebase", content=b"\x00\x00\x00\x09ab", headers={"Content-Type": FRAMES_MEDIA_TYPE}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["message"] == "Invalid Request Body"
+    response = client.post("/rebase", json={"input_text": 5})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "input_text"]
+
+
+def test_batch_with_frames():
+    body = encode_frames([None, "package:Binary", None, "package:Decimal", "101", "2", "11111111"])
+    response = client.post(
+        "/rebase/batch",
+        content=body,
+        headers={"Content-Type": FRAMES_MEDIA_TYPE, "Accept": FRAMES_MEDIA_TYPE},
+    )
+    assert response.status_code == 200
+    fields = decode_frames(response.content)
+    assert fields[:2] == ["Binary", "Decimal"]
+    items = [fields[index : index + 3] for index in range(2, len(fields), 3)]
+    assert items == [["5", None, None], ["0", None, None], ["255", None, None]]
+
+
+def test_batch_frames_require_digit_set_fields():
+    response = client.post(
+        "/rebase/batch", content=encode_frames(["1"]), headers={"Content-Type": FRAMES_MEDIA_TYPE}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.skipif(msgpack_available(), reason="msgpack is installed")
+def test_msgpack_without_the_package_is_unsupported():
+    response = client.post(
+        "/rebase", content=b"\x80", headers={"Content-Type": MSGPACK_MEDIA_TYPE}
+    )
+    assert response.status_code == 415
+    response = client.post(
+        "/rebase", json={"input_text": "1"}, headers={"Accept": MSGPACK_MEDIA_TYPE}
+    )
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_rebase_and_batch_with_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+    headers = {"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE}
+    payload = {"input_text": "101", "source_digit_set": "01", "target_digit_set": "0123456789"}
+    response = client.post("/rebase", content=msgpack.packb(payload), headers=headers)
+    assert msgpack.unpackb(response.content)["rebased_text"] == "5"
+    payload = {"inputs": ["101", "2"], "source_digit_set": "01", "target_digit_set": "0123456789"}
+    response = client.post("/rebase/batch", content=msgpack.packb(payload), headers=headers)
+    results = msgpack.unpackb(response.content)["results"]
+    assert results[0] == {"rebased_text": "5", "error": None}